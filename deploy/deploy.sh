@@ -19,6 +19,8 @@ APP_DIR="/var/www/vocabmaster"
 REPO_URL="https://github.com/vannt010391/english-leanring.git"
 DOMAIN="english.iamstudying.tech"
 PYTHON_VERSION="python3"
+# ASGI=1 serves through uvicorn workers (config.asgi), which use the async read views
+ASGI="${ASGI:-0}"
 
 # Colors for output
 RED='\033[0;31m'
@@ -86,6 +88,9 @@ pip install django djangorestframework gunicorn whitenoise pillow
 if [ -f "requirements.txt" ]; then
     pip install -r requirements.txt
 fi
+if [ "$ASGI" = "1" ]; then
+    pip install uvicorn
+fi
 print_status "Dependencies installed"
 
 echo ""
@@ -93,6 +98,8 @@ echo "Step 7: Configure Django settings for production..."
 
 # Create production settings
 cat > $APP_DIR/vocab_project/config/settings_production.py << 'SETTINGS_EOF'
+import os
+
 from .settings import *
 
 # Production settings
@@ -116,7 +123,33 @@ MEDIA_URL = '/media/'
 
 # Whitenoise for static files
 MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# STORAGES replaces STATICFILES_STORAGE, which Django 5.1+ ignores
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+
+# Keep compiled templates per process, and serve page shells from the per-role
+# cache keyed by the manifest collectstatic writes (see config.page_cache)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+PAGE_SHELL_CACHE = dict(PAGE_SHELL_CACHE, ENABLED=True)
+
+# One cache for all gunicorn workers: token snapshots (accounts.authentication)
+# must be deleted everywhere on logout, deactivation or a role change. systemd
+# creates the directory (CacheDirectory= in the service below).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', '/var/cache/vocabmaster'),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
 SETTINGS_EOF
 
 print_status "Production settings created"
@@ -141,6 +174,12 @@ User=www-data
 Group=www-data
 WorkingDirectory=/var/www/vocabmaster/vocab_project
 Environment="DJANGO_SETTINGS_MODULE=config.settings_production"
+# Shared by the workers so /metrics sums all of them; systemd empties it on restart
+RuntimeDirectory=vocabmaster-metrics
+Environment="METRICS_DIR=/run/vocabmaster-metrics"
+# Django cache shared by the workers (token snapshots must be revoked in all of them)
+CacheDirectory=vocabmaster
+Environment="DJANGO_CACHE_DIR=/var/cache/vocabmaster"
 ExecStart=/var/www/vocabmaster/vocab_project/venv/bin/gunicorn \
           --access-logfile - \
           --workers 3 \
@@ -151,6 +190,13 @@ ExecStart=/var/www/vocabmaster/vocab_project/venv/bin/gunicorn \
 WantedBy=multi-user.target
 SERVICE_EOF
 
+if [ "$ASGI" = "1" ]; then
+    # Same workers and socket; uvicorn workers speak ASGI to config.asgi
+    sed -i 's|config.wsgi:application|--worker-class uvicorn.workers.UvicornWorker config.asgi:application|' \
+        /etc/systemd/system/vocabmaster.service
+    print_status "Service configured for ASGI (uvicorn workers)"
+fi
+
 cat > /etc/systemd/system/vocabmaster.socket << 'SOCKET_EOF'
 [Unit]
 Description=VocabMaster Gunicorn Socket
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from ops.metrics import record_cache
+
+
+class TokenUserCache:
+    """
+    TTL cache of token key -> user snapshot, kept in the Django cache named by
+    TOKEN_AUTH_CACHE['CACHE']. Production points that at a backend shared by
+    every gunicorn worker, so the entry deleted on logout, token deletion or a
+    user change is gone for all of them at once; the TTL only bounds how long
+    an unchanged snapshot is reused.
+    """
+
+    def __init__(self, backend=None):
+        # A backend of its own stands in for another worker's connection in tests
+        self._backend = backend
+
+    @staticmethod
+    def _options():
+        options = getattr(settings, 'TOKEN_AUTH_CACHE', {})
+        return options.get('TTL', 60), options.get('CACHE', 'default')
+
+    def _cache(self):
+        return self._backend or caches[self._options()[1]]
+
+    @staticmethod
+    def _key(key):
+        return f'auth-token:{key}'
+
+    def get(self, key):
+        ttl, _ = self._options()
+        if ttl <= 0:
+            return None
+        # Backends pickle values, so each hit is a fresh copy that requests cannot leak into
+        user = self._cache().get(self._key(key))
+        record_cache('token', hit=user is not None)
+        return user
+
+    def set(self, key, user):
+        ttl, _ = self._options()
+        if ttl > 0:
+            self._cache().set(self._key(key), user, ttl)
+
+    def invalidate(self, key):
+        self._cache().delete(self._key(key))
+
+    def invalidate_user(self, user_id):
+        keys = Token.objects.filter(user_id=user_id).values_list('key', flat=True)
+        self._cache().delete_many([self._key(key) for key in keys])
+
+    def clear(self):
+        """Empty the whole backing cache (tests only)."""
+        self._cache().clear()
+
+
+token_cache = TokenUserCache()
+
+# Backends whose entries live in one process, so a delete in one worker is unseen by the others
+PROCESS_LOCAL_BACKENDS = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+def check_shared_token_cache():
+    """Refuse to start a DEBUG = False deployment whose token cache is per process."""
+    ttl, alias = TokenUserCache._options()
+    if settings.DEBUG or not ttl:
+        return
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_BACKENDS:
+        raise ImproperlyConfigured(
+            f"TOKEN_AUTH_CACHE uses CACHES['{alias}'] ({backend}), which each worker keeps for "
+            "itself, so logout and deactivation would not reach the other workers. Point it at "
+            "a shared backend (settings_production uses FileBasedCache) or set its TTL to 0."
+        )
+
+
+def get_user_for_token(key):
+    """Return the active user owning this token key, or None."""
+    user = token_cache.get(key)
+    if user is not None:
+        return user
+    try:
+        token = Token.objects.select_related('user').get(key=key)
+    except Token.DoesNotExist:
+        return None
+    if not token.user.is_active:
+        return None
+    token_cache.set(key, token.user)
+    return token.user
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that skips the token and user queries on cache hits."""
+
+    def authenticate_credentials(self, key):
+        user = token_cache.get(key)
+        if user is not None:
+            return (user, Token(key=key, user=user))
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, user)
+        return (user, token)
@@ -1,7 +1,13 @@
-from django.test import TestCase, Client
+from unittest.mock import patch
+
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
 from django.urls import reverse
 
+from config.page_cache import static_version
+
 User = get_user_model()
 
 
@@ -174,3 +180,55 @@ class SidebarStructureTestCase(TestCase):
             
             # Verify NO learnerDashboardLink
             self.assertNotContains(response, 'id="learnerDashboardLink"', msg_prefix=f"{page_name} should NOT have learner dashboard link")
+
+
+@override_settings(PAGE_SHELL_CACHE={'ENABLED': True, 'CACHE': 'default', 'TIMEOUT': 60})
+class PageShellCacheTestCase(TestCase):
+    """Test per-role page shell and sidebar fragment caching"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        static_version.cache_clear()
+        self.addCleanup(static_version.cache_clear)
+        User.objects.create_user(username='admin_test', email='admin@test.com', password='testpass123', role='admin')
+        User.objects.create_user(username='learner_test', email='learner@test.com', password='testpass123', role='learner')
+        self.client = Client()
+        self.client.login(username='learner_test', password='testpass123')
+
+    def test_shell_is_rendered_once_per_role(self):
+        """Test that repeat page loads are served from the cache per role"""
+        first = self.client.get(reverse('dashboard'))
+        self.assertTemplateUsed(first, 'dashboard.html')
+        second = self.client.get(reverse('dashboard'))
+        self.assertEqual(second.templates, [])
+        self.assertEqual(second.content, first.content)
+
+        admin = Client()
+        admin.login(username='admin_test', password='testpass123')
+        self.assertTemplateUsed(admin.get(reverse('dashboard')), 'dashboard.html')
+        self.assertIsNotNone(cache.get(f'page-shell:{static_version()}:admin:/dashboard/'))
+        self.assertIsNotNone(cache.get(f'page-shell:{static_version()}:learner:/dashboard/'))
+
+    def test_new_static_manifest_invalidates(self):
+        """Test that a different manifest hash misses the cached shell"""
+        self.client.get(reverse('dashboard'))
+        with patch('config.page_cache.static_version', return_value='deploy2'):
+            self.assertTemplateUsed(self.client.get(reverse('dashboard')), 'dashboard.html')
+
+    def test_sidebar_fragment_is_cached(self):
+        """Test that the sidebar fragment is stored per role and manifest"""
+        self.client.get(reverse('vocabulary_list'))
+        key = make_template_fragment_key('sidebar_vocabulary', ['learner', static_version()])
+        self.assertIn('id="sidebar"', cache.get(key))
+
+    def test_redirects_are_not_cached(self):
+        """Test that admin pages redirecting a learner are not stored"""
+        self.assertEqual(self.client.get(reverse('admin_users')).status_code, 302)
+        self.assertIsNone(cache.get(f'page-shell:{static_version()}:learner:/admin-users/'))
+
+    @override_settings(PAGE_SHELL_CACHE={'ENABLED': False})
+    def test_disabled_renders_every_time(self):
+        """Test that nothing is cached while PAGE_SHELL_CACHE is disabled"""
+        self.client.get(reverse('dashboard'))
+        self.assertTemplateUsed(self.client.get(reverse('dashboard')), 'dashboard.html')
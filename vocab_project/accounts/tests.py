@@ -1,9 +1,18 @@
-from django.test import TestCase, Client
+import shutil
+import tempfile
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework.authtoken.models import Token
 from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .authentication import TokenUserCache, check_shared_token_cache, token_cache
 
 User = get_user_model()
 
@@ -220,3 +229,143 @@ class UserRoleTests(TestCase):
         )
         
         self.assertEqual(user.role, 'learner')
+
+
+class SharedTokenCacheTests(APITestCase):
+    """Test suite for token revocation across gunicorn workers"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                              'LOCATION': self.cache_dir}}
+        settings_override = override_settings(CACHES=shared)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username='learner', email='l@test.com', password='learner123')
+        self.token = Token.objects.create(user=self.user)
+        # Another worker: its own cache connection onto the same shared location
+        self.other_worker = TokenUserCache(backend=FileBasedCache(self.cache_dir, {}))
+
+    def test_logout_revokes_token_in_other_workers(self):
+        """Test that a token cached by another worker is rejected there after logout"""
+        self.other_worker.set(self.token.key, self.user)
+        self.assertEqual(self.other_worker.get(self.token.key).pk, self.user.pk)
+
+        response = self.client.post('/api/auth/logout/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertIsNone(self.other_worker.get(self.token.key))
+
+    def test_role_change_reaches_other_workers(self):
+        """Test that a user change drops the snapshot another worker cached"""
+        self.other_worker.set(self.token.key, self.user)
+        self.user.role = 'admin'
+        self.user.save()
+        self.assertIsNone(self.other_worker.get(self.token.key))
+
+
+class SharedTokenCacheCheckTests(TestCase):
+    """Test suite for the startup check on the token cache backend"""
+
+    LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    FILEBASED = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                             'LOCATION': '/tmp/vocabmaster-check'}}
+
+    @override_settings(DEBUG=False, CACHES=LOCMEM)
+    def test_production_with_process_local_cache_fails(self):
+        """Test that DEBUG = False with a LocMemCache token cache refuses to start"""
+        with self.assertRaises(ImproperlyConfigured):
+            check_shared_token_cache()
+
+    @override_settings(DEBUG=False, CACHES=FILEBASED)
+    def test_production_with_shared_cache_passes(self):
+        """Test that DEBUG = False with a shared cache starts"""
+        check_shared_token_cache()
+
+    @override_settings(DEBUG=False, CACHES=LOCMEM, TOKEN_AUTH_CACHE={'TTL': 0})
+    def test_disabled_token_cache_passes(self):
+        """Test that a disabled token cache needs no shared backend"""
+        check_shared_token_cache()
+
+    @override_settings(DEBUG=True, CACHES=LOCMEM)
+    def test_development_passes(self):
+        """Test that the per-process cache is allowed with DEBUG = True"""
+        check_shared_token_cache()
+
+
+class TokenCacheTests(APITestCase):
+    """Test suite for cached token authentication"""
+
+    def setUp(self):
+        token_cache.clear()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='admin123',
+            role='admin'
+        )
+        self.learner_user = User.objects.create_user(
+            username='learner',
+            email='learner@test.com',
+            password='learner123',
+            role='learner'
+        )
+        self.admin_token = Token.objects.create(user=self.admin_user)
+        self.learner_token = Token.objects.create(user=self.learner_user)
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def _profile(self, token):
+        return self.client.get('/api/auth/profile/', HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_cache_hit_skips_token_queries(self):
+        """Test that a repeated request does not query the token table"""
+        self.assertEqual(self._profile(self.learner_token).status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._profile(self.learner_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_deactivate_invalidates_cache(self):
+        """Test that a deactivated user is rejected immediately"""
+        self._profile(self.learner_token)
+
+        self.client.post(
+            f'/api/auth/users/{self.learner_user.id}/deactivate/',
+            HTTP_AUTHORIZATION=f'Token {self.admin_token.key}'
+        )
+
+        self.assertEqual(self._profile(self.learner_token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_assign_role_invalidates_cache(self):
+        """Test that a role change is visible on the next request"""
+        self._profile(self.learner_token)
+
+        self.client.post(
+            f'/api/auth/users/{self.learner_user.id}/assign_role/',
+            {'role': 'admin'},
+            format='json',
+            HTTP_AUTHORIZATION=f'Token {self.admin_token.key}'
+        )
+
+        self.assertEqual(self._profile(self.learner_token).json()['role'], 'admin')
+
+    def test_logout_invalidates_cache(self):
+        """Test that the token stops working after logout"""
+        self._profile(self.learner_token)
+
+        response = self.client.post(
+            '/api/auth/logout/',
+            HTTP_AUTHORIZATION=f'Token {self.learner_token.key}'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self._profile(self.learner_token).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(
+            self.client.get(reverse('dashboard'), HTTP_AUTHORIZATION=f'Token {self.learner_token.key}').status_code,
+            302
+        )
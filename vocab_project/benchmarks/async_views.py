@@ -0,0 +1,158 @@
+"""
+Sync DRF views vs async read views under the same ASGI application.
+
+Seeds a throwaway SQLite database, then drives config.asgi.application
+in-process (one worker, equal concurrency for both variants) with the same
+learner token against each endpoint pair and prints throughput and latency
+percentiles as JSON. ASYNC_VIEWS is turned off so the plain paths stay on the
+DRF views; each pair returns the same response, so both sides do the same
+work (progress syncs the daily schedule in both).
+
+Usage (from vocab_project/):
+    python benchmarks/async_views.py [--requests 400] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# config.asgi would otherwise route the sync paths to the async views too
+os.environ['DJANGO_ASYNC_VIEWS'] = '0'
+
+from django.conf import settings  # noqa: E402
+
+DB_DIR = tempfile.mkdtemp()
+settings.DATABASES['default']['NAME'] = os.path.join(DB_DIR, 'bench.sqlite3')
+settings.ALLOWED_HOSTS = ['*']
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from config.asgi import application  # noqa: E402
+
+
+def seed(cards):
+    from accounts.models import User
+    from learning.models import LearningPlan, LearningPlanVocabulary, LearningProgress
+    from rest_framework.authtoken.models import Token
+    from vocabulary.models import Vocabulary
+
+    call_command('migrate', verbosity=0)
+    user = User.objects.create_user(username='bench', password='bench12345')
+    token = Token.objects.create(user=user)
+    plan = LearningPlan.objects.create(
+        user=user, name='Bench', start_date=date.today() - timedelta(days=30),
+        end_date=date.today(), daily_study_time=20, selected_levels=['A1']
+    )
+    vocab = Vocabulary.objects.bulk_create([
+        Vocabulary(word=f'word{i:05d}', meaning=f'meaning {i}', meaning_vi=f'nghia {i}',
+                   example_sentence=f'Example sentence number {i}.', level='A1', is_system=True)
+        for i in range(cards)
+    ])
+    LearningPlanVocabulary.objects.bulk_create([
+        LearningPlanVocabulary(learning_plan=plan, vocabulary=v) for v in vocab
+    ])
+    LearningProgress.objects.bulk_create([
+        LearningProgress(user=user, learning_plan=plan, date=date.today() - timedelta(days=d), words_studied=d)
+        for d in range(30)
+    ])
+    return token.key, plan.id
+
+
+async def call(path, token):
+    """Issue one GET through the ASGI app and return (status, seconds)."""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', b'localhost'), (b'authorization', f'Token {token}'.encode())],
+        'client': ('127.0.0.1', 5000), 'server': ('localhost', 8000),
+    }
+    status = {}
+    body_sent = False
+    never = asyncio.Event()
+
+    async def receive():
+        nonlocal body_sent
+        if body_sent:
+            # Client stays connected; Django cancels this wait once it responds
+            await never.wait()
+        body_sent = True
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status['code'] = message['status']
+
+    started = time.perf_counter()
+    await application(scope, receive, send)
+    return status.get('code'), time.perf_counter() - started
+
+
+async def measure(path, token, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            code, elapsed = await call(path, token)
+            latencies.append(elapsed * 1000)
+            if code != 200:
+                errors += 1
+
+    await call(path, token)  # warm up caches and URL resolver
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    wall = time.perf_counter() - started
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))], 2)
+
+    return {
+        'path': path,
+        'requests_per_second': round(total / wall, 1),
+        'p50_ms': pct(50), 'p95_ms': pct(95), 'p99_ms': pct(99),
+        'errors': errors,
+    }
+
+
+async def main(args, token, plan_id):
+    pairs = [
+        ('flashcards', f'/api/learning/plans/{plan_id}/flashcards/?limit=50',
+         f'/api/learning/async/plans/{plan_id}/flashcards/?limit=50'),
+        ('plan_progress', f'/api/learning/plans/{plan_id}/progress/?days=7',
+         f'/api/learning/async/plans/{plan_id}/progress/?days=7'),
+        ('unread_count', '/api/learning/notifications/unread_count/',
+         '/api/learning/async/notifications/unread_count/'),
+    ]
+    results = []
+    for name, sync_path, async_path in pairs:
+        results.append({
+            'endpoint': name,
+            'concurrency': args.concurrency,
+            'sync': await measure(sync_path, token, args.requests, args.concurrency),
+            'async': await measure(async_path, token, args.requests, args.concurrency),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=400, help='Requests per endpoint variant.')
+    parser.add_argument('--concurrency', type=int, default=16, help='In-flight requests.')
+    parser.add_argument('--cards', type=int, default=500, help='Flashcards seeded in the plan.')
+    args = parser.parse_args()
+    token, plan_id = seed(args.cards)
+    asyncio.run(main(args, token, plan_id))
@@ -0,0 +1,103 @@
+"""
+Peak memory and throughput of the streaming vocabulary export.
+
+Seeds a throwaway SQLite database with system vocabulary (each word linked
+to one of 20 topics), growing it to each requested size. At each size,
+/api/vocabulary/system/export/ is consumed in full as an admin. The peak
+traced Python memory while streaming, rows per second and bytes written
+are printed as JSON. A flat peak across sizes is the point.
+
+Usage (from vocab_project/):
+    python benchmarks/export.py [--sizes 10000,100000,1000000] [--file-format csv]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+from django.conf import settings  # noqa: E402
+
+DB_DIR = tempfile.mkdtemp()
+settings.DATABASES['default']['NAME'] = os.path.join(DB_DIR, 'bench.sqlite3')
+settings.ALLOWED_HOSTS = ['*']
+settings.DEBUG = False  # the debug query log would grow with every chunk
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+BATCH = 5000
+
+
+def seed_admin():
+    from accounts.models import User
+    from rest_framework.authtoken.models import Token
+    from topics.models import Topic
+
+    call_command('migrate', verbosity=0)
+    admin = User.objects.create_user(username='bench', password='bench12345', role='admin')
+    Topic.objects.bulk_create([Topic(name=f'Topic {i:02d}') for i in range(20)])
+    return Token.objects.create(user=admin).key
+
+
+def grow(start, stop):
+    from topics.models import Topic
+    from vocabulary.models import Vocabulary, VocabularyTopic
+
+    topic_ids = list(Topic.objects.values_list('id', flat=True))
+    for offset in range(start, stop, BATCH):
+        vocab = Vocabulary.objects.bulk_create([
+            Vocabulary(word=f'word{i:07d}', meaning=f'meaning of word number {i}', meaning_vi=f'nghĩa {i}',
+                       example_sentence=f'Example sentence {i}.', level='A1', word_type='noun', is_system=True)
+            for i in range(offset, min(offset + BATCH, stop))
+        ])
+        VocabularyTopic.objects.bulk_create([
+            VocabularyTopic(vocabulary=v, topic_id=topic_ids[v.id % len(topic_ids)]) for v in vocab
+        ])
+
+
+def measure(client, file_format, rows):
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = client.get(f'/api/vocabulary/system/export/?file_format={file_format}')
+    assert response.status_code == 200, response.status_code
+    written = sum(len(part) for part in response.streaming_content)
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'rows': rows,
+        'bytes': written,
+        'seconds': round(wall, 2),
+        'rows_per_second': round(rows / wall),
+        'peak_traced_mib': round(peak / 2 ** 20, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='10000,100000', help='Comma-separated row counts, ascending.')
+    parser.add_argument('--file-format', default='csv', choices=['csv', 'jsonl'])
+    args = parser.parse_args()
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {seed_admin()}')
+    results, seeded = [], 0
+    for size in sorted(int(size) for size in args.sizes.split(',')):
+        grow(seeded, size)
+        seeded = size
+        results.append(measure(client, args.file_format, size))
+    print(json.dumps({'file_format': args.file_format, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+DRF's JSONRenderer/JSONParser vs config.renderers on real API payloads.
+
+Seeds a throwaway SQLite database with a learning plan and fetches a
+flashcard payload (200 cards by default) through the API. That payload is
+then rendered repeatedly by both renderers, and a practice-complete body
+with one result per card is parsed repeatedly by both parsers. The time
+per call and the speedup are printed as JSON.
+
+Usage (from vocab_project/):
+    python benchmarks/json_renderer.py [--cards 200] [--iterations 500]
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+from django.conf import settings  # noqa: E402
+
+DB_DIR = tempfile.mkdtemp()
+settings.DATABASES['default']['NAME'] = os.path.join(DB_DIR, 'bench.sqlite3')
+settings.ALLOWED_HOSTS = ['*']
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from config import renderers  # noqa: E402
+from config.renderers import FastJSONParser, FastJSONRenderer  # noqa: E402
+
+
+def flashcard_payload(cards):
+    from accounts.models import User
+    from learning.models import LearningPlan, LearningPlanVocabulary
+    from rest_framework.authtoken.models import Token
+    from vocabulary.models import Vocabulary
+
+    call_command('migrate', verbosity=0)
+    user = User.objects.create_user(username='bench', password='bench12345')
+    plan = LearningPlan.objects.create(
+        user=user, name='Bench', start_date=date.today() - timedelta(days=30),
+        end_date=date.today(), daily_study_time=20, selected_levels=['A1']
+    )
+    vocab = Vocabulary.objects.bulk_create([
+        Vocabulary(word=f'word{i:05d}', meaning=f'meaning of word number {i}', meaning_vi=f'nghĩa của từ {i}',
+                   phonetics=f'/wɜːd{i}/', example_sentence=f'This is example sentence number {i}.',
+                   note='Remember the irregular plural.', level='A1', word_type='noun', is_system=True)
+        for i in range(cards)
+    ])
+    LearningPlanVocabulary.objects.bulk_create([
+        LearningPlanVocabulary(learning_plan=plan, vocabulary=v) for v in vocab
+    ])
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+    response = client.get(f'/api/learning/plans/{plan.id}/flashcards/?limit={cards}')
+    assert response.status_code == 200, response.status_code
+    return response.data
+
+
+def practice_body(cards):
+    return json.dumps({
+        'duration_seconds': 600,
+        'results': [
+            {'position': i, 'vocabulary_id': i + 1, 'user_answer': f'meaning of word number {i}',
+             'correct': i % 3 != 0, 'self_evaluation': 'learned', 'time_spent': 4.2}
+            for i in range(cards)
+        ],
+    }, ensure_ascii=False).encode()
+
+
+def per_call_us(func, iterations):
+    func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return round((time.perf_counter() - started) / iterations * 1e6, 1)
+
+
+def compare(name, baseline, fast, iterations, **extra):
+    slow_us = per_call_us(baseline, iterations)
+    fast_us = per_call_us(fast, iterations)
+    return dict(extra, operation=name, drf_us=slow_us, fast_us=fast_us, speedup=round(slow_us / fast_us, 2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cards', type=int, default=200, help='Flashcards in the payload (the API allows 200).')
+    parser.add_argument('--iterations', type=int, default=500, help='Calls timed per implementation.')
+    args = parser.parse_args()
+
+    data = flashcard_payload(args.cards)
+    rendered = JSONRenderer().render(data)
+    assert FastJSONRenderer().render(data) == rendered, 'renderers disagree'
+    body = practice_body(args.cards)
+
+    results = [
+        compare('render flashcards', lambda: JSONRenderer().render(data),
+                lambda: FastJSONRenderer().render(data), args.iterations, bytes=len(rendered)),
+        compare('parse practice results', lambda: JSONParser().parse(io.BytesIO(body)),
+                lambda: FastJSONParser().parse(io.BytesIO(body)), args.iterations, bytes=len(body)),
+    ]
+    print(json.dumps({'orjson': getattr(renderers.orjson, '__version__', None), 'cards': args.cards,
+                      'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+"""
+Replay learner study and practice journeys against a running server.
+
+Each journey logs in as one seeded learner and walks the same path the UI
+does: start a study session, fetch flashcards, PATCH a status per card, end
+the session, run a practice session (start, state, one answer per question,
+complete) and open the analytics page. Journeys run on a thread pool at the
+requested concurrency using only the standard library, and the report
+(throughput, p50/p95/p99 and error rate per endpoint) is printed as JSON so
+runs from different commits can be diffed.
+
+Seed learners first (they share one password), then start the server:
+    python manage.py seed_scale --users 200
+    python manage.py runserver --noreload
+
+Usage (from vocab_project/):
+    python benchmarks/load_replay.py [--base-url http://127.0.0.1:8000]
+        [--users 200] [--journeys 400] [--concurrency 16] [--output report.json]
+"""
+import argparse
+import json
+import random
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+STATUSES = ['learned', 'mastered', 'review_required']
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 2)
+
+
+class StepFailed(Exception):
+    pass
+
+
+class Recorder:
+    """Thread-safe latency and error samples keyed by endpoint template."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def add(self, endpoint, elapsed_ms, ok):
+        with self.lock:
+            self.samples.setdefault(endpoint, []).append(elapsed_ms)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self):
+        endpoints = {}
+        for endpoint, latencies in sorted(self.samples.items()):
+            errors = self.errors.get(endpoint, 0)
+            endpoints[endpoint] = {
+                'requests': len(latencies),
+                'errors': errors,
+                'error_rate': round(errors / len(latencies), 4),
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99),
+                'max_ms': round(max(latencies), 2),
+            }
+        return endpoints
+
+
+class Journey:
+    """One learner walking through study, practice and analytics."""
+
+    def __init__(self, args, recorder, username, seed):
+        self.args = args
+        self.recorder = recorder
+        self.username = username
+        self.rng = random.Random(seed)
+        self.token = None
+
+    def request(self, method, path, endpoint, body=None, expect_json=True):
+        headers = {'Accept': 'application/json'}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        if self.token:
+            headers['Authorization'] = f'Token {self.token}'
+        req = urllib.request.Request(self.args.base_url + path, data=data, headers=headers, method=method)
+
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=self.args.timeout) as response:
+                payload = response.read()
+                code = response.status
+        except urllib.error.HTTPError as exc:
+            payload = exc.read()
+            code = exc.code
+        except OSError as exc:
+            self.recorder.add(f'{method} {endpoint}', (time.perf_counter() - started) * 1000, False)
+            raise StepFailed(f'{method} {endpoint}: {exc}')
+        elapsed = (time.perf_counter() - started) * 1000
+
+        ok = 200 <= code < 300
+        self.recorder.add(f'{method} {endpoint}', elapsed, ok)
+        if not ok:
+            raise StepFailed(f'{method} {endpoint}: HTTP {code}')
+        if self.args.think_time:
+            time.sleep(self.args.think_time / 1000)
+        return json.loads(payload) if expect_json and payload else None
+
+    def run(self):
+        login = self.request('POST', '/api/auth/login/', '/api/auth/login/', {
+            'username': self.username, 'password': self.args.password
+        })
+        self.token = login['token']
+
+        plans = self.request('GET', '/api/learning/plans/', '/api/learning/plans/')
+        plans = plans['results'] if isinstance(plans, dict) else plans
+        active = [plan for plan in plans if plan.get('status') == 'active'] or plans
+        if not active:
+            raise StepFailed(f'{self.username} has no learning plans')
+        plan_id = self.rng.choice(active)['id']
+        base = f'/api/learning/plans/{plan_id}'
+
+        # Flashcard study
+        self.request('POST', f'{base}/start_session/', '/api/learning/plans/{id}/start_session/', {})
+        cards = self.request('GET', f'{base}/flashcards/?limit={self.args.cards}',
+                             '/api/learning/plans/{id}/flashcards/')
+        for card in cards:
+            self.request('PATCH', f'{base}/vocabulary/{card["vocabulary_id"]}/status/',
+                         '/api/learning/plans/{id}/vocabulary/{vocab_id}/status/',
+                         {'status': self.rng.choice(STATUSES)})
+        self.request('POST', f'{base}/end_session/', '/api/learning/plans/{id}/end_session/', {})
+
+        # Practice
+        started = self.request('POST', '/api/learning/practice/start/', '/api/learning/practice/start/', {
+            'learning_plan_id': plan_id,
+            'practice_type': self.rng.choice(['flashcard', 'english_input', 'vietnamese_input']),
+            'word_count': self.args.questions,
+        })
+        self.request('GET', '/api/learning/practice/state/', '/api/learning/practice/state/')
+        results = []
+        for position, question in enumerate(started['questions']):
+            answer = {
+                'position': position,
+                'vocabulary_id': question['vocabulary_id'],
+                'user_answer': question.get('answer') or '',
+                'correct': self.rng.random() < 0.7,
+                'self_evaluation': self.rng.choice(STATUSES),
+                'time_spent': round(self.rng.uniform(1.0, 10.0), 1),
+            }
+            self.request('PATCH', '/api/learning/practice/state/', '/api/learning/practice/state/',
+                         {'answer': answer})
+            results.append(answer)
+        self.request('POST', f'/api/learning/practice/{started["session_id"]}/complete/',
+                     '/api/learning/practice/{id}/complete/',
+                     {'results': results, 'duration_seconds': int(sum(r['time_spent'] for r in results))})
+
+        # Analytics page: the HTML shell, then the dashboard call its script makes
+        self.request('GET', '/analytics/', '/analytics/', expect_json=False)
+        self.request('GET', '/api/learning/dashboard/', '/api/learning/dashboard/')
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to replay against.')
+    parser.add_argument('--prefix', default='scale', help='Username prefix used by seed_scale.')
+    parser.add_argument('--password', default='scale12345', help='Password of the seeded learners.')
+    parser.add_argument('--users', type=int, default=200, help='Distinct learners to cycle through.')
+    parser.add_argument('--journeys', type=int, default=400, help='Journeys to run in total.')
+    parser.add_argument('--concurrency', type=int, default=16, help='Journeys in flight at once.')
+    parser.add_argument('--cards', type=int, default=10, help='Flashcards reviewed per study session.')
+    parser.add_argument('--questions', type=int, default=5, help='Questions per practice session.')
+    parser.add_argument('--think-time', type=float, default=0, help='Milliseconds to pause after each request.')
+    parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds.')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for per-journey choices.')
+    parser.add_argument('--output', help='Also write the JSON report to this file.')
+    args = parser.parse_args()
+    args.base_url = args.base_url.rstrip('/')
+
+    recorder = Recorder()
+    failures = []
+
+    def run_journey(n):
+        username = f'{args.prefix}_{n % args.users:05d}'
+        try:
+            Journey(args, recorder, username, seed=args.seed + n).run()
+        except StepFailed as exc:
+            failures.append(str(exc))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(run_journey, range(args.journeys)))
+    wall = time.perf_counter() - started
+
+    endpoints = recorder.report()
+    total = sum(e['requests'] for e in endpoints.values())
+    errors = sum(e['errors'] for e in endpoints.values())
+    report = {
+        'commit': current_commit(),
+        'base_url': args.base_url,
+        'concurrency': args.concurrency,
+        'journeys': args.journeys,
+        'journeys_failed': len(failures),
+        'duration_seconds': round(wall, 2),
+        'requests': total,
+        'requests_per_second': round(total / wall, 1) if wall else None,
+        'journeys_per_second': round(args.journeys / wall, 2) if wall else None,
+        'errors': errors,
+        'error_rate': round(errors / total, 4) if total else 0,
+        'endpoints': endpoints,
+        'sample_failures': failures[:10],
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Requests per second on a page shell with and without template caching.
+
+Seeds a throwaway SQLite database and drives the WSGI application in-process
+with one learner's auth_token cookie. /dashboard/ (or --path) is measured in
+three configurations, and throughput and latency percentiles are printed as
+JSON:
+  uncached      template loaders re-read and re-compile every template
+  cached_loader production's cached template loader
+  shell_cache   cached loader plus the per-role PAGE_SHELL_CACHE
+
+Usage (from vocab_project/):
+    python benchmarks/page_shells.py [--requests 2000] [--path /dashboard/]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+from django.conf import settings  # noqa: E402
+
+DB_DIR = tempfile.mkdtemp()
+settings.DATABASES['default']['NAME'] = os.path.join(DB_DIR, 'bench.sqlite3')
+settings.ALLOWED_HOSTS = ['*']
+settings.DEBUG = False
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+
+LOADERS = ['django.template.loaders.filesystem.Loader', 'django.template.loaders.app_directories.Loader']
+
+
+def templates(cached):
+    engine = dict(settings.TEMPLATES[0], APP_DIRS=False)
+    loaders = [('django.template.loaders.cached.Loader', LOADERS)] if cached else LOADERS
+    engine['OPTIONS'] = dict(engine['OPTIONS'], loaders=loaders)
+    return [engine]
+
+
+VARIANTS = [
+    ('uncached', templates(cached=False), False),
+    ('cached_loader', templates(cached=True), False),
+    ('shell_cache', templates(cached=True), True),
+]
+
+
+def seed():
+    from accounts.models import User
+    from rest_framework.authtoken.models import Token
+
+    call_command('migrate', verbosity=0)
+    user = User.objects.create_user(username='bench', password='bench12345', role='learner')
+    return Token.objects.create(user=user).key
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))], 3)
+
+
+def measure(client, path, requests):
+    for _ in range(20):  # warm caches and imports
+        client.get(path)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        response = client.get(path)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        assert response.status_code == 200, response.status_code
+    wall = time.perf_counter() - started
+    return {
+        'requests': requests,
+        'requests_per_second': round(requests / wall, 1),
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per configuration.')
+    parser.add_argument('--path', default='/dashboard/', help='Page to request.')
+    args = parser.parse_args()
+
+    token = seed()
+    results = {'path': args.path}
+    for name, template_settings, shell_cache in VARIANTS:
+        cache.clear()
+        with override_settings(TEMPLATES=template_settings,
+                               PAGE_SHELL_CACHE={'ENABLED': shell_cache, 'TIMEOUT': 3600}):
+            client = Client()
+            client.cookies['auth_token'] = token
+            results[name] = measure(client, args.path, args.requests)
+    baseline = results['uncached']['requests_per_second']
+    for name, _, _ in VARIANTS:
+        results[name]['speedup'] = round(results[name]['requests_per_second'] / baseline, 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
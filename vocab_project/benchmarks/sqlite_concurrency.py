@@ -0,0 +1,161 @@
+"""
+Reader latency on SQLite while a bulk import is writing.
+
+Simulates the vocabulary list endpoint (search + order by word) from several
+reader threads while one writer imports rows the way import_csv does (one
+commit per row). Runs once with SQLite defaults and once with the PRAGMAs and
+transaction mode from config/settings.py, then prints both as JSON.
+
+Usage (from vocab_project/):
+    python benchmarks/sqlite_concurrency.py [--rows 3000] [--readers 4]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings as project_settings  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE vocabularies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    word VARCHAR(255) NOT NULL,
+    meaning TEXT NOT NULL,
+    level VARCHAR(2),
+    is_system BOOL NOT NULL,
+    created_at DATETIME NOT NULL
+);
+CREATE INDEX vocabularies_word ON vocabularies (word);
+"""
+
+READ_SQL = """
+SELECT id, word, meaning, level FROM vocabularies
+WHERE is_system = 1 AND (word LIKE ? OR meaning LIKE ?)
+ORDER BY word LIMIT 20
+"""
+
+
+def connect(path, tuned):
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    if tuned:
+        for name, value in project_settings.SQLITE_PRAGMAS.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+def seed(path, tuned, rows):
+    conn = connect(path, tuned)
+    conn.executescript(SCHEMA)
+    conn.execute('BEGIN')
+    conn.executemany(
+        "INSERT INTO vocabularies (word, meaning, level, is_system, created_at) "
+        "VALUES (?, ?, 'A1', 1, datetime('now'))",
+        [(f'seed{i:06d}', f'meaning {i}') for i in range(rows)]
+    )
+    conn.execute('COMMIT')
+    conn.close()
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(tuned, rows, readers, seed_rows):
+    fd, path = tempfile.mkstemp(suffix='.sqlite3')
+    os.close(fd)
+    os.unlink(path)
+    try:
+        seed(path, tuned, seed_rows)
+        begin = f'BEGIN {project_settings.SQLITE_TRANSACTION_MODE}' if tuned else 'BEGIN'
+        stop = threading.Event()
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def writer():
+            conn = connect(path, tuned)
+            for i in range(rows):
+                try:
+                    conn.execute(begin)
+                    conn.execute(
+                        "INSERT INTO vocabularies (word, meaning, level, is_system, created_at) "
+                        "VALUES (?, ?, 'A1', 1, datetime('now'))",
+                        (f'import{i:06d}', f'imported meaning {i}')
+                    )
+                    conn.execute('COMMIT')
+                except sqlite3.OperationalError as exc:
+                    with lock:
+                        errors.append(f'writer: {exc}')
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+            conn.close()
+            stop.set()
+
+        def reader(n):
+            conn = connect(path, tuned)
+            term = f'%{n}%'
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    conn.execute(READ_SQL, (term, term)).fetchall()
+                    elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        latencies.append(elapsed)
+                except sqlite3.OperationalError as exc:
+                    with lock:
+                        errors.append(f'reader: {exc}')
+            conn.close()
+
+        threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+        threads.append(threading.Thread(target=writer))
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        return {
+            'profile': 'tuned' if tuned else 'default',
+            'import_rows': rows,
+            'import_seconds': round(wall, 2),
+            'reads': len(latencies),
+            'read_p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+            'read_p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+            'read_p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+            'read_mean_ms': round(statistics.mean(latencies), 2) if latencies else None,
+            'errors': len(errors),
+        }
+    finally:
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=3000, help='Rows imported by the writer.')
+    parser.add_argument('--readers', type=int, default=4, help='Concurrent reader threads.')
+    parser.add_argument('--seed-rows', type=int, default=20000, help='Rows present before the import.')
+    args = parser.parse_args()
+
+    results = [
+        run(tuned=False, rows=args.rows, readers=args.readers, seed_rows=args.seed_rows),
+        run(tuned=True, rows=args.rows, readers=args.readers, seed_rows=args.seed_rows),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
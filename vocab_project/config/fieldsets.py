@@ -0,0 +1,64 @@
+"""
+Sparse fieldsets: ?fields=word,status or ?exclude=note,example_sentence.
+
+Endpoints declare their output fields in order, using dotted names for
+fields of a nested object ("vocabulary.word"), and list the fields a client
+may request by name. Fields missing from that allowlist, such as nested
+topics with their vocabulary counts, stay in the default output and can be
+excluded, but they cannot be requested with ?fields=. The endpoint then
+narrows both its output and the columns it loads to the selected fields.
+"""
+from rest_framework.exceptions import ValidationError
+
+
+def _names(params, key):
+    return [name.strip() for name in params.get(key, '').split(',') if name.strip()]
+
+
+def sparse_fields(params, declared, allowed=None):
+    """
+    The fields selected by ?fields= or ?exclude=, in declared order, or None
+    when neither is given. Unknown names, and ?fields= names outside
+    `allowed` (by default every declared field), raise a 400.
+    """
+    allowed = declared if allowed is None else allowed
+    fields, exclude = _names(params, 'fields'), _names(params, 'exclude')
+    if fields and exclude:
+        raise ValidationError({'fields': ['Use either fields or exclude, not both.']})
+    if fields:
+        unknown = [name for name in fields if name not in allowed]
+        if unknown:
+            raise ValidationError({'fields': [
+                f"Unknown or unavailable field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}."
+            ]})
+        return tuple(name for name in declared if name in fields)
+    if exclude:
+        unknown = [name for name in exclude if name not in declared]
+        if unknown:
+            raise ValidationError({'exclude': [f"Unknown field(s): {', '.join(unknown)}."]})
+        return tuple(name for name in declared if name not in exclude)
+    return None
+
+
+def restrict_fields(serializer, fields):
+    """Drop the serializer's fields not named in `fields`, recursing into dotted names."""
+    nested = {}
+    for name in fields:
+        head, _, rest = name.partition('.')
+        nested.setdefault(head, [])
+        if rest:
+            nested[head].append(rest)
+    for name in list(serializer.fields):
+        if name not in nested:
+            serializer.fields.pop(name)
+        elif nested[name]:
+            restrict_fields(serializer.fields[name], nested[name])
+
+
+class SparseFieldsMixin:
+    """Serializer mixin taking fields=(...) from sparse_fields() to narrow its output."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            restrict_fields(self, fields)
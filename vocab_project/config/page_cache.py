@@ -0,0 +1,87 @@
+"""
+Per-role caching of the rendered page shells.
+
+The page views render large templates. Their output depends only on the
+template, the user's role and the URL, because everything user-specific is
+filled in client-side from the API. cache_page_shell stores the rendered
+body under (static manifest hash, role, path). A deploy that changes the
+static assets also changes the manifest, so it starts from an empty cache.
+The page_cache context processor gives templates the same role and version
+for {% cache %} fragments such as the sidebar.
+"""
+import hashlib
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from ops.metrics import record_cache
+
+DEFAULTS = {
+    'ENABLED': False,
+    'CACHE': 'default',
+    'TIMEOUT': 3600,
+}
+
+
+def page_cache_options():
+    options = dict(DEFAULTS)
+    options.update(getattr(settings, 'PAGE_SHELL_CACHE', {}))
+    return options
+
+
+@lru_cache(maxsize=1)
+def static_version():
+    """Short hash of the staticfiles manifest; 'dev' when the storage keeps none."""
+    from django.contrib.staticfiles.storage import staticfiles_storage
+
+    read_manifest = getattr(staticfiles_storage, 'read_manifest', None)
+    content = read_manifest() if read_manifest else None
+    return hashlib.sha1(content.encode()).hexdigest()[:12] if content else 'dev'
+
+
+def user_role(request):
+    user = getattr(request, 'user', None)
+    return getattr(user, 'role', None) or 'anonymous'
+
+
+def shell_cache_key(request):
+    return f'page-shell:{static_version()}:{user_role(request)}:{request.path}'
+
+
+def cache_page_shell(view_func):
+    """Serve a page view's 200 responses from the cache, per role and path."""
+    @wraps(view_func)
+    def wrapped_view(request, *args, **kwargs):
+        options = page_cache_options()
+        if not options['ENABLED'] or request.method != 'GET':
+            return view_func(request, *args, **kwargs)
+
+        cache = caches[options['CACHE']]
+        key = shell_cache_key(request)
+        cached = cache.get(key)
+        record_cache('page_shell', hit=cached is not None)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = view_func(request, *args, **kwargs)
+        # Pages that set cookies or issue a CSRF token are per-visitor
+        if (response.status_code == 200 and not response.streaming and not response.cookies
+                and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')):
+            cache.set(key, (response.content, response['Content-Type']), options['TIMEOUT'])
+        return response
+
+    return wrapped_view
+
+
+def page_cache(request):
+    """Context processor: vary-on values and timeout for {% cache %} fragments."""
+    options = page_cache_options()
+    return {'page_cache': {
+        'role': user_role(request),
+        'static_version': static_version(),
+        # A 0 timeout stores nothing, so fragments render fresh while disabled
+        'timeout': options['TIMEOUT'] if options['ENABLED'] else 0,
+    }}
@@ -0,0 +1,74 @@
+"""
+JSON renderer and parser backed by orjson, falling back to DRF's stdlib ones.
+
+The output matches rest_framework.renderers.JSONRenderer: compact separators,
+UTF-8 rather than \\u escapes, and escaped U+2028/U+2029. Values orjson does
+not handle, or would format differently, go through DRF's
+JSONEncoder.default: datetimes, dates and times (DRF's "Z" suffix), Decimal,
+lazy translation strings, querysets and generators. Indented output (the
+browsable API or "; indent=N") uses the stdlib renderer, and so does data
+orjson rejects (integers beyond 64 bits) or would write as null (NaN and
+Infinity, which DRF rejects with ValueError). The one difference left is the
+exponent of large and small floats: orjson writes 1e16 and 1e-7 where the
+stdlib writes 1e+16 and 1e-07. Both parse to the same number.
+"""
+import math
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+_default = encoders.JSONEncoder().default
+
+
+def _has_non_finite(value):
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(item) for item in value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default,
+                               option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits, or a value neither encoder handles (stdlib raises)
+            return super().render(data, accepted_media_type, renderer_context)
+        # orjson writes NaN and Infinity as null; the stdlib renderer raises ValueError
+        if b'null' in ret and _has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = get_encoding(parser_context or {})
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            # orjson rejects NaN/Infinity, matching STRICT_JSON
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,10 +49,12 @@ INSTALLED_APPS = [
     'writing',
     'listening',
     'notifications',
+    'ops',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'ops.middleware.RequestInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,6 +62,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'ops.middleware.RequestProfilingMiddleware',
+    'ops.slow_queries.SlowQueryViewMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -74,6 +79,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'config.page_cache.page_cache',
             ],
         },
     },
@@ -87,11 +93,27 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'config.sqlite_backend',
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
 
+# Applied to every new SQLite connection (see config/sqlite_backend/base.py).
+# WAL lets readers proceed while a writer (e.g. a CSV import) holds the lock.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,       # ms to wait for a lock before raising
+    'cache_size': -20000,       # negative = KiB, ~20 MB page cache
+    'mmap_size': 134217728,     # 128 MB memory-mapped I/O
+    'temp_store': 'MEMORY',
+}
+
+# DEFERRED, IMMEDIATE or EXCLUSIVE. IMMEDIATE takes the write lock when a
+# transaction starts so concurrent writers queue on busy_timeout instead of
+# failing with "database is locked" on lock upgrade.
+SQLITE_TRANSACTION_MODE = 'IMMEDIATE'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -145,12 +167,135 @@ LOGIN_REDIRECT_URL = 'dashboard'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson-backed when installed; matches DRF's JSON renderer but for float exponents (see config.renderers)
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'config.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Per-process cache for development and tests. settings_production swaps in a
+# file-based cache that all gunicorn workers share, which the token cache
+# below relies on for logout and role changes to reach every worker.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+# Token -> user lookups cached in CACHES[CACHE] for TTL seconds; TTL 0 disables
+TOKEN_AUTH_CACHE = {
+    'TTL': 60,
+    'CACHE': 'default',
+}
+
+# Per-request query/timing instrumentation (ops.middleware); off by default
+REQUEST_INSTRUMENTATION = {
+    'ENABLED': False,
+    'LOG': True,                 # structured line per request on the 'ops.requests' logger
+    'SAMPLES_PER_ROUTE': 1000,   # timings kept per route for /api/ops/route-stats/
+}
+
+# Prometheus metrics at /metrics. Scrapers send "Authorization: Bearer <TOKEN>";
+# the endpoint 404s while TOKEN is empty. With several worker processes set
+# DIR to a directory shared by them (cleared on restart) so /metrics sums all.
+METRICS = {
+    'ENABLED': True,
+    'TOKEN': os.environ.get('METRICS_TOKEN', ''),
+    'DIR': os.environ.get('METRICS_DIR') or None,
+    'FLUSH_INTERVAL': 1.0,       # seconds between a worker's snapshot writes
+}
+
+# Conditional GET (ops.conditional): strong ETags from per-table write counters
+# on rarely-changing lists; a matching If-None-Match is answered 304 before the
+# list query runs. CACHE_CONTROL is sent per endpoint on 200 and 304 responses.
+# Change SALT to invalidate every ETag after a deploy that changes a response.
+CONDITIONAL_GET = {
+    'ENABLED': True,
+    'SALT': '',
+    'ENDPOINTS': {
+        'topics': {'CACHE_CONTROL': 'private, no-cache'},             # /api/topics/
+        'system_vocabulary': {'CACHE_CONTROL': 'private, no-cache'},  # /api/vocabulary/system/
+    },
+}
+
+# Per-role cache of rendered page shells and {% cache %} fragments such as the
+# sidebar (config.page_cache), keyed by the static manifest hash so each deploy
+# starts fresh. Off here so template edits show up; production turns it on.
+PAGE_SHELL_CACHE = {
+    'ENABLED': False,
+    'CACHE': 'default',
+    'TIMEOUT': 3600,
+}
+
+# Offline flashcard decks (/api/learning/plans/<id>/deck/, learning.decks): the
+# gzip-compressed deck is cached under the plan's cards_version and the
+# vocabulary table version, so a write to either moves to a fresh entry.
+DECK_CACHE = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    'TIMEOUT': 24 * 3600,
+}
+
+# Topic list counts by level (topics.counts): one grouped query, cached under
+# the vocabulary_topics and vocabularies table versions.
+TOPIC_COUNTS_CACHE = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    'TIMEOUT': 24 * 3600,
+}
+
+# Incremental vocabulary sync (/api/vocabulary/changes/, vocabulary.changes).
+# Changes younger than SETTLE_SECONDS are held back so a write still waiting on
+# the SQLite lock (busy_timeout) commits before the feed moves past its
+# timestamp; keep it above the busy timeout.
+VOCABULARY_CHANGES = {
+    'SETTLE_SECONDS': 10,
+    'PAGE_SIZE': 500,
+    'MAX_PAGE_SIZE': 1000,
+}
+
+# Async read views (learning.async_views) for flashcards, plan progress and the
+# unread count. When ENABLED they are served at the DRF views' own paths, so
+# clients need no change. config.asgi turns this on; WSGI workers keep the DRF
+# views, since there an async view only adds a thread hop.
+ASYNC_VIEWS = {
+    'ENABLED': os.environ.get('DJANGO_ASYNC_VIEWS') == '1',
+}
+
+# Slow-query log: queries slower than THRESHOLD_MS are appended, with their
+# EXPLAIN QUERY PLAN, to a rotating JSONL file. Summarise with
+# `python manage.py slow_queries`.
+SLOW_QUERY_LOG = {
+    'ENABLED': os.environ.get('SLOW_QUERY_LOG') == '1',
+    'THRESHOLD_MS': 100,
+    'PATH': BASE_DIR / 'logs' / 'slow_queries.jsonl',
+    'MAX_BYTES': 10 * 1024 * 1024,
+    'BACKUP_COUNT': 5,
+    'EXPLAIN': True,
+    'STACK_DEPTH': 6,            # project frames kept per entry
+}
+
+# Admin-only single-request profiling: send "X-Profile: 1" or "?_profile=1"
+# as an admin; profiles are listed and downloaded from /api/ops/profiles/.
+REQUEST_PROFILING = {
+    'ENABLED': True,
+    'HEADER': 'X-Profile',
+    'QUERY_PARAM': '_profile',
+    'DIR': BASE_DIR / 'profiles',
+    'MAX_PROFILES': 50,          # ring buffer size; oldest profiles are deleted first
+    'SAMPLE_INTERVAL': 0.001,    # seconds between stack samples for the collapsed view
 }
 
 # CORS settings
@@ -1,6 +1,8 @@
 """
 Production settings for VocabMaster project.
 """
+import os
+
 from .settings import *
 
 # Production settings
@@ -22,7 +24,33 @@ MEDIA_URL = '/media/'
 
 # Whitenoise for static files
 MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# STORAGES replaces STATICFILES_STORAGE, which Django 5.1+ ignores
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+
+# Keep compiled templates per process, and serve page shells from the per-role
+# cache keyed by the manifest collectstatic writes (see config.page_cache)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+PAGE_SHELL_CACHE = dict(PAGE_SHELL_CACHE, ENABLED=True)
+
+# One cache for all gunicorn workers: token snapshots (accounts.authentication)
+# must be deleted everywhere on logout, deactivation or a role change. systemd
+# creates the directory (CacheDirectory= in deploy/deploy.sh).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', '/var/cache/vocabmaster'),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
 
 # CSRF settings
 CSRF_TRUSTED_ORIGINS = [
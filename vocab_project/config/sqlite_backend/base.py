@@ -0,0 +1,32 @@
+"""
+SQLite backend tuned for concurrent readers and writers.
+
+Applies the PRAGMAs from settings.SQLITE_PRAGMAS to every new connection
+(WAL journaling, relaxed fsync, busy timeout, cache/mmap sizing) and starts
+transactions with settings.SQLITE_TRANSACTION_MODE.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = getattr(settings, 'SQLITE_TRANSACTION_MODE', None)
+        if not mode:
+            return super()._start_transaction_under_autocommit()
+        mode = mode.upper()
+        if mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f'SQLITE_TRANSACTION_MODE must be one of {", ".join(TRANSACTION_MODES)}.'
+            )
+        self.cursor().execute(f'BEGIN {mode}')
@@ -0,0 +1,127 @@
+import datetime
+import decimal
+import io
+import uuid
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from . import renderers
+from .fieldsets import sparse_fields
+from .renderers import FastJSONParser, FastJSONRenderer
+
+User = get_user_model()
+
+PAYLOAD = {
+    'id': 7,
+    'word': 'café \u2028 line',
+    'created_at': datetime.datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+    'naive': datetime.datetime(2026, 1, 2, 3, 4, 5),
+    'date': datetime.date(2026, 1, 2),
+    'time': datetime.time(9, 30),
+    'duration': datetime.timedelta(minutes=3),
+    'score': decimal.Decimal('12.50'),
+    'label': gettext_lazy('Vocabulary'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'counts': {1: 'one', 'two': 2},
+    'tags': ('a', 'b'),
+    'nested': [{'ok': True, 'ratio': 0.25, 'none': None}],
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Test that the fast renderer and parser match DRF's JSON ones"""
+
+    def test_output_matches_drf_renderer(self):
+        """Test that rendered bytes are identical to JSONRenderer"""
+        expected = JSONRenderer().render(PAYLOAD)
+        self.assertEqual(FastJSONRenderer().render(PAYLOAD), expected)
+        self.assertIn(b'\\u2028', expected)
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_stdlib_fallback_and_indent(self):
+        """Test that output is unchanged without orjson and when indentation is requested"""
+        with patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOAD, 'application/json; indent=2'),
+            JSONRenderer().render(PAYLOAD, 'application/json; indent=2'),
+        )
+
+    def test_stdlib_fallback_for_data_orjson_mishandles(self):
+        """Test that big integers render and NaN/Infinity raise as with JSONRenderer"""
+        big = {'id': 2 ** 70, 'nested': [-(2 ** 64)]}
+        self.assertEqual(FastJSONRenderer().render(big), JSONRenderer().render(big))
+        for value in [float('nan'), float('inf'), float('-inf')]:
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render({'nested': [{'ratio': value}]})
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({'value': object()})
+
+    def test_float_exponent_differs_only_in_format(self):
+        """Test that exponent floats parse to the same values JSONRenderer writes"""
+        data = {'large': 1e16, 'small': 1e-7, 'ratio': 0.25, 'none': None}
+        self.assertEqual(FastJSONRenderer().render(data), b'{"large":1e16,"small":1e-7,"ratio":0.25,"none":null}')
+        self.assertEqual(JSONParser().parse(io.BytesIO(FastJSONRenderer().render(data))),
+                         JSONParser().parse(io.BytesIO(JSONRenderer().render(data))))
+
+    def test_parser_matches_drf_parser(self):
+        """Test that parsing agrees with JSONParser and rejects invalid input"""
+        body = '{"word": "café", "ids": [1, 2], "score": 1.5, "ok": true}'.encode()
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+        for bad in [b'{"word": ', b'{"score": NaN}']:
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(bad))
+        latin1 = '{"word": "café"}'.encode('latin-1')
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(latin1), parser_context={'encoding': 'latin-1'}),
+                         {'word': 'café'})
+
+
+class FastJSONSettingsTests(APITestCase):
+    """Test that the API negotiates the fast renderer and parser"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='admin', email='admin@test.com', password='admin123', role='admin')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+
+    def test_api_uses_fast_json(self):
+        """Test that API responses and JSON bodies go through config.renderers"""
+        response = self.client.post('/api/topics/', {'name': 'Food'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        self.assertLessEqual(timezone.now().year - int(response.json()['created_at'][:4]), 1)
+
+        response = self.client.post('/api/topics/', '{"name": ', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('JSON parse error', response.json()['detail'])
+
+
+class SparseFieldsTests(SimpleTestCase):
+    """Test suite for the ?fields= / ?exclude= parser"""
+
+    declared = ('id', 'word', 'topics', 'nested.a', 'nested.b')
+    allowed = ('id', 'word', 'nested.a', 'nested.b')
+
+    def test_selection_follows_declared_order(self):
+        """Test that fields come back in declared order whatever order they were asked in"""
+        self.assertIsNone(sparse_fields({}, self.declared, self.allowed))
+        self.assertEqual(sparse_fields({'fields': 'nested.a, word'}, self.declared, self.allowed), ('word', 'nested.a'))
+        self.assertEqual(sparse_fields({'exclude': 'id,nested.b'}, self.declared, self.allowed),
+                         ('word', 'topics', 'nested.a'))
+
+    def test_allowlist_and_unknown_names(self):
+        """Test that fields outside the allowlist can be excluded but not requested"""
+        for params in ({'fields': 'topics'}, {'fields': 'word,bogus'}, {'exclude': 'bogus'},
+                       {'fields': 'id', 'exclude': 'word'}):
+            with self.assertRaises(ValidationError):
+                sparse_fields(params, self.declared, self.allowed)
@@ -3,6 +3,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from ops.views import metrics_view
+
 from .views import (
     index, login_view, register_view,
     dashboard_view, vocabulary_view, topics_view,
@@ -20,6 +22,11 @@ urlpatterns = [
     path('api/topics/', include('topics.urls')),
     path('api/vocabulary/', include('vocabulary.urls')),
     path('api/learning/', include('learning.urls')),
+    path('api/notifications/', include('notifications.urls')),
+    path('api/ops/', include('ops.urls')),
+
+    # Prometheus scrape target (bearer token from settings.METRICS)
+    path('metrics', metrics_view, name='metrics'),
 
     # Frontend pages
     path('', index, name='index'),
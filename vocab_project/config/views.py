@@ -1,7 +1,8 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import get_user_model
-from rest_framework.authtoken.models import Token
+from accounts.authentication import get_user_for_token
+from .page_cache import cache_page_shell
 from functools import wraps
 
 User = get_user_model()
@@ -23,23 +24,18 @@ def token_or_login_required(view_func):
         # Check for token-based authentication via header
         auth_header = request.META.get('HTTP_AUTHORIZATION', '')
         if auth_header.startswith('Token '):
-            token_key = auth_header.split(' ')[1]
-            try:
-                token = Token.objects.get(key=token_key)
-                request.user = token.user
+            user = get_user_for_token(auth_header.split(' ')[1])
+            if user is not None:
+                request.user = user
                 return view_func(request, *args, **kwargs)
-            except Token.DoesNotExist:
-                pass
         
         # Check for token in cookie
         token_key = request.COOKIES.get('auth_token')
         if token_key:
-            try:
-                token = Token.objects.get(key=token_key)
-                request.user = token.user
+            user = get_user_for_token(token_key)
+            if user is not None:
+                request.user = user
                 return view_func(request, *args, **kwargs)
-            except Token.DoesNotExist:
-                pass
         
         # If no valid authentication, redirect to login
         from django.contrib.auth.views import redirect_to_login
@@ -64,48 +60,56 @@ def register_view(request):
 
 
 @token_or_login_required
+@cache_page_shell
 def dashboard_view(request):
     """Dashboard page."""
     return render(request, 'dashboard.html')
 
 
 @token_or_login_required
+@cache_page_shell
 def vocabulary_view(request):
     """Vocabulary management page."""
     return render(request, 'vocabulary.html')
 
 
 @token_or_login_required
+@cache_page_shell
 def topics_view(request):
     """Topics management page."""
     return render(request, 'topics.html')
 
 
 @token_or_login_required
+@cache_page_shell
 def learning_plans_view(request):
     """Learning plans page."""
     return render(request, 'learning/plans.html')
 
 
 @token_or_login_required
+@cache_page_shell
 def study_view(request, plan_id):
     """Flashcard study page."""
     return render(request, 'learning/study.html', {'plan_id': plan_id})
 
 
 @token_or_login_required
+@cache_page_shell
 def practice_view(request):
     """Practice session page."""
     return render(request, 'learning/practice.html')
 
 
 @token_or_login_required
+@cache_page_shell
 def analytics_view(request):
     """Analytics dashboard page."""
     return render(request, 'learning/analytics.html')
 
 
 @token_or_login_required
+@cache_page_shell
 def admin_users_view(request):
     """Admin user management page."""
     if not is_admin(request.user):
@@ -114,6 +118,7 @@ def admin_users_view(request):
 
 
 @token_or_login_required
+@cache_page_shell
 def admin_system_vocabulary_view(request):
     """Admin system vocabulary management page."""
     if not is_admin(request.user):
@@ -122,6 +127,7 @@ def admin_system_vocabulary_view(request):
 
 
 @token_or_login_required
+@cache_page_shell
 def admin_vocabulary_management_view(request):
     """Admin vocabulary management page with same UI as vocabulary list."""
     if not is_admin(request.user):
@@ -130,6 +136,7 @@ def admin_vocabulary_management_view(request):
 
 
 @token_or_login_required
+@cache_page_shell
 def admin_analytics_view(request):
     """Admin analytics dashboard page."""
     if not is_admin(request.user):
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     LearningPlan, LearningPlanVocabulary, LearningProgress,
-    LearningSession, PracticeSession, LearnerAnalytics, LearningNotification
+    LearningSession, PracticeSession, LearnerAnalytics, LearningNotification,
+    NotificationReadState
 )
 
 
@@ -53,3 +54,15 @@ class NotificationAdmin(admin.ModelAdmin):
     list_display = ['user', 'notification_type', 'title', 'is_read', 'created_at']
     list_filter = ['notification_type', 'is_read', 'created_at']
     search_fields = ['user__username', 'title']
+
+
+@admin.register(NotificationReadState)
+class NotificationReadStateAdmin(admin.ModelAdmin):
+    list_display = ['user', 'last_read_at', 'unread_count', 'updated_at']
+    search_fields = ['user__username']
+    actions = ['recount_unread']
+
+    @admin.action(description='Recount unread notifications from the rows')
+    def recount_unread(self, request, queryset):
+        updated = NotificationReadState.recount(*queryset.values_list('user_id', flat=True))
+        self.message_user(request, f'Recounted {updated} read state(s).')
@@ -0,0 +1,137 @@
+"""
+Async read-only endpoints for the hottest learner pages.
+
+These mirror DRF read actions with Django's async ORM, so an ASGI server
+(`gunicorn -k uvicorn.workers.UvicornWorker config.asgi:application`) does not
+hold a worker thread while it waits on the database. With
+settings.ASYNC_VIEWS['ENABLED'], which config.asgi sets, learning.urls serves
+them at the DRF views' own paths. They are always reachable under
+/api/learning/async/ for the tests and benchmarks/async_views.py. Each view
+does the same work and returns the same responses as its DRF counterpart,
+authentication errors included. The analytics summary has no DRF path of its
+own (it is the `summary` key of the analytics list, which also recalculates),
+so it is only served under /api/learning/async/. Writes stay on the sync views.
+"""
+import random
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework.exceptions import APIException, MethodNotAllowed, NotAuthenticated, ValidationError
+
+from accounts.authentication import CachedTokenAuthentication, token_cache
+from config.fieldsets import sparse_fields
+from .models import LearningPlan, NotificationReadState
+from .serializers import FLASHCARD_FIELDS, LearningProgressSerializer, flashcard_data, flashcard_rows
+from .services import AnalyticsService
+from .views import flashcard_queryset, progress_queryset, sync_daily_schedule
+
+DEFAULTS = {
+    'ENABLED': False,
+}
+
+
+def async_views_options():
+    options = dict(DEFAULTS)
+    options.update(getattr(settings, 'ASYNC_VIEWS', {}))
+    return options
+
+
+class _TokenHeader(CachedTokenAuthentication):
+    """Parses the Authorization header exactly as DRF does, but returns the key unchecked."""
+
+    def authenticate_credentials(self, key):
+        return key
+
+
+async def aget_request_user(request):
+    """
+    Resolve the user from a token header or the session, or None if there are
+    no credentials. Bad tokens raise the AuthenticationFailed DRF would.
+    """
+    key = _TokenHeader().authenticate(request)
+    if key is not None:
+        user = token_cache.get(key)
+        if user is None:
+            # Cache miss: DRF's own lookup, which also fills the cache
+            user, _ = await sync_to_async(CachedTokenAuthentication().authenticate_credentials)(key)
+        return user
+
+    if hasattr(request, 'auser'):
+        user = await request.auser()
+    else:
+        user = await sync_to_async(lambda: request.user)()
+    return user if user.is_authenticated else None
+
+
+def async_login_required(view_func):
+    """Reject unauthenticated requests, then anything but GET, with the responses DRF returns."""
+    @wraps(view_func)
+    async def wrapped_view(request, *args, **kwargs):
+        try:
+            user = await aget_request_user(request)
+            if user is None:
+                raise NotAuthenticated()
+        except APIException as exc:
+            return JsonResponse(
+                {'detail': str(exc.detail)}, status=exc.status_code,
+                headers={'WWW-Authenticate': CachedTokenAuthentication.keyword}
+            )
+        if request.method not in ('GET', 'HEAD'):
+            return JsonResponse(
+                {'detail': str(MethodNotAllowed(request.method).detail)}, status=405,
+                headers={'Allow': 'GET, HEAD'}
+            )
+        return await view_func(request, user, *args, **kwargs)
+    return wrapped_view
+
+
+async def _get_plan(user, pk):
+    return await LearningPlan.objects.filter(pk=pk, user=user).afirst()
+
+
+@async_login_required
+async def flashcards(request, user, pk):
+    """Async GET /plans/<pk>/flashcards/."""
+    plan = await _get_plan(user, pk)
+    if plan is None:
+        return JsonResponse({'detail': 'No LearningPlan matches the given query.'}, status=404)
+
+    try:
+        fields = sparse_fields(request.GET, FLASHCARD_FIELDS)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+    queryset, shuffle = flashcard_queryset(plan, request.GET)
+    items = flashcard_data([row async for row in flashcard_rows(queryset, fields)], fields)
+    if shuffle:
+        random.shuffle(items)
+    return JsonResponse(items, safe=False)
+
+
+@async_login_required
+async def plan_progress(request, user, pk):
+    """Async GET /plans/<pk>/progress/."""
+    plan = await _get_plan(user, pk)
+    if plan is None:
+        return JsonResponse({'detail': 'No LearningPlan matches the given query.'}, status=404)
+
+    # The schedule sync is a handful of writes, so it runs on the sync side as in the DRF action
+    await sync_to_async(sync_daily_schedule)(plan)
+    rows = [row async for row in progress_queryset(plan, user, request.GET)]
+    return JsonResponse(LearningProgressSerializer(rows, many=True).data, safe=False)
+
+
+@async_login_required
+async def analytics_summary(request, user):
+    """Async `summary` of GET /analytics/, without recalculating the analytics."""
+    return JsonResponse(await AnalyticsService.aget_summary(user))
+
+
+@async_login_required
+async def unread_count(request, user):
+    """Async GET /notifications/unread_count/."""
+    state = await NotificationReadState.objects.filter(user=user).afirst()
+    if state is None:
+        state = await sync_to_async(NotificationReadState.for_user)(user)
+    return JsonResponse({'count': state.unread_count})
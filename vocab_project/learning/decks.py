@@ -0,0 +1,101 @@
+"""
+Offline flashcard decks: all of a plan's cards in one gzip-compressed,
+content-hashed download.
+
+The deck is columnar JSON: one array per flashcard field instead of one
+object per card, so the field names appear once.
+
+    {"plan_id": 7, "count": 2, "cards": {"id": [3, 4], "word": ["apple", "bread"], ...}}
+
+The ETag is a hash of that JSON. A client that sends it back in
+If-None-Match gets a 304 while the deck is unchanged. The compressed body
+and its ETag are cached under the plan's cards_version, which every write
+to the plan's cards advances: learning.signals for card saves and deletes
+and for edits and deletes of a word the plan holds,
+LearningPlanVocabularyQuerySet for queryset writes to cards and
+vocabulary.bulk's pre_bulk_update for set-based word edits. A new version
+moves later requests to a new cache key, so stale decks are never served
+and nothing has to be deleted from the cache. Editing a word leaves the
+decks of plans without it cached.
+"""
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import quote_etag
+
+from config.renderers import FastJSONRenderer
+from ops.conditional import etag_matches
+from ops.metrics import record_cache
+from .models import LearningPlanVocabulary
+from .serializers import FLASHCARD_COLUMNS, FLASHCARD_FIELDS, flashcard_rows
+from vocabulary.serializers import datetime_representation
+
+# Vocabulary columns a deck shows; saving any other field leaves decks alone
+DECK_VOCABULARY_FIELDS = frozenset(
+    column.split('__', 1)[1] for column in FLASHCARD_COLUMNS.values() if column.startswith('vocabulary__')
+)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    'TIMEOUT': 24 * 3600,
+}
+
+
+def deck_cache_options():
+    options = dict(DEFAULTS)
+    options.update(getattr(settings, 'DECK_CACHE', {}))
+    return options
+
+
+def deck_data(plan):
+    """The plan's cards, ordered by word, as {field: [values]}."""
+    rows = list(flashcard_rows(
+        LearningPlanVocabulary.objects.filter(learning_plan=plan).order_by('vocabulary__word', 'id')
+    ))
+    columns = [list(column) for column in zip(*rows)] or [[] for _ in FLASHCARD_FIELDS]
+    cards = dict(zip(FLASHCARD_FIELDS, columns))
+    to_datetime = datetime_representation()
+    cards['last_reviewed_at'] = [to_datetime(value) for value in cards['last_reviewed_at']]
+    return {'plan_id': plan.pk, 'count': len(rows), 'cards': cards}
+
+
+def build_deck(plan):
+    """(etag, gzip-compressed body) for the plan's current cards."""
+    body = FastJSONRenderer().render(deck_data(plan))
+    # mtime=0 keeps the compressed bytes identical for identical decks
+    return quote_etag(hashlib.sha1(body).hexdigest()), gzip.compress(body, mtime=0)
+
+
+def get_deck(plan):
+    """build_deck(plan), served from the cache while the plan's cards are unchanged."""
+    options = deck_cache_options()
+    if not options['ENABLED']:
+        return build_deck(plan)
+    cache = caches[options['CACHE']]
+    key = f'deck:{plan.pk}:{plan.cards_version}'
+    deck = cache.get(key)
+    record_cache('deck', hit=deck is not None)
+    if deck is None:
+        deck = build_deck(plan)
+        cache.set(key, deck, options['TIMEOUT'])
+    return deck
+
+
+def deck_response(request, plan):
+    etag, body = get_deck(plan)
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        response = HttpResponse(status=304)
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = HttpResponse(body, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(gzip.decompress(body), content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ['Accept-Encoding', 'Authorization', 'Cookie'])
+    return response
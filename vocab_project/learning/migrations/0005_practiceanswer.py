@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0004_notificationreadstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PracticeAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(help_text='Index of the question in the session')),
+                ('vocabulary_id', models.BigIntegerField()),
+                ('user_answer', models.TextField(blank=True, default='')),
+                ('correct', models.BooleanField(default=False)),
+                ('self_evaluation', models.CharField(blank=True, max_length=20, null=True)),
+                ('time_spent', models.FloatField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='practice_answers', to='learning.learningsession')),
+            ],
+            options={
+                'db_table': 'practice_answers',
+                'ordering': ['position', 'id'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0005_practiceanswer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learningplan',
+            name='cards_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:53
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def drop_repeated_answers(apps, schema_editor):
+    # Earlier PATCHes inserted a row per submission; the latest one per position is the answer
+    PracticeAnswer = apps.get_model('learning', 'PracticeAnswer')
+    latest = PracticeAnswer.objects.order_by().values('session_id', 'position').annotate(latest=Max('id')).values('latest')
+    PracticeAnswer.objects.exclude(id__in=latest).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0006_plan_cards_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_repeated_answers, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='practiceanswer',
+            unique_together={('session', 'position')},
+        ),
+    ]
@@ -1,6 +1,12 @@
+from datetime import datetime, timezone as dt_timezone
+
 from django.db import models
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
 
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
 
 class LearningPlan(models.Model):
     """
@@ -24,6 +30,8 @@ class LearningPlan(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='active')
     words_per_session = models.PositiveIntegerField(default=10, help_text='Words targeted per study session')
     selected_levels = models.JSONField(default=list)  # ['A1', 'B1', ...]
+    # Advanced on every write to the plan's cards; keys the cached offline deck
+    cards_version = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -45,6 +53,18 @@ class LearningPlan(models.Model):
     def __str__(self):
         return f"{self.name} - {self.user.username}"
 
+    @classmethod
+    def bump_cards_version(cls, *plan_ids):
+        """Invalidate the cached decks of these plans (called for every write to their cards)."""
+        cls.objects.filter(pk__in=plan_ids).update(cards_version=F('cards_version') + 1)
+
+    @classmethod
+    def bump_cards_version_for_words(cls, vocabulary):
+        """Invalidate the cached decks of every plan holding one of these words (ids or a Vocabulary queryset)."""
+        cls.objects.filter(
+            pk__in=LearningPlanVocabulary.objects.filter(vocabulary__in=vocabulary).values('learning_plan_id')
+        ).update(cards_version=F('cards_version') + 1)
+
     @property
     def total_days(self):
         """FR-LP-05: Calculate total number of days in the plan."""
@@ -59,6 +79,27 @@ class LearningPlan(models.Model):
         return total_words
 
 
+class LearningPlanVocabularyQuerySet(models.QuerySet):
+    """
+    Queryset writes skip the model signals that advance cards_version
+    (learning.signals), so update(), and with it bulk_update(), and
+    bulk_create() advance it here for every plan they touch.
+    """
+
+    def update(self, **kwargs):
+        # Before the update, which may change the rows this queryset matches
+        LearningPlan.objects.filter(pk__in=self.values('learning_plan_id')).update(
+            cards_version=F('cards_version') + 1
+        )
+        return super().update(**kwargs)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if objs:
+            LearningPlan.bump_cards_version(*{obj.learning_plan_id for obj in objs})
+        return objs
+
+
 class LearningPlanVocabulary(models.Model):
     """
     Junction table tracking per-user, per-plan vocabulary status.
@@ -96,6 +137,8 @@ class LearningPlanVocabulary(models.Model):
     last_reviewed_at = models.DateTimeField(null=True, blank=True)
     review_count = models.PositiveIntegerField(default=0)
 
+    objects = LearningPlanVocabularyQuerySet.as_manager()
+
     class Meta:
         db_table = 'learning_plan_vocabulary'
         unique_together = ['learning_plan', 'vocabulary']
@@ -184,6 +227,45 @@ class LearningSession(models.Model):
         return f"{self.session_type} - {self.user.username} - {self.learning_plan.name}"
 
 
+class PracticeAnswer(models.Model):
+    """
+    A single answer submitted during an active practice session.
+    Answers are stored here so each submission is a small upsert instead of
+    a rewrite of the session's JSON state. Answering a question again replaces
+    the row for its position.
+    """
+    session = models.ForeignKey(
+        LearningSession,
+        on_delete=models.CASCADE,
+        related_name='practice_answers'
+    )
+    position = models.PositiveIntegerField(help_text='Index of the question in the session')
+    vocabulary_id = models.BigIntegerField()
+    user_answer = models.TextField(blank=True, default='')
+    correct = models.BooleanField(default=False)
+    self_evaluation = models.CharField(max_length=20, blank=True, null=True)
+    time_spent = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'practice_answers'
+        ordering = ['position', 'id']
+        unique_together = ['session', 'position']
+
+    def __str__(self):
+        return f"Answer {self.position} - session {self.session_id}"
+
+    def to_state(self):
+        """Answer in the shape clients send back in practice results."""
+        return {
+            'vocabulary_id': self.vocabulary_id,
+            'user_answer': self.user_answer,
+            'correct': self.correct,
+            'self_evaluation': self.self_evaluation,
+            'time_spent': self.time_spent,
+        }
+
+
 class PracticeSession(models.Model):
     """
     Records completed practice sessions with results.
@@ -315,12 +397,108 @@ class LearningNotification(models.Model):
         blank=True
     )
 
+    # Per-row override; anything created before the user's read cursor is also read
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = 'notifications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='notifications_user_created'),
+        ]
 
     def __str__(self):
         return f"{self.notification_type} - {self.user.username} - {self.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # learning.signals compares against this to see is_read flip on save
+        instance._loaded_is_read = instance.__dict__.get('is_read')
+        return instance
+
+    def is_unread_for(self, last_read_at):
+        """Whether this notification is unread given the user's read cursor."""
+        if self.is_read:
+            return False
+        return last_read_at is None or self.created_at > last_read_at
+
+
+class NotificationReadState(models.Model):
+    """
+    Per-user read cursor for learning notifications.
+    Marking everything as read advances last_read_at instead of updating every row,
+    and unread_count is kept up to date by learning.signals so polling is a
+    single-row lookup.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='notification_read_state'
+    )
+    last_read_at = models.DateTimeField(null=True, blank=True)
+    unread_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'notification_read_states'
+
+    def __str__(self):
+        return f"Read state - {self.user.username}"
+
+    @classmethod
+    def for_user(cls, user):
+        """Get the read state, seeding the counter from existing rows on first use."""
+        state = cls.objects.filter(user=user).first()
+        if state is None:
+            state, _ = cls.objects.get_or_create(
+                user=user,
+                defaults={
+                    'unread_count': LearningNotification.objects.filter(
+                        user=user, is_read=False
+                    ).count()
+                }
+            )
+        return state
+
+    def unread_queryset(self):
+        """Notifications that are unread under this cursor."""
+        qs = LearningNotification.objects.filter(user_id=self.user_id, is_read=False)
+        if self.last_read_at:
+            qs = qs.filter(created_at__gt=self.last_read_at)
+        return qs
+
+    @classmethod
+    def adjust(cls, notification, delta):
+        """Add delta to the owner's counter if the notification is newer than their cursor."""
+        states = cls.objects.filter(
+            Q(last_read_at__isnull=True) | Q(last_read_at__lt=notification.created_at),
+            user_id=notification.user_id,
+        )
+        if delta < 0:
+            states = states.filter(unread_count__gt=0)
+        states.update(unread_count=F('unread_count') + delta)
+
+    @classmethod
+    def recount(cls, *user_ids):
+        """
+        Recompute unread_count from the rows and the cursor, for all users or
+        just user_ids. Bulk writers that skip signals (bulk_create,
+        queryset .update()) call this afterwards; it also repairs drift.
+        """
+        unread = LearningNotification.objects.filter(
+            user_id=OuterRef('user_id'), is_read=False,
+            created_at__gt=Coalesce(OuterRef('last_read_at'), Value(EPOCH)),
+        ).order_by().values('user_id').annotate(total=Count('*')).values('total')
+        states = cls.objects.filter(user_id__in=user_ids) if user_ids else cls.objects.all()
+        return states.update(unread_count=Coalesce(Subquery(unread, output_field=models.IntegerField()), Value(0)))
+
+    def advance(self, until):
+        """Move the cursor forward, marking everything up to `until` as read."""
+        NotificationReadState.objects.filter(pk=self.pk).update(
+            last_read_at=until,
+            unread_count=0
+        )
+        self.last_read_at = until
+        self.unread_count = 0
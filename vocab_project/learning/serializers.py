@@ -8,10 +8,11 @@ from .models import (
 from topics.serializers import TopicSerializer
 from topics.models import Topic
 from vocabulary.models import Vocabulary
-from vocabulary.serializers import VocabularyListSerializer
+from vocabulary.serializers import VOCABULARY_LIST_FIELDS, VocabularyListSerializer, datetime_representation
+from config.fieldsets import SparseFieldsMixin
 
 
-class LearningPlanVocabularySerializer(serializers.ModelSerializer):
+class LearningPlanVocabularySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for vocabulary items within a learning plan."""
     vocabulary = VocabularyListSerializer(read_only=True)
 
@@ -20,6 +21,14 @@ class LearningPlanVocabularySerializer(serializers.ModelSerializer):
         fields = ['id', 'vocabulary', 'status', 'user_note', 'last_reviewed_at', 'review_count']
 
 
+# Sparse fieldsets for the plan vocabulary action; the nested vocabulary is addressed as vocabulary.<field>
+PLAN_VOCABULARY_FIELDS = (
+    'id', *(f'vocabulary.{name}' for name in VOCABULARY_LIST_FIELDS),
+    'status', 'user_note', 'last_reviewed_at', 'review_count',
+)
+PLAN_VOCABULARY_SPARSE_FIELDS = tuple(name for name in PLAN_VOCABULARY_FIELDS if name != 'vocabulary.topics')
+
+
 class FlashcardSerializer(serializers.ModelSerializer):
     """Serializer for flashcard display with vocabulary details."""
     word = serializers.CharField(source='vocabulary.word', read_only=True)
@@ -40,6 +49,44 @@ class FlashcardSerializer(serializers.ModelSerializer):
         ]
 
 
+# Read-only fast path producing exactly FlashcardSerializer's output from
+# values_list() rows (see vocabulary.serializers.vocabulary_list_data).
+# Output field -> values_list() column.
+FLASHCARD_COLUMNS = {
+    'id': 'id',
+    'vocabulary_id': 'vocabulary_id',
+    'word': 'vocabulary__word',
+    'meaning': 'vocabulary__meaning',
+    'meaning_vi': 'vocabulary__meaning_vi',
+    'phonetics': 'vocabulary__phonetics',
+    'word_type': 'vocabulary__word_type',
+    'example_sentence': 'vocabulary__example_sentence',
+    'level': 'vocabulary__level',
+    'status': 'status',
+    'user_note': 'user_note',
+    'last_reviewed_at': 'last_reviewed_at',
+    'review_count': 'review_count',
+}
+FLASHCARD_FIELDS = tuple(FLASHCARD_COLUMNS)
+
+
+def flashcard_rows(queryset, fields=None):
+    """A LearningPlanVocabulary queryset reduced to tuples of the fields' columns."""
+    fields = FLASHCARD_FIELDS if fields is None else fields
+    return queryset.values_list(*(FLASHCARD_COLUMNS[name] for name in fields))
+
+
+def flashcard_data(rows, fields=None):
+    """FlashcardSerializer(many=True).data, narrowed to fields, for rows from flashcard_rows()."""
+    fields = FLASHCARD_FIELDS if fields is None else fields
+    data = [dict(zip(fields, row)) for row in rows]
+    if 'last_reviewed_at' in fields:
+        to_datetime = datetime_representation()
+        for item in data:
+            item['last_reviewed_at'] = to_datetime(item['last_reviewed_at'])
+    return data
+
+
 class LearningPlanListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for listing learning plans."""
     selected_topics = TopicSerializer(many=True, read_only=True)
@@ -56,10 +103,23 @@ class LearningPlanListSerializer(serializers.ModelSerializer):
             'progress_summary', 'total_days', 'words_per_session', 'created_at'
         ]
 
+    def _status_counts(self, obj):
+        # Views listing many plans pass pre-computed counts to avoid per-plan queries
+        status_counts = self.context.get('status_counts')
+        if status_counts is not None and obj.id in status_counts:
+            return status_counts[obj.id]
+        return None
+
     def get_vocabulary_count(self, obj):
+        counts = self._status_counts(obj)
+        if counts is not None:
+            return sum(counts.values())
         return obj.vocabulary_snapshot.count()
 
     def get_progress_summary(self, obj):
+        counts = self._status_counts(obj)
+        if counts is not None:
+            return counts
         stats = LearningPlanVocabulary.objects.filter(
             learning_plan=obj
         ).values('status').annotate(count=Count('id'))
@@ -136,12 +196,11 @@ class LearningPlanCreateSerializer(serializers.ModelSerializer):
             level__in=validated_data['selected_levels']
         ).distinct()
 
-        for vocab in vocabulary:
-            LearningPlanVocabulary.objects.create(
-                learning_plan=plan,
-                vocabulary=vocab,
-                status='new'
-            )
+        # One insert for the whole snapshot (the queryset bumps the plan's cards_version)
+        LearningPlanVocabulary.objects.bulk_create([
+            LearningPlanVocabulary(learning_plan=plan, vocabulary=vocab, status='new')
+            for vocab in vocabulary
+        ])
 
         # Pre-create daily tracking schedule
         self._create_daily_schedule(plan)
@@ -238,14 +297,34 @@ class PracticeQuestionSerializer(serializers.Serializer):
 
 class PracticeAnswerSerializer(serializers.Serializer):
     """Serializer for submitting practice answers."""
+    position = serializers.IntegerField(min_value=0)
     vocabulary_id = serializers.IntegerField()
-    user_answer = serializers.CharField()
+    user_answer = serializers.CharField(allow_blank=True, default='')
+    correct = serializers.BooleanField(default=False)
+    self_evaluation = serializers.ChoiceField(
+        choices=['new', 'learned', 'mastered', 'review_required'],
+        required=False, allow_null=True
+    )
+    time_spent = serializers.FloatField(required=False, allow_null=True)
+
+    def validate(self, data):
+        # context['vocabulary_ids'] holds the vocabulary id of each question, by position
+        vocabulary_ids = self.context['vocabulary_ids']
+        if data['position'] >= len(vocabulary_ids):
+            raise serializers.ValidationError({
+                "position": "Position is outside the session's questions."
+            })
+        if data['vocabulary_id'] != vocabulary_ids[data['position']]:
+            raise serializers.ValidationError({
+                "vocabulary_id": "Vocabulary does not match the question at this position."
+            })
+        return data
 
 
 class PracticeSessionCompleteSerializer(serializers.Serializer):
     """Serializer for completing a practice session with self-evaluation."""
     results = serializers.ListField(
-        child=serializers.DictField()
+        child=serializers.DictField(), required=False, default=list
     )
     duration_seconds = serializers.IntegerField(min_value=0)
 
@@ -331,3 +410,11 @@ class NotificationSerializer(serializers.ModelSerializer):
             'learning_plan', 'learning_plan_name', 'is_read', 'created_at'
         ]
         read_only_fields = ['id', 'notification_type', 'title', 'message', 'learning_plan', 'created_at']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Notifications older than the user's read cursor count as read
+        last_read_at = self.context.get('last_read_at')
+        if last_read_at and instance.created_at <= last_read_at:
+            data['is_read'] = True
+        return data
@@ -1,6 +1,8 @@
 from datetime import timedelta
 from django.utils import timezone
-from django.db.models import Count
+from django.db.models import Count, Q
+
+from ops.metrics import timed
 
 from .models import (
     LearningPlan, LearningPlanVocabulary, LearningProgress,
@@ -12,6 +14,7 @@ class AnalyticsService:
     """Service for calculating and managing learner analytics."""
 
     @staticmethod
+    @timed('get_or_create_analytics')
     def get_or_create_analytics(user, learning_plan=None):
         """Get or create analytics for a user, optionally for a specific plan."""
         analytics, created = LearnerAnalytics.objects.get_or_create(
@@ -26,6 +29,50 @@ class AnalyticsService:
         return analytics
 
     @staticmethod
+    @timed('get_summary')
+    def get_summary(user):
+        """Summary counts shown next to the overall analytics card."""
+        word_stats = LearningPlanVocabulary.objects.filter(
+            learning_plan__user=user
+        ).aggregate(
+            total_words=Count('id'),
+            mastered_words=Count('id', filter=Q(status='mastered'))
+        )
+        return {
+            'active_plans': LearningPlan.objects.filter(user=user, status='active').count(),
+            'total_words': word_stats['total_words'],
+            'mastered_words': word_stats['mastered_words'],
+        }
+
+    @staticmethod
+    async def aget_summary(user):
+        """Async variant of get_summary for the ASGI read endpoints."""
+        word_stats = await LearningPlanVocabulary.objects.filter(
+            learning_plan__user=user
+        ).aaggregate(
+            total_words=Count('id'),
+            mastered_words=Count('id', filter=Q(status='mastered'))
+        )
+        return {
+            'active_plans': await LearningPlan.objects.filter(user=user, status='active').acount(),
+            'total_words': word_stats['total_words'],
+            'mastered_words': word_stats['mastered_words'],
+        }
+
+    @staticmethod
+    @timed('get_plan_status_counts')
+    def get_plan_status_counts(plan_ids):
+        """Vocabulary counts by status for several plans in one grouped query."""
+        counts = {plan_id: {} for plan_id in plan_ids}
+        stats = LearningPlanVocabulary.objects.filter(
+            learning_plan_id__in=plan_ids
+        ).values('learning_plan_id', 'status').annotate(count=Count('id'))
+        for item in stats:
+            counts[item['learning_plan_id']][item['status']] = item['count']
+        return counts
+
+    @staticmethod
+    @timed('calculate_analytics')
     def calculate_analytics(analytics):
         """Calculate all analytics metrics for a user/plan."""
         user = analytics.user
@@ -264,6 +311,7 @@ class AnalyticsService:
         )
 
     @staticmethod
+    @timed('get_recommendations')
     def get_recommendations(analytics):
         """Generate recommendations based on analytics."""
         recommendations = []
@@ -0,0 +1,81 @@
+from django.db.models import Model, QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from vocabulary.bulk import pre_bulk_update
+from vocabulary.models import Vocabulary
+from .decks import DECK_VOCABULARY_FIELDS
+from .models import LearningNotification, LearningPlan, LearningPlanVocabulary, NotificationReadState
+
+
+def _origin_model(origin):
+    """The model whose delete() (on an instance or a queryset) started a cascade."""
+    return type(origin) if isinstance(origin, Model) else getattr(origin, 'model', None)
+
+
+@receiver(post_save, sender=LearningNotification)
+def count_saved_notification(sender, instance, created, **kwargs):
+    """Inserts and is_read flips move the owner's unread counter, whichever code path saved."""
+    if created:
+        if not instance.is_read:
+            NotificationReadState.adjust(instance, +1)
+        return
+    was_read = getattr(instance, '_loaded_is_read', instance.is_read)
+    if was_read != instance.is_read:
+        NotificationReadState.adjust(instance, -1 if instance.is_read else +1)
+    instance._loaded_is_read = instance.is_read
+
+
+@receiver(post_delete, sender=LearningNotification)
+def count_deleted_notification(sender, instance, **kwargs):
+    """Deletes, including plan and admin cascades, take unread rows out of the counter."""
+    if not instance.is_read:
+        NotificationReadState.adjust(instance, -1)
+
+
+@receiver(post_save, sender=LearningPlanVocabulary)
+def bump_saved_card(sender, instance, **kwargs):
+    """A saved card moves its plan's offline deck (learning.decks) to a new version."""
+    LearningPlan.bump_cards_version(instance.learning_plan_id)
+
+
+@receiver(post_delete, sender=LearningPlanVocabulary)
+def bump_deleted_card(sender, instance, origin=None, **kwargs):
+    """
+    So does a deleted card. Cascades from deleting its plan, vocabulary or user
+    skip the UPDATE per card: the plan's deck goes too, or
+    bump_deleted_vocabulary has already moved every plan holding the word.
+    """
+    if _origin_model(origin) in (None, LearningPlanVocabulary):
+        LearningPlan.bump_cards_version(instance.learning_plan_id)
+
+
+@receiver(post_save, sender=Vocabulary)
+def bump_saved_vocabulary(sender, instance, created, update_fields=None, **kwargs):
+    """An edited word moves the decks of the plans that hold it; a new word is in none yet."""
+    if created or (update_fields is not None and not DECK_VOCABULARY_FIELDS.intersection(update_fields)):
+        return
+    LearningPlan.bump_cards_version_for_words([instance.pk])
+
+
+@receiver(pre_delete, sender=Vocabulary)
+def bump_deleted_vocabulary(sender, instance, origin=None, **kwargs):
+    """
+    A deleted word leaves the decks of the plans that hold it, before the
+    cascade removes their cards. A queryset delete (vocabulary.bulk) reports
+    every row with the same origin, so its plans are moved once. Cascades from
+    deleting the owner skip it: only the owner's plans hold personal words.
+    """
+    if isinstance(origin, QuerySet) and origin.model is Vocabulary:
+        if not getattr(origin, '_cards_version_bumped', False):
+            origin._cards_version_bumped = True
+            LearningPlan.bump_cards_version_for_words(origin)
+    elif _origin_model(origin) in (None, Vocabulary):
+        LearningPlan.bump_cards_version_for_words([instance.pk])
+
+
+@receiver(pre_bulk_update, sender=Vocabulary)
+def bump_bulk_updated_vocabulary(sender, queryset, fields, **kwargs):
+    """Set-based word edits skip post_save, so vocabulary.bulk reports them here."""
+    if DECK_VOCABULARY_FIELDS.intersection(fields):
+        LearningPlan.bump_cards_version_for_words(queryset)
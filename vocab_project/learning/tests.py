@@ -1,3 +1,730 @@
-from django.test import TestCase
+import gzip
+import importlib
+import json
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, resolve
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from rest_framework import status
+
+from .models import (
+    LearningPlan, LearningPlanVocabulary, LearningNotification, NotificationReadState,
+    LearningSession, PracticeAnswer
+)
+from .serializers import FlashcardSerializer, flashcard_data, flashcard_rows
+from topics.models import Topic
+from vocabulary.bulk import run_bulk_operation
+from vocabulary.models import Vocabulary, VocabularyTopic
+
+User = get_user_model()
+
+
+class DashboardTests(APITestCase):
+    """Test suite for the composite learner dashboard endpoint"""
+
+    def setUp(self):
+        self.learner = User.objects.create_user(
+            username='learner',
+            email='learner@test.com',
+            password='learner123',
+            role='learner'
+        )
+        self.token = Token.objects.create(user=self.learner)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.topic = Topic.objects.create(name='Food')
+        self.dashboard_url = '/api/learning/dashboard/'
+
+    def _create_plan(self, name, words=3):
+        plan = LearningPlan.objects.create(
+            user=self.learner,
+            name=name,
+            start_date=date.today() - timedelta(days=3),
+            end_date=date.today() + timedelta(days=3),
+            daily_study_time=15,
+            selected_levels=['A1']
+        )
+        plan.selected_topics.add(self.topic)
+        for i in range(words):
+            vocab = Vocabulary.objects.create(word=f'{name}-{i}', meaning='m', level='A1', is_system=True)
+            VocabularyTopic.objects.create(vocabulary=vocab, topic=self.topic)
+            LearningPlanVocabulary.objects.create(
+                learning_plan=plan,
+                vocabulary=vocab,
+                status='mastered' if i == 0 else 'new'
+            )
+        return plan
+
+    def _dashboard_query_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.dashboard_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response.json()
+
+    def test_dashboard_returns_all_sections(self):
+        """Test that dashboard combines analytics, notifications, plans and progress"""
+        plan = self._create_plan('Plan A')
+        LearningNotification.objects.create(
+            user=self.learner, notification_type='encouragement', title='Hi', message='Hello'
+        )
+        LearningNotification.objects.create(
+            user=self.learner, notification_type='encouragement', title='Old', message='Read', is_read=True
+        )
+
+        response = self.client.get(self.dashboard_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['summary']['active_plans'], 1)
+        self.assertEqual(data['summary']['total_words'], 3)
+        self.assertEqual(data['summary']['mastered_words'], 1)
+        # Analytics calculation may add a risk alert alongside the seeded notification
+        unread = LearningNotification.objects.filter(user=self.learner, is_read=False).count()
+        self.assertEqual(data['notifications']['unread_count'], unread)
+        self.assertEqual(len(data['notifications']['results']), unread)
+        self.assertTrue(all(not n['is_read'] for n in data['notifications']['results']))
+        self.assertEqual(data['plans'][0]['vocabulary_count'], 3)
+        self.assertEqual(data['plans'][0]['progress_summary'], {'mastered': 1, 'new': 2})
+        self.assertEqual(data['plans'][0]['selected_topics'][0]['vocabulary_count'], 3)
+        self.assertEqual(data['weekly_progress']['plan_id'], plan.id)
+
+    def test_dashboard_query_count_is_constant(self):
+        """Test that the number of queries does not grow with the number of plans"""
+        self._create_plan('Plan A')
+        self.client.get(self.dashboard_url)  # warm up analytics row
+        baseline, _ = self._dashboard_query_count()
+
+        for i in range(5):
+            self._create_plan(f'Plan {i}')
+        self.client.get(self.dashboard_url)  # first schedule sync of the newest plan
+        queries, data = self._dashboard_query_count()
+
+        self.assertEqual(len(data['plans']), 6)
+        self.assertEqual(queries, baseline)
+
+    def test_dashboard_lists_plans_of_every_status(self):
+        """Test that paused and completed plans are listed and chart the most recent one"""
+        completed = self._create_plan('Plan A')
+        completed.status = 'completed'
+        completed.save()
+        paused = self._create_plan('Plan B')
+        paused.status = 'paused'
+        paused.save()
+
+        data = self.client.get(self.dashboard_url).json()
+
+        self.assertEqual([plan['name'] for plan in data['plans']], ['Plan B', 'Plan A'])
+        self.assertEqual(data['weekly_progress']['plan_id'], paused.id)
+
+        active = self._create_plan('Plan C')
+        LearningPlan.objects.filter(id=active.id).update(created_at=timezone.now() - timedelta(days=1))
+        data = self.client.get(self.dashboard_url).json()
+        self.assertEqual(data['weekly_progress']['plan_id'], active.id)
+
+    def test_dashboard_syncs_daily_schedule(self):
+        """Test that the weekly chart includes days the plan has not been opened on"""
+        self._create_plan('Plan A')
+
+        days = self.client.get(self.dashboard_url).json()['weekly_progress']['days']
+
+        self.assertEqual(len(days), 4)
+        self.assertEqual([day['status'] for day in days], ['missed', 'missed', 'missed', 'upcoming'])
+
+    def test_dashboard_requires_authentication(self):
+        """Test that anonymous users cannot access the dashboard"""
+        self.client.credentials()
+        response = self.client.get(self.dashboard_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class NotificationReadCursorTests(APITestCase):
+    """Test suite for cursor-based notification read tracking"""
+
+    def setUp(self):
+        self.learner = User.objects.create_user(
+            username='learner',
+            email='learner@test.com',
+            password='learner123',
+            role='learner'
+        )
+        self.token = Token.objects.create(user=self.learner)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.notifications_url = '/api/learning/notifications/'
+
+    def _notify(self, title='Reminder'):
+        return LearningNotification.objects.create(
+            user=self.learner, notification_type='study_reminder', title=title, message='Study'
+        )
+
+    def _unread_count(self):
+        return self.client.get(f'{self.notifications_url}unread_count/').json()['count']
+
+    def test_counter_seeded_from_existing_rows(self):
+        """Test that the first lookup counts notifications created before the state existed"""
+        self._notify()
+        self._notify()
+        self.assertEqual(self._unread_count(), 2)
+
+    def test_counter_maintained_on_insert_and_read(self):
+        """Test that inserts and individual reads keep the counter in sync"""
+        first = self._notify()
+        self.assertEqual(self._unread_count(), 1)
+
+        self._notify()
+        self.assertEqual(self._unread_count(), 2)
+
+        self.client.patch(f'{self.notifications_url}{first.id}/read/')
+        self.client.patch(f'{self.notifications_url}{first.id}/read/')
+        self.assertEqual(self._unread_count(), 1)
+
+    def test_mark_all_read_advances_cursor(self):
+        """Test that mark-all-read updates only the cursor row"""
+        notifications = [self._notify(f'N{i}') for i in range(5)]
+        NotificationReadState.for_user(self.learner)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(f'{self.notifications_url}mark_all_read/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('notification_read_states', updates[0])
+
+        self.assertEqual(self._unread_count(), 0)
+        data = self.client.get(self.notifications_url).json()
+        results = data['results'] if 'results' in data else data
+        self.assertEqual(len(results), len(notifications))
+        self.assertTrue(all(n['is_read'] for n in results))
+
+        self._notify('After')
+        self.assertEqual(self._unread_count(), 1)
+
+    def test_counter_follows_cascades_and_queryset_deletes(self):
+        """Test that plan cascades and queryset deletes take unread rows out of the counter"""
+        plan = LearningPlan.objects.create(
+            user=self.learner, name='Plan', start_date=date.today(), end_date=date.today() + timedelta(days=7),
+            daily_study_time=15, selected_levels=['A1']
+        )
+        NotificationReadState.for_user(self.learner)
+        for i in range(3):
+            LearningNotification.objects.create(
+                user=self.learner, notification_type='risk_alert', title=f'P{i}', message='m', learning_plan=plan
+            )
+        kept = self._notify('Kept')
+        self._notify('Other')
+        self.assertEqual(self._unread_count(), 5)
+
+        plan.delete()
+        self.assertEqual(self._unread_count(), 2)
+        LearningNotification.objects.exclude(pk=kept.pk).delete()
+        self.assertEqual(self._unread_count(), 1)
+
+        # Reading after mark-all-read must not count the row twice
+        self.client.post(f'{self.notifications_url}mark_all_read/')
+        kept.delete()
+        self.assertEqual(self._unread_count(), 0)
+
+    def test_recount_repairs_bulk_writes(self):
+        """Test that recount() restores the counter after writes that skip signals"""
+        NotificationReadState.for_user(self.learner)
+        self._notify('Old')
+        self.client.post(f'{self.notifications_url}mark_all_read/')
+        LearningNotification.objects.bulk_create([
+            LearningNotification(user=self.learner, notification_type='encouragement', title=f'B{i}', message='m')
+            for i in range(3)
+        ])
+        LearningNotification.objects.filter(title='B0').update(is_read=True)
+        self.assertEqual(self._unread_count(), 0)
+
+        NotificationReadState.recount(self.learner.pk)
+        self.assertEqual(self._unread_count(), 2)
+
+
+class PracticeStateTests(APITestCase):
+    """Test suite for compact practice session state"""
+
+    def setUp(self):
+        self.learner = User.objects.create_user(
+            username='learner',
+            email='learner@test.com',
+            password='learner123',
+            role='learner'
+        )
+        self.token = Token.objects.create(user=self.learner)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.plan = LearningPlan.objects.create(
+            user=self.learner,
+            name='Plan',
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+            daily_study_time=15,
+            selected_levels=['A1']
+        )
+        for i in range(5):
+            vocab = Vocabulary.objects.create(
+                word=f'word{i}', meaning=f'meaning{i}', example_sentence='A long example sentence.'
+            )
+            LearningPlanVocabulary.objects.create(learning_plan=self.plan, vocabulary=vocab)
+        self.state_url = '/api/learning/practice/state/'
+
+    def _start(self):
+        response = self.client.post('/api/learning/practice/start/', {
+            'learning_plan_id': self.plan.id,
+            'practice_type': 'flashcard',
+            'word_count': 5
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.json()
+
+    def test_start_stores_only_question_ids(self):
+        """Test that session state keeps ids and the state endpoint hydrates them"""
+        started = self._start()
+
+        session = LearningSession.objects.get(id=started['learning_session_id'])
+        self.assertNotIn('questions', session.state)
+        self.assertEqual(session.state['question_ids'], [q['id'] for q in started['questions']])
+
+        state = self.client.get(self.state_url).json()
+        self.assertEqual(state['questions'], started['questions'])
+        self.assertEqual(state['total_questions'], 5)
+
+    def test_answer_is_appended_without_rewriting_state(self):
+        """Test that submitting an answer inserts a row instead of updating the JSON state"""
+        started = self._start()
+        question = started['questions'][0]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(self.state_url, {
+                'answer': {
+                    'position': 0,
+                    'vocabulary_id': question['vocabulary_id'],
+                    'user_answer': 'word0',
+                    'correct': True
+                }
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(PracticeAnswer.objects.count(), 1)
+        writes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "learning_sessions"')]
+        self.assertTrue(all('"state"' not in sql for sql in writes))
+
+        state = self.client.get(self.state_url).json()
+        self.assertEqual(state['current_index'], 1)
+        self.assertEqual(state['answers'][0]['user_answer'], 'word0')
+
+    def _answer(self, position, vocabulary_id, user_answer='', **extra):
+        return self.client.patch(self.state_url, {
+            'answer': {'position': position, 'vocabulary_id': vocabulary_id, 'user_answer': user_answer, **extra}
+        }, format='json')
+
+    def test_answering_again_replaces_the_answer(self):
+        """Test that a second answer for a position replaces the first and the index stays in range"""
+        questions = self._start()['questions']
+        self._answer(0, questions[0]['vocabulary_id'], 'first')
+        self._answer(0, questions[0]['vocabulary_id'], 'second', correct=True)
+        for position, question in enumerate(questions):
+            self._answer(position, question['vocabulary_id'], 'again')
+
+        self.assertEqual(PracticeAnswer.objects.count(), 5)
+        state = self.client.get(self.state_url).json()
+        self.assertEqual(len(state['answers']), 5)
+        self.assertEqual(state['current_index'], 5)
+
+    def test_answer_must_match_a_question(self):
+        """Test that an answer outside the question list or for another word is rejected"""
+        questions = self._start()['questions']
+
+        response = self._answer(5, questions[0]['vocabulary_id'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('position', response.json())
+
+        response = self._answer(0, questions[1]['vocabulary_id'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('vocabulary_id', response.json())
+        self.assertFalse(PracticeAnswer.objects.exists())
+
+    def test_rows_are_merged_over_json_answers(self):
+        """Test that answer rows replace JSON state answers at the same position"""
+        started = self._start()
+        questions = started['questions']
+        session = LearningSession.objects.get(id=started['learning_session_id'])
+        session.state['answers'] = [
+            {'vocabulary_id': question['vocabulary_id'], 'user_answer': 'old', 'correct': False}
+            for question in questions[:2]
+        ]
+        session.save()
+        self._answer(1, questions[1]['vocabulary_id'], 'new', correct=True)
+
+        state = self.client.get(self.state_url).json()
+        self.assertEqual([answer['user_answer'] for answer in state['answers']], ['old', 'new'])
+        self.assertEqual(state['current_index'], 2)
+
+    def test_complete_uses_recorded_answers(self):
+        """Test that completing a session counts the answers recorded through the state endpoint"""
+        started = self._start()
+        questions = started['questions']
+        self._answer(0, questions[0]['vocabulary_id'], 'word', correct=True, self_evaluation='mastered')
+        self._answer(1, questions[1]['vocabulary_id'], 'word', correct=True)
+
+        response = self.client.post(
+            f"/api/learning/practice/{started['session_id']}/complete/",
+            {'duration_seconds': 60}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['correct_answers'], 2)
+        self.assertEqual(len(response.json()['results']), 2)
+        self.assertEqual(
+            LearningPlanVocabulary.objects.get(id=questions[0]['id']).status, 'mastered'
+        )
+
+    def test_complete_counts_each_review(self):
+        """Test that a word answered twice gets two reviews and its last self-evaluation"""
+        started = self._start()
+        first, second = started['questions'][:2]
+        results = [
+            {'vocabulary_id': first['vocabulary_id'], 'correct': False, 'self_evaluation': 'review_required'},
+            {'vocabulary_id': second['vocabulary_id'], 'correct': True, 'self_evaluation': 'learned'},
+            {'vocabulary_id': first['vocabulary_id'], 'correct': True, 'self_evaluation': 'learned'},
+            {'vocabulary_id': second['vocabulary_id'], 'correct': True},
+        ]
+
+        response = self.client.post(
+            f"/api/learning/practice/{started['session_id']}/complete/",
+            {'results': results, 'duration_seconds': 60}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_vocab = LearningPlanVocabulary.objects.get(id=first['id'])
+        self.assertEqual((first_vocab.status, first_vocab.review_count), ('learned', 2))
+        second_vocab = LearningPlanVocabulary.objects.get(id=second['id'])
+        self.assertEqual((second_vocab.status, second_vocab.review_count), ('learned', 1))
+
+
+class AsyncReadPathTests(APITestCase):
+    """Test suite for the async read endpoints"""
+
+    def setUp(self):
+        self.learner = User.objects.create_user(
+            username='learner',
+            email='learner@test.com',
+            password='learner123',
+            role='learner'
+        )
+        self.token = Token.objects.create(user=self.learner)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.plan = LearningPlan.objects.create(
+            user=self.learner,
+            name='Plan',
+            start_date=date.today() - timedelta(days=10),
+            end_date=date.today() + timedelta(days=10),
+            daily_study_time=15,
+            selected_levels=['A1']
+        )
+        for i in range(4):
+            vocab = Vocabulary.objects.create(word=f'word{i}', meaning=f'meaning{i}', level='A1')
+            LearningPlanVocabulary.objects.create(
+                learning_plan=self.plan, vocabulary=vocab, status='review_required' if i else 'new'
+            )
+
+    def test_async_flashcards_match_sync(self):
+        """Test that async flashcards return the same payload as the DRF action"""
+        sync = self.client.get(f'/api/learning/plans/{self.plan.id}/flashcards/?limit=3').json()
+        async_ = self.client.get(f'/api/learning/async/plans/{self.plan.id}/flashcards/?limit=3').json()
+        self.assertEqual(async_, sync)
+        self.assertEqual(len(async_), 3)
+
+    def test_flashcard_fast_path_matches_serializer(self):
+        """Test that flashcards built from values_list() rows render byte-identically to FlashcardSerializer"""
+        progress = LearningPlanVocabulary.objects.get(vocabulary__word='word1')
+        progress.last_reviewed_at = timezone.now()
+        progress.vocabulary.phonetics = '/w\u025c\u02d0d/'
+        progress.vocabulary.save()
+        progress.save()
+        queryset = LearningPlanVocabulary.objects.filter(learning_plan=self.plan).select_related('vocabulary')
+        self.assertEqual(JSONRenderer().render(flashcard_data(flashcard_rows(queryset))),
+                         JSONRenderer().render(FlashcardSerializer(queryset, many=True).data))
+
+    def test_flashcard_sparse_fields(self):
+        """Test that ?fields= narrows sync and async flashcards alike and rejects unknown names"""
+        url = f'/plans/{self.plan.id}/flashcards/?fields=status,word'
+        sync = self.client.get(f'/api/learning{url}').json()
+        async_ = self.client.get(f'/api/learning/async{url}').json()
+        self.assertEqual(sync[0], {'word': 'word0', 'status': 'new'})
+        self.assertEqual(async_, sync)
+        for prefix in ('/api/learning', '/api/learning/async'):
+            response = self.client.get(f'{prefix}/plans/{self.plan.id}/flashcards/?fields=word,secret')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_plan_vocabulary_sparse_fields(self):
+        """Test that plan vocabulary narrows nested fields and loads only their columns"""
+        url = f'/api/learning/plans/{self.plan.id}/vocabulary/'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'{url}?fields=status,vocabulary.word')
+        self.assertEqual(response.json()['results'][0], {'vocabulary': {'word': 'word0'}, 'status': 'new'})
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('"meaning"', sql)
+        self.assertNotIn('"vocabulary_topics"."vocabulary_id"', sql)
+
+        full = self.client.get(url).json()['results']
+        excluded = self.client.get(f'{url}?exclude=vocabulary.note,user_note').json()['results']
+        for item in full:
+            del item['vocabulary']['note'], item['user_note']
+        self.assertEqual(excluded, full)
+        response = self.client.get(f'{url}?fields=vocabulary.topics')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_async_progress_matches_sync(self):
+        """Test that async progress returns the same last N days as the DRF action"""
+        sync = self.client.get(f'/api/learning/plans/{self.plan.id}/progress/?days=7').json()
+        async_ = self.client.get(f'/api/learning/async/plans/{self.plan.id}/progress/?days=7').json()
+        self.assertEqual(len(sync), 7)
+        self.assertEqual(async_, sync)
+
+    def test_async_progress_syncs_schedule(self):
+        """Test that async progress fills in the daily schedule first, as the DRF action does"""
+        async_ = self.client.get(f'/api/learning/async/plans/{self.plan.id}/progress/?days=7').json()
+        self.assertEqual(len(async_), 7)
+        self.assertEqual(async_, self.client.get(f'/api/learning/plans/{self.plan.id}/progress/?days=7').json())
+
+    def test_async_unread_count(self):
+        """Test the async unread count"""
+        LearningNotification.objects.create(
+            user=self.learner, notification_type='encouragement', title='Hi', message='Hello'
+        )
+        count = self.client.get('/api/learning/async/notifications/unread_count/').json()
+        self.assertEqual(count, {'count': 1})
+
+    def test_async_summary_matches_analytics(self):
+        """Test that the async summary equals the summary in the analytics list"""
+        LearningPlanVocabulary.objects.filter(vocabulary__word='word2').update(status='mastered')
+        LearningPlan.objects.create(
+            user=self.learner, name='Done', start_date=date.today() - timedelta(days=30),
+            end_date=date.today() - timedelta(days=1), daily_study_time=15, selected_levels=['A1'],
+            status='completed'
+        )
+        sync = self.client.get('/api/learning/analytics/').json()['summary']
+        async_ = self.client.get('/api/learning/async/analytics/summary/').json()
+        self.assertEqual(async_, sync)
+        self.assertEqual(async_, {'active_plans': 1, 'total_words': 4, 'mastered_words': 1})
+
+        self.client.credentials()
+        response = self.client.get('/api/learning/async/analytics/summary/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_async_requires_authentication(self):
+        """Test that async endpoints reject anonymous requests and other users' plans"""
+        other = User.objects.create_user(username='other', password='other123')
+        other_token = Token.objects.create(user=other)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {other_token.key}')
+        response = self.client.get(f'/api/learning/async/plans/{self.plan.id}/flashcards/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.credentials()
+        response = self.client.get('/api/learning/async/notifications/unread_count/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_async_auth_errors_match_drf(self):
+        """Test that bad credentials get the same 401 body and header as the DRF views"""
+        other = User.objects.create_user(username='other', password='other123', is_active=False)
+        inactive = Token.objects.create(user=other)
+        for header in (None, 'Token nope', 'Token', 'Token a b', f'Token {inactive.key}'):
+            credentials = {'HTTP_AUTHORIZATION': header} if header else {}
+            self.client.credentials(**credentials)
+            sync = self.client.get('/api/learning/notifications/unread_count/')
+            async_ = self.client.get('/api/learning/async/notifications/unread_count/')
+            self.assertEqual(async_.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(async_.json(), sync.json())
+            self.assertEqual(async_['WWW-Authenticate'], sync['WWW-Authenticate'])
+
+    def test_async_views_reject_writes(self):
+        """Test that async views answer other methods with DRF's 405"""
+        url = 'notifications/unread_count/'
+        sync = self.client.post(f'/api/learning/{url}')
+        async_ = self.client.post(f'/api/learning/async/{url}')
+        self.assertEqual(async_.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertEqual(async_.json(), sync.json())
+
+    def test_enabled_async_views_take_over_read_paths(self):
+        """Test that ASYNC_VIEWS serves the DRF read paths with the async views"""
+        from . import async_views, urls
+
+        def reload_urls():
+            importlib.reload(urls)
+            clear_url_caches()
+
+        self.addCleanup(reload_urls)
+        with self.settings(ASYNC_VIEWS={'ENABLED': True}):
+            reload_urls()
+        match = resolve(f'/plans/{self.plan.id}/progress/', urlconf=urls)
+        self.assertIs(match.func, async_views.plan_progress)
+        self.assertEqual(resolve('/notifications/unread_count/', urlconf=urls).func, async_views.unread_count)
+        # Writes on the same prefix still reach the router
+        self.assertEqual(resolve(f'/plans/{self.plan.id}/start_session/', urlconf=urls).url_name,
+                         'learning-plan-start-session')
+
+        reload_urls()
+        self.assertEqual(resolve(f'/plans/{self.plan.id}/progress/', urlconf=urls).url_name,
+                         'learning-plan-progress')
+
+
+class OfflineDeckTests(APITestCase):
+    """Test suite for the gzip-compressed, content-hashed offline deck"""
+
+    def setUp(self):
+        cache.clear()
+        self.learner = User.objects.create_user(
+            username='learner',
+            email='learner@test.com',
+            password='learner123',
+            role='learner'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.learner).key}')
+        self.plan = LearningPlan.objects.create(
+            user=self.learner,
+            name='Plan',
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=10),
+            daily_study_time=15,
+            selected_levels=['A1']
+        )
+        for i, card_status in enumerate(['new', 'mastered', 'review_required']):
+            vocab = Vocabulary.objects.create(word=f'word{i}', meaning=f'meaning{i}', level='A1')
+            LearningPlanVocabulary.objects.create(learning_plan=self.plan, vocabulary=vocab, status=card_status)
+        self.url = f'/api/learning/plans/{self.plan.id}/deck/'
+
+    def _get(self, **headers):
+        return self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br', **headers)
+
+    def test_deck_is_columnar_gzip_of_every_card(self):
+        """Test that the deck holds every card, column by column, gzip-compressed"""
+        response = self._get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        deck = json.loads(gzip.decompress(response.content))
+        self.assertEqual(deck['count'], 3)
+        self.assertEqual(deck['cards']['status'], ['new', 'mastered', 'review_required'])
+
+        cards = FlashcardSerializer(
+            LearningPlanVocabulary.objects.filter(learning_plan=self.plan).order_by('vocabulary__word'), many=True
+        ).data
+        self.assertEqual([dict(zip(deck['cards'], values)) for values in zip(*deck['cards'].values())],
+                         json.loads(JSONRenderer().render(cards)))
+
+        plain = self.client.get(self.url)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(json.loads(plain.content), deck)
+
+    def test_unchanged_deck_is_not_modified(self):
+        """Test that If-None-Match returns 304 from the cache without reading the cards"""
+        etag = self._get()['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertFalse(any('learning_plan_vocabulary' in q['sql'] for q in queries.captured_queries))
+
+    def test_card_and_vocabulary_changes_produce_new_deck(self):
+        """Test that a status update, a practice write or a vocabulary edit changes the ETag"""
+        etags = [self._get()['ETag']]
+        self.client.patch(
+            f'/api/learning/plans/{self.plan.id}/vocabulary/{Vocabulary.objects.get(word="word0").id}/status/',
+            {'status': 'learned'}, format='json'
+        )
+        etags.append(self._get()['ETag'])
+        LearningPlanVocabulary.objects.filter(learning_plan=self.plan).update(user_note='bulk')
+        etags.append(self._get()['ETag'])
+        Vocabulary.objects.filter(word='word1').first().save()
+        self.assertEqual(self._get()['ETag'], etags[-1])  # same content, same hash
+        vocab = Vocabulary.objects.get(word='word2')
+        vocab.meaning = 'changed'
+        vocab.save()
+        response = self._get(HTTP_IF_NONE_MATCH=etags[-1])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etags.append(response['ETag'])
+        self.assertEqual(len(set(etags)), 4)
+        self.assertIn('changed', json.loads(gzip.decompress(response.content))['cards']['meaning'])
+
+    def test_queryset_card_writes_produce_new_deck(self):
+        """Test that queryset updates, bulk writes and card deletes change the ETag"""
+        etags = [self._get()['ETag']]
+        LearningPlanVocabulary.objects.filter(learning_plan=self.plan, status='new').update(status='learned')
+        etags.append(self._get()['ETag'])
+        cards = list(LearningPlanVocabulary.objects.filter(learning_plan=self.plan))
+        for card in cards:
+            card.status = 'mastered'
+        LearningPlanVocabulary.objects.bulk_update(cards, ['status'])
+        etags.append(self._get()['ETag'])
+        vocab = Vocabulary.objects.create(word='word3', meaning='meaning3', level='A1')
+        LearningPlanVocabulary.objects.bulk_create([LearningPlanVocabulary(learning_plan=self.plan, vocabulary=vocab)])
+        etags.append(self._get()['ETag'])
+        LearningPlanVocabulary.objects.get(vocabulary=vocab).delete()
+        etags.append(self._get()['ETag'])
+        LearningPlanVocabulary.objects.filter(learning_plan=self.plan, vocabulary__word='word0').delete()
+        etags.append(self._get()['ETag'])
+        # Content-hashed: deleting word3 again restores an earlier deck, so compare neighbours
+        for before, after in zip(etags, etags[1:]):
+            self.assertNotEqual(before, after)
+
+    def test_word_edits_move_only_plans_holding_them(self):
+        """Test that editing a word bumps the plans that hold it and leaves other decks cached"""
+        other_plan = LearningPlan.objects.create(
+            user=self.learner, name='Other', start_date=date.today(), end_date=date.today() + timedelta(days=10),
+            daily_study_time=15, selected_levels=['A1']
+        )
+        spare = Vocabulary.objects.create(word='spare', meaning='spare', level='A1')
+        LearningPlanVocabulary.objects.create(learning_plan=other_plan, vocabulary=spare)
+
+        def versions():
+            return dict(LearningPlan.objects.filter(pk__in=[self.plan.pk, other_plan.pk])
+                        .values_list('pk', 'cards_version'))
+
+        before = versions()
+        vocab = Vocabulary.objects.get(word='word2')
+        vocab.meaning = 'changed'
+        vocab.save()
+        after = versions()
+        self.assertGreater(after[self.plan.pk], before[self.plan.pk])
+        self.assertEqual(after[other_plan.pk], before[other_plan.pk])
+
+        vocab.learning_status = 'learning'
+        vocab.save(update_fields=['learning_status'])
+        self.assertEqual(versions(), after)
+
+    def test_bulk_word_edits_and_deletes_produce_new_deck(self):
+        """Test that bulk level changes and word deletes change the ETag, with one bump per bulk delete"""
+        etags = [self._get()['ETag']]
+        run_bulk_operation(Vocabulary.objects.filter(word='word1'), 'set_level', level='B2')
+        response = self._get()
+        etags.append(response['ETag'])
+        self.assertIn('B2', json.loads(gzip.decompress(response.content))['cards']['level'])
+
+        Vocabulary.objects.get(word='word0').delete()
+        etags.append(self._get()['ETag'])
+        with CaptureQueriesContext(connection) as queries:
+            run_bulk_operation(Vocabulary.objects.filter(word__in=['word1', 'word2']), 'delete')
+        bumps = [q['sql'] for q in queries.captured_queries if '"cards_version"' in q['sql']]
+        self.assertEqual(len(bumps), 1)
+        response = self._get()
+        etags.append(response['ETag'])
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 0)
+        self.assertEqual(len(set(etags)), 4)
+
+    def test_plan_delete_does_not_bump_each_card(self):
+        """Test that deleting a plan does not issue a cards_version update per card"""
+        with CaptureQueriesContext(connection) as queries:
+            self.plan.delete()
+        bumps = [q['sql'] for q in queries.captured_queries if '"cards_version"' in q['sql']]
+        self.assertEqual(bumps, [])
+
+    def test_other_users_plan_is_not_found(self):
+        """Test that another learner cannot download the deck"""
+        other = User.objects.create_user(username='other', password='other123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=other).key}')
+        self.assertEqual(self._get().status_code, status.HTTP_404_NOT_FOUND)
@@ -1,9 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
+from .async_views import async_views_options
 from .views import (
     LearningPlanViewSet, PracticeViewSet,
-    AnalyticsViewSet, NotificationViewSet
+    AnalyticsViewSet, NotificationViewSet, DashboardViewSet
 )
 
 router = DefaultRouter()
@@ -11,7 +13,21 @@ router.register('plans', LearningPlanViewSet, basename='learning-plan')
 router.register('practice', PracticeViewSet, basename='practice')
 router.register('analytics', AnalyticsViewSet, basename='analytics')
 router.register('notifications', NotificationViewSet, basename='notification')
+router.register('dashboard', DashboardViewSet, basename='dashboard')
+
+# Async twins of the router's hot read paths (learning.async_views)
+async_urlpatterns = [
+    path('plans/<int:pk>/flashcards/', async_views.flashcards),
+    path('plans/<int:pk>/progress/', async_views.plan_progress),
+    path('notifications/unread_count/', async_views.unread_count),
+]
 
 urlpatterns = [
-    path('', include(router.urls)),
+    path('async/', include(async_urlpatterns)),
+    # No DRF twin to shadow: the analytics list recalculates before it returns the summary
+    path('async/analytics/summary/', async_views.analytics_summary),
 ]
+if async_views_options()['ENABLED']:
+    # ASGI deployments answer the read paths asynchronously; writes stay on the sync router below
+    urlpatterns += async_urlpatterns
+urlpatterns.append(path('', include(router.urls)))
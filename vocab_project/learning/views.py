@@ -1,4 +1,5 @@
 import random
+from collections import Counter
 from datetime import date
 
 from rest_framework import viewsets, status
@@ -7,25 +8,32 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Q, Prefetch
+from django.shortcuts import get_object_or_404
 from datetime import timedelta
 
 from .models import (
     LearningPlan, LearningPlanVocabulary, LearningProgress,
-    LearningSession, PracticeSession, LearnerAnalytics, LearningNotification
+    LearningSession, PracticeSession, PracticeAnswer, LearnerAnalytics, LearningNotification,
+    NotificationReadState
 )
 from .serializers import (
     LearningPlanListSerializer, LearningPlanDetailSerializer,
     LearningPlanCreateSerializer, LearningPlanUpdateSerializer,
-    LearningPlanVocabularySerializer, FlashcardSerializer,
+    LearningPlanVocabularySerializer, FlashcardSerializer, flashcard_data, flashcard_rows,
+    FLASHCARD_FIELDS, PLAN_VOCABULARY_FIELDS, PLAN_VOCABULARY_SPARSE_FIELDS,
     VocabularyStatusUpdateSerializer, LearningProgressSerializer,
     LearningSessionSerializer, LearningSessionStateSerializer,
-    PracticeSessionStartSerializer, PracticeQuestionSerializer,
+    PracticeSessionStartSerializer, PracticeQuestionSerializer, PracticeAnswerSerializer,
     PracticeSessionCompleteSerializer, PracticeSessionListSerializer,
     PracticeSessionDetailSerializer, LearnerAnalyticsSerializer,
     NotificationSerializer
 )
 from .services import AnalyticsService
+from .decks import deck_response
+from config.fieldsets import sparse_fields
+from topics.models import topics_with_counts
+from vocabulary.serializers import VOCABULARY_LIST_COLUMNS
 
 
 class LearningPlanPagination(PageNumberPagination):
@@ -40,6 +48,137 @@ class FlashcardPagination(PageNumberPagination):
     max_page_size = 100
 
 
+def flashcard_queryset(plan, params):
+    """Flashcards for a plan filtered by query params; returns (queryset, shuffle)."""
+    status_filter = params.get('status', '')
+    shuffle = params.get('shuffle', 'false').lower() == 'true'
+    limit = params.get('limit', '')
+
+    queryset = LearningPlanVocabulary.objects.filter(
+        learning_plan=plan
+    ).select_related('vocabulary')
+
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+    else:
+        # Default: prioritize new and review_required
+        queryset = queryset.filter(status__in=['new', 'review_required', 'learned'])
+
+    queryset = queryset.order_by('vocabulary__word')
+
+    # Apply limit if specified
+    if limit and limit.isdigit():
+        limit_count = min(int(limit), 200)  # Max 200 cards per request
+        queryset = queryset[:limit_count]
+
+    return queryset, shuffle
+
+
+def plan_vocabulary_queryset(plan, params, fields=None):
+    """A plan's vocabulary filtered by query params, loading only the columns `fields` serializes."""
+    status_filter = params.get('status', '')
+    search = params.get('search', '').strip()
+
+    queryset = LearningPlanVocabulary.objects.filter(learning_plan=plan).order_by('vocabulary__word')
+    topics = Prefetch('vocabulary__topics', queryset=topics_with_counts())
+    if fields is None:
+        queryset = queryset.select_related(
+            'vocabulary__owner', 'vocabulary__created_by'
+        ).prefetch_related(topics)
+    else:
+        only, related = ['id'], set()
+        for name in fields:
+            head, _, vocabulary_field = name.partition('.')
+            if not vocabulary_field:
+                only.append(head)
+                continue
+            related.add('vocabulary')
+            only.append('vocabulary__id')
+            column = VOCABULARY_LIST_COLUMNS[vocabulary_field]
+            if column is None:
+                queryset = queryset.prefetch_related(topics)
+                continue
+            only.append(f'vocabulary__{column}')
+            if '__' in column:
+                related.add(f"vocabulary__{column.rsplit('__', 1)[0]}")
+        queryset = queryset.select_related(*related).only(*only)
+
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+
+    if search:
+        queryset = queryset.filter(
+            Q(vocabulary__word__icontains=search) |
+            Q(vocabulary__meaning__icontains=search)
+        )
+    return queryset
+
+
+def progress_queryset(plan, user, params):
+    """Daily progress rows for a plan, optionally limited to the last `days` entries."""
+    qs = LearningProgress.objects.filter(
+        learning_plan=plan,
+        user=user
+    ).order_by('date')
+
+    days = params.get('days')
+    if days and days.isdigit():
+        # A sliced queryset cannot be re-ordered, so limit through a subquery
+        latest = qs.order_by('-date').values('id')[:int(days)]
+        qs = qs.filter(id__in=latest)
+    return qs
+
+
+def sync_daily_schedule(plan):
+    """Bring the plan's daily progress rows in line with its dates and words_per_session."""
+    today = date.today()
+    # Remove old dates outside plan range
+    LearningProgress.objects.filter(learning_plan=plan).exclude(
+        date__range=(plan.start_date, plan.end_date)
+    ).delete()
+
+    existing = {
+        progress.date: progress
+        for progress in LearningProgress.objects.filter(learning_plan=plan, user_id=plan.user_id)
+    }
+    to_create = []
+    to_update = []
+
+    current = plan.start_date
+    while current <= plan.end_date:
+        progress = existing.get(current)
+        if progress is None:
+            progress = LearningProgress(
+                user_id=plan.user_id,
+                learning_plan=plan,
+                date=current,
+                planned_words=plan.words_per_session,
+                status='upcoming'
+            )
+            to_create.append(progress)
+
+        # Keep planned_words aligned with plan settings
+        planned_words = plan.words_per_session
+        if progress.words_studied >= planned_words:
+            new_status = 'completed'
+        else:
+            new_status = 'missed' if current < today else 'upcoming'
+
+        if progress.pk and (progress.planned_words, progress.status) != (planned_words, new_status):
+            to_update.append(progress)
+        progress.planned_words = planned_words
+        progress.status = new_status
+        current += timedelta(days=1)
+
+    if to_create:
+        LearningProgress.objects.bulk_create(to_create, ignore_conflicts=True)
+    if to_update:
+        now = timezone.now()
+        for progress in to_update:
+            progress.updated_at = now
+        LearningProgress.objects.bulk_update(to_update, ['planned_words', 'status', 'updated_at'])
+
+
 class LearningPlanViewSet(viewsets.ModelViewSet):
     """ViewSet for managing learning plans."""
     permission_classes = [IsAuthenticated]
@@ -48,7 +187,9 @@ class LearningPlanViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         qs = LearningPlan.objects.filter(
             user=self.request.user
-        ).prefetch_related('selected_topics')
+        ).prefetch_related(
+            Prefetch('selected_topics', queryset=topics_with_counts())
+        )
         status_filter = self.request.query_params.get('status', '')
         if status_filter:
             qs = qs.filter(status=status_filter)
@@ -63,73 +204,61 @@ class LearningPlanViewSet(viewsets.ModelViewSet):
             return LearningPlanDetailSerializer
         return LearningPlanListSerializer
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        plans = page if page is not None else list(queryset)
+
+        context = self.get_serializer_context()
+        context['status_counts'] = AnalyticsService.get_plan_status_counts([plan.id for plan in plans])
+        serializer = LearningPlanListSerializer(plans, many=True, context=context)
+
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
     def perform_update(self, serializer):
         plan = serializer.save()
-        self._sync_daily_schedule(plan)
+        sync_daily_schedule(plan)
         return plan
 
     @action(detail=True, methods=['get'])
     def vocabulary(self, request, pk=None):
         """Get all vocabulary in this learning plan with their status."""
         plan = self.get_object()
-        status_filter = request.query_params.get('status', '')
-        search = request.query_params.get('search', '').strip()
-
-        queryset = LearningPlanVocabulary.objects.filter(
-            learning_plan=plan
-        ).select_related('vocabulary').order_by('vocabulary__word')
-
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-
-        if search:
-            queryset = queryset.filter(
-                Q(vocabulary__word__icontains=search) |
-                Q(vocabulary__meaning__icontains=search)
-            )
+        fields = sparse_fields(request.query_params, PLAN_VOCABULARY_FIELDS, PLAN_VOCABULARY_SPARSE_FIELDS)
+        queryset = plan_vocabulary_queryset(plan, request.query_params, fields)
 
         paginator = FlashcardPagination()
         page = paginator.paginate_queryset(queryset, request)
 
         if page is not None:
-            serializer = LearningPlanVocabularySerializer(page, many=True)
+            serializer = LearningPlanVocabularySerializer(page, many=True, fields=fields)
             return paginator.get_paginated_response(serializer.data)
 
-        serializer = LearningPlanVocabularySerializer(queryset, many=True)
+        serializer = LearningPlanVocabularySerializer(queryset, many=True, fields=fields)
         return Response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def flashcards(self, request, pk=None):
         """Get flashcards for studying."""
         plan = self.get_object()
-        status_filter = request.query_params.get('status', '')
-        shuffle = request.query_params.get('shuffle', 'false').lower() == 'true'
-        limit = request.query_params.get('limit', '')
-
-        queryset = LearningPlanVocabulary.objects.filter(
-            learning_plan=plan
-        ).select_related('vocabulary')
-
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        else:
-            # Default: prioritize new and review_required
-            queryset = queryset.filter(status__in=['new', 'review_required', 'learned'])
-
-        queryset = queryset.order_by('vocabulary__word')
+        fields = sparse_fields(request.query_params, FLASHCARD_FIELDS)
+        queryset, shuffle = flashcard_queryset(plan, request.query_params)
 
-        # Apply limit if specified
-        if limit and limit.isdigit():
-            limit_count = min(int(limit), 200)  # Max 200 cards per request
-            queryset = queryset[:limit_count]
-
-        items = list(queryset)
+        items = flashcard_data(flashcard_rows(queryset, fields), fields)
 
         if shuffle:
             random.shuffle(items)
 
-        serializer = FlashcardSerializer(items, many=True)
-        return Response(serializer.data)
+        return Response(items)
+
+    @action(detail=True, methods=['get'])
+    def deck(self, request, pk=None):
+        """All of the plan's cards as a gzip-compressed, content-hashed offline deck."""
+        # Only the ownership check and cards_version: skip get_queryset()'s topic prefetch
+        plan = get_object_or_404(LearningPlan.objects.only('id', 'cards_version'), pk=pk, user=request.user)
+        return deck_response(request, plan)
 
     @action(detail=True, methods=['patch'], url_path='vocabulary/(?P<vocab_id>[^/.]+)/status')
     def update_vocabulary_status(self, request, pk=None, vocab_id=None):
@@ -194,52 +323,12 @@ class LearningPlanViewSet(viewsets.ModelViewSet):
     def progress(self, request, pk=None):
         """Get daily progress for this learning plan."""
         plan = self.get_object()
-        self._sync_daily_schedule(plan)
-
-        qs = LearningProgress.objects.filter(
-            learning_plan=plan,
-            user=request.user
-        ).order_by('date')
-
-        days = request.query_params.get('days')
-        if days and days.isdigit():
-            days_int = int(days)
-            qs = qs.order_by('-date')[:days_int]
-            qs = qs.order_by('date')
+        sync_daily_schedule(plan)
 
+        qs = progress_queryset(plan, request.user, request.query_params)
         serializer = LearningProgressSerializer(qs, many=True)
         return Response(serializer.data)
 
-    def _sync_daily_schedule(self, plan):
-        today = date.today()
-        # Remove old dates outside plan range
-        LearningProgress.objects.filter(learning_plan=plan).exclude(
-            date__range=(plan.start_date, plan.end_date)
-        ).delete()
-
-        current = plan.start_date
-        while current <= plan.end_date:
-            progress, _ = LearningProgress.objects.get_or_create(
-                user=plan.user,
-                learning_plan=plan,
-                date=current,
-                defaults={
-                    'planned_words': plan.words_per_session,
-                    'status': 'upcoming'
-                }
-            )
-
-            # Keep planned_words aligned with plan settings
-            progress.planned_words = plan.words_per_session
-
-            if progress.words_studied >= progress.planned_words:
-                progress.status = 'completed'
-            else:
-                progress.status = 'missed' if current < today else 'upcoming'
-
-            progress.save()
-            current += timedelta(days=1)
-
     @action(detail=True, methods=['post'])
     def start_session(self, request, pk=None):
         """Start or resume a learning session."""
@@ -437,6 +526,7 @@ class PracticeViewSet(viewsets.ViewSet):
             is_active=True
         ).update(is_active=False)
 
+        # Only question ids are stored; prompts are hydrated from vocabulary on read
         learning_session = LearningSession.objects.create(
             user=request.user,
             learning_plan=plan,
@@ -445,8 +535,7 @@ class PracticeViewSet(viewsets.ViewSet):
                 'practice_session_id': session.id,
                 'practice_type': practice_type,
                 'current_index': 0,
-                'questions': self._generate_questions(selected, practice_type),
-                'answers': [],
+                'question_ids': [pv.id for pv in selected],
                 'started_at': timezone.now().isoformat()
             }
         )
@@ -455,7 +544,7 @@ class PracticeViewSet(viewsets.ViewSet):
             'session_id': session.id,
             'learning_session_id': learning_session.id,
             'practice_type': practice_type,
-            'questions': learning_session.state['questions'],
+            'questions': self._generate_questions(selected, practice_type),
             'total_questions': len(selected)
         }, status=status.HTTP_201_CREATED)
 
@@ -493,6 +582,38 @@ class PracticeViewSet(viewsets.ViewSet):
 
         return questions
 
+    def _hydrate_questions(self, session):
+        """Rebuild the question list from the stored plan vocabulary ids."""
+        if 'questions' in session.state:
+            # Sessions started before question ids were stored
+            return session.state['questions']
+
+        question_ids = session.state.get('question_ids', [])
+        plan_vocabulary = LearningPlanVocabulary.objects.filter(
+            id__in=question_ids
+        ).select_related('vocabulary').in_bulk()
+        ordered = [plan_vocabulary[pv_id] for pv_id in question_ids if pv_id in plan_vocabulary]
+        return self._generate_questions(ordered, session.state.get('practice_type'))
+
+    def _question_vocabulary_ids(self, session):
+        """Vocabulary id of each question in the session, by position."""
+        if 'questions' in session.state:
+            return [question.get('vocabulary_id') for question in session.state['questions']]
+
+        question_ids = session.state.get('question_ids', [])
+        vocabulary_ids = dict(LearningPlanVocabulary.objects.filter(
+            id__in=question_ids
+        ).values_list('id', 'vocabulary_id'))
+        return [vocabulary_ids.get(pv_id) for pv_id in question_ids]
+
+    def _recorded_answers(self, session):
+        """{position: answer} from the JSON state, overlaid by the answer rows."""
+        answers = dict(enumerate(session.state.get('answers', [])))
+        answers.update(
+            (answer.position, answer.to_state()) for answer in session.practice_answers.all()
+        )
+        return answers
+
     @action(detail=False, methods=['get', 'patch'])
     def state(self, request):
         """Get or update practice session state."""
@@ -509,19 +630,41 @@ class PracticeViewSet(viewsets.ViewSet):
             )
 
         if request.method == 'GET':
+            questions = self._hydrate_questions(session)
+            answers = self._recorded_answers(session)
+            answered = max(answers) + 1 if answers else 0
             return Response({
                 'session_id': session.state.get('practice_session_id'),
                 'practice_type': session.state.get('practice_type'),
-                'current_index': session.state.get('current_index', 0),
-                'questions': session.state.get('questions', []),
-                'answers': session.state.get('answers', []),
-                'total_questions': len(session.state.get('questions', []))
+                'current_index': min(max(session.state.get('current_index', 0), answered), len(questions)),
+                'questions': questions,
+                'answers': [answers[position] for position in sorted(answers)],
+                'total_questions': len(questions)
             })
 
-        # PATCH
-        session.state.update(request.data.get('state', {}))
-        session.last_activity_at = timezone.now()
-        session.save()
+        # PATCH - answers are upserted as rows, the JSON header only changes when asked to
+        if 'answer' in request.data:
+            answer_serializer = PracticeAnswerSerializer(
+                data=request.data['answer'],
+                context={'vocabulary_ids': self._question_vocabulary_ids(session)}
+            )
+            answer_serializer.is_valid(raise_exception=True)
+            PracticeAnswer.objects.bulk_create(
+                [PracticeAnswer(session=session, **answer_serializer.validated_data)],
+                update_conflicts=True, unique_fields=['session', 'position'],
+                update_fields=['vocabulary_id', 'user_answer', 'correct', 'self_evaluation', 'time_spent']
+            )
+
+        header = {
+            key: value for key, value in request.data.get('state', {}).items()
+            if key not in ('questions', 'question_ids', 'answers')
+        }
+        if header:
+            session.state.update(header)
+            session.last_activity_at = timezone.now()
+            session.save(update_fields=['state', 'last_activity_at'])
+        else:
+            LearningSession.objects.filter(pk=session.pk).update(last_activity_at=timezone.now())
 
         return Response({'message': 'State updated.'})
 
@@ -539,32 +682,41 @@ class PracticeViewSet(viewsets.ViewSet):
         serializer = PracticeSessionCompleteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        results = serializer.validated_data['results']
         duration = serializer.validated_data['duration_seconds']
 
+        # Answers recorded on the server replace the posted results at the same position
+        learning_session = LearningSession.objects.filter(
+            user=request.user,
+            session_type='practice',
+            is_active=True,
+            state__practice_session_id=session.id
+        ).first()
+        results = dict(enumerate(serializer.validated_data['results']))
+        if learning_session:
+            results.update(self._recorded_answers(learning_session))
+        results = [results[position] for position in sorted(results)]
+
         # Process results and update vocabulary status
-        correct = 0
-        for result in results:
-            vocab_id = result.get('vocabulary_id')
-            is_correct = result.get('correct', False)
-            self_eval = result.get('self_evaluation')
-
-            if is_correct:
-                correct += 1
-
-            # Update vocabulary status based on self-evaluation
-            if self_eval:
-                try:
-                    plan_vocab = LearningPlanVocabulary.objects.get(
-                        learning_plan=session.learning_plan,
-                        vocabulary_id=vocab_id
-                    )
-                    plan_vocab.status = self_eval
-                    plan_vocab.last_reviewed_at = timezone.now()
-                    plan_vocab.review_count += 1
-                    plan_vocab.save()
-                except LearningPlanVocabulary.DoesNotExist:
-                    pass
+        correct = sum(1 for result in results if result.get('correct', False))
+
+        # Update vocabulary status based on self-evaluation (last answer per word wins);
+        # every self-evaluated answer counts as a review
+        evaluated = [result for result in results if result.get('self_evaluation')]
+        evaluations = {result.get('vocabulary_id'): result['self_evaluation'] for result in evaluated}
+        reviews = Counter(result.get('vocabulary_id') for result in evaluated)
+        if evaluations:
+            now = timezone.now()
+            plan_vocabulary = list(LearningPlanVocabulary.objects.filter(
+                learning_plan=session.learning_plan,
+                vocabulary_id__in=evaluations.keys()
+            ))
+            for plan_vocab in plan_vocabulary:
+                plan_vocab.status = evaluations[plan_vocab.vocabulary_id]
+                plan_vocab.last_reviewed_at = now
+                plan_vocab.review_count += reviews[plan_vocab.vocabulary_id]
+            LearningPlanVocabulary.objects.bulk_update(
+                plan_vocabulary, ['status', 'last_reviewed_at', 'review_count']
+            )
 
         session.correct_answers = correct
         session.results = results
@@ -602,23 +754,9 @@ class AnalyticsViewSet(viewsets.ViewSet):
         analytics = AnalyticsService.get_or_create_analytics(request.user)
         serializer = LearnerAnalyticsSerializer(analytics)
 
-        # Get summary stats
-        plan_count = LearningPlan.objects.filter(user=request.user, status='active').count()
-        total_words = LearningPlanVocabulary.objects.filter(
-            learning_plan__user=request.user
-        ).count()
-        mastered_words = LearningPlanVocabulary.objects.filter(
-            learning_plan__user=request.user,
-            status='mastered'
-        ).count()
-
         return Response({
             'analytics': serializer.data,
-            'summary': {
-                'active_plans': plan_count,
-                'total_words': total_words,
-                'mastered_words': mastered_words,
-            }
+            'summary': AnalyticsService.get_summary(request.user)
         })
 
     @action(detail=False, methods=['get'], url_path='plans/(?P<plan_id>[^/.]+)')
@@ -670,38 +808,105 @@ class AnalyticsViewSet(viewsets.ViewSet):
         })
 
 
+class DashboardViewSet(viewsets.ViewSet):
+    """
+    Composite endpoint for the analytics pages.
+    Returns analytics, unread notifications, recent plans of every status and
+    the last 7 days of progress in one response using a fixed number of queries.
+    """
+    permission_classes = [IsAuthenticated]
+    notification_limit = 10
+    plan_limit = 10
+    progress_days = 7
+
+    def list(self, request):
+        user = request.user
+        analytics = AnalyticsService.get_or_create_analytics(user)
+
+        read_state = NotificationReadState.for_user(user)
+        unread = read_state.unread_queryset().select_related('learning_plan')
+
+        plans = list(
+            LearningPlan.objects.filter(user=user).prefetch_related(
+                Prefetch('selected_topics', queryset=topics_with_counts())
+            )[:self.plan_limit]
+        )
+        status_counts = AnalyticsService.get_plan_status_counts([plan.id for plan in plans])
+
+        # Weekly chart follows the most recently created active plan, else the most recent plan
+        chart_plan = next((plan for plan in plans if plan.status == 'active'), plans[0] if plans else None)
+        progress = []
+        if chart_plan:
+            sync_daily_schedule(chart_plan)
+            since = date.today() - timedelta(days=self.progress_days - 1)
+            progress = LearningProgress.objects.filter(
+                learning_plan=chart_plan,
+                user=user,
+                date__gte=since,
+                date__lte=date.today()
+            ).order_by('date')
+
+        return Response({
+            'analytics': LearnerAnalyticsSerializer(analytics).data,
+            'summary': AnalyticsService.get_summary(user),
+            'notifications': {
+                'unread_count': read_state.unread_count,
+                'results': NotificationSerializer(
+                    unread[:self.notification_limit], many=True,
+                    context={'last_read_at': read_state.last_read_at}
+                ).data,
+            },
+            'plans': LearningPlanListSerializer(
+                plans, many=True, context={'request': request, 'status_counts': status_counts}
+            ).data,
+            'weekly_progress': {
+                'plan_id': chart_plan.id if chart_plan else None,
+                'days': LearningProgressSerializer(progress, many=True).data,
+            },
+        })
+
+
 class NotificationViewSet(viewsets.ModelViewSet):
     """ViewSet for notifications."""
     permission_classes = [IsAuthenticated]
     serializer_class = NotificationSerializer
 
     def get_queryset(self):
-        return LearningNotification.objects.filter(user=self.request.user)
+        return LearningNotification.objects.filter(
+            user=self.request.user
+        ).select_related('learning_plan')
+
+    def get_read_state(self):
+        if not hasattr(self, '_read_state'):
+            self._read_state = NotificationReadState.for_user(self.request.user)
+        return self._read_state
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request and self.request.user.is_authenticated:
+            context['last_read_at'] = self.get_read_state().last_read_at
+        return context
 
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get count of unread notifications."""
-        count = LearningNotification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).count()
-        return Response({'count': count})
+        return Response({'count': self.get_read_state().unread_count})
 
     @action(detail=True, methods=['patch'])
     def read(self, request, pk=None):
         """Mark a notification as read."""
         notification = self.get_object()
-        notification.is_read = True
-        notification.save()
-        return Response(NotificationSerializer(notification).data)
+        state = self.get_read_state()
+        if notification.is_unread_for(state.last_read_at):
+            # learning.signals takes it out of the unread counter
+            notification.is_read = True
+            notification.save(update_fields=['is_read'])
+        return Response(self.get_serializer(notification).data)
 
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
-        """Mark all notifications as read."""
-        LearningNotification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).update(is_read=True)
+        """Mark all notifications as read by advancing the read cursor."""
+        self.get_read_state().advance(timezone.now())
         return Response({'message': 'All notifications marked as read.'})
 
 
@@ -13,7 +13,7 @@ class NotificationAdmin(admin.ModelAdmin):
 
 @admin.register(UserNotification)
 class UserNotificationAdmin(admin.ModelAdmin):
-    list_display = ['user', 'notification', 'is_read', 'created_at']
-    list_filter = ['is_read', 'created_at']
+    list_display = ['user', 'notification', 'is_read', 'is_dismissed', 'created_at']
+    list_filter = ['is_read', 'is_dismissed', 'created_at']
     search_fields = ['user__username', 'notification__title']
     ordering = ['-created_at']
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.services import NotificationDispatcher
+
+
+class Command(BaseCommand):
+    help = 'Dispatch due scheduled notifications, once or as a long-running worker.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Notifications claimed per transaction.')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Rows per bulk_create when fanning out specific users.')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running and poll for due notifications.')
+        parser.add_argument('--interval', type=float, default=30.0,
+                            help='Seconds to sleep between polls when idle (with --loop).')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        chunk_size = options['chunk_size']
+
+        if not options['loop']:
+            total = self._drain(batch_size, chunk_size)
+            self.stdout.write(self.style.SUCCESS(f'Dispatched {total} notification(s).'))
+            return
+
+        self.stdout.write('Notification dispatcher started.')
+        try:
+            while True:
+                total = self._drain(batch_size, chunk_size)
+                if total:
+                    self.stdout.write(f'Dispatched {total} notification(s).')
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Notification dispatcher stopped.')
+
+    def _drain(self, batch_size, chunk_size):
+        """Dispatch batches until nothing due is left."""
+        total = 0
+        while True:
+            sent = NotificationDispatcher.dispatch_due(batch_size=batch_size, chunk_size=chunk_size)
+            total += sent
+            if sent < batch_size:
+                return total
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_usernotification_dismissed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['is_sent', 'scheduled_at'], name='notification_due'),
+        ),
+    ]
@@ -38,17 +38,27 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['target_type', 'created_at'], name='notification_target_created'),
+            models.Index(fields=['is_sent', 'scheduled_at'], name='notification_due'),
+        ]
         
     def __str__(self):
         return f"{self.title} ({self.target_type})"
 
 
 class UserNotification(models.Model):
-    """Individual user notification status"""
+    """
+    Individual user notification status.
+    Broadcasts are resolved at read time, so rows only exist once a user
+    reads or dismisses a notification (or was targeted specifically).
+    """
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='user_notifications')
     notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='user_statuses')
     is_read = models.BooleanField(default=False)
     read_at = models.DateTimeField(null=True, blank=True)
+    is_dismissed = models.BooleanField(default=False)
+    dismissed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -0,0 +1,13 @@
+from rest_framework import serializers
+from .models import Notification
+
+
+class InboxNotificationSerializer(serializers.ModelSerializer):
+    """Serializer for a notification as seen in a user's inbox."""
+    is_read = serializers.BooleanField(source='user_is_read', read_only=True)
+    read_at = serializers.DateTimeField(source='user_read_at', read_only=True, allow_null=True)
+
+    class Meta:
+        model = Notification
+        fields = ['id', 'title', 'message', 'target_type', 'priority', 'is_read', 'read_at', 'created_at']
+        read_only_fields = fields
@@ -0,0 +1,151 @@
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q, Subquery, Value, BooleanField
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Notification, UserNotification
+
+
+class NotificationDeliveryService:
+    """
+    Delivers system notifications without per-user fan-out.
+    Broadcasts are stored once and matched to a user at read time by target
+    type and role; UserNotification rows are written only on read or dismiss.
+    """
+
+    ROLE_TARGETS = {
+        'admin': 'admins',
+        'learner': 'learners',
+    }
+
+    @staticmethod
+    def delivered(now=None):
+        """Notifications that are due: unscheduled, already sent, or past their schedule."""
+        now = now or timezone.now()
+        return Notification.objects.filter(
+            Q(is_sent=True) | Q(scheduled_at__isnull=True) | Q(scheduled_at__lte=now)
+        )
+
+    @staticmethod
+    def target_filter(user):
+        """Q object matching notifications addressed to this user."""
+        targets = ['all']
+        role_target = NotificationDeliveryService.ROLE_TARGETS.get(user.role)
+        if role_target:
+            targets.append(role_target)
+
+        specific = Notification.specific_users.through.objects.filter(
+            notification_id=OuterRef('pk'),
+            user_id=user.pk
+        )
+        return Q(target_type__in=targets) | Q(Exists(specific), target_type='specific')
+
+    @staticmethod
+    def inbox_for(user, include_dismissed=False):
+        """A user's merged inbox annotated with their read state."""
+        statuses = UserNotification.objects.filter(
+            user=user,
+            notification_id=OuterRef('pk')
+        )
+        qs = NotificationDeliveryService.delivered().filter(
+            NotificationDeliveryService.target_filter(user)
+        ).annotate(
+            user_is_read=Coalesce(
+                Subquery(statuses.values('is_read')[:1]),
+                Value(False),
+                output_field=BooleanField()
+            ),
+            user_read_at=Subquery(statuses.values('read_at')[:1]),
+            user_is_dismissed=Coalesce(
+                Subquery(statuses.values('is_dismissed')[:1]),
+                Value(False),
+                output_field=BooleanField()
+            ),
+        )
+        if not include_dismissed:
+            qs = qs.filter(user_is_dismissed=False)
+        return qs
+
+    @staticmethod
+    def mark_read(user, notification):
+        """Materialize the user's status row as read."""
+        status, created = UserNotification.objects.get_or_create(
+            user=user,
+            notification=notification,
+            defaults={'is_read': True, 'read_at': timezone.now()}
+        )
+        if not created and not status.is_read:
+            status.is_read = True
+            status.read_at = timezone.now()
+            status.save(update_fields=['is_read', 'read_at'])
+        return status
+
+    @staticmethod
+    def dismiss(user, notification):
+        """Materialize the user's status row as dismissed."""
+        status, created = UserNotification.objects.get_or_create(
+            user=user,
+            notification=notification,
+            defaults={'is_dismissed': True, 'dismissed_at': timezone.now()}
+        )
+        if not created and not status.is_dismissed:
+            status.is_dismissed = True
+            status.dismissed_at = timezone.now()
+            status.save(update_fields=['is_dismissed', 'dismissed_at'])
+        return status
+
+
+class NotificationDispatcher:
+    """
+    Marks due notifications as sent and fans out specific-user targets.
+    Safe to run from several workers at once: rows are claimed with
+    SKIP LOCKED where supported and always with a compare-and-set update.
+    """
+
+    @staticmethod
+    def due(now=None):
+        """Unsent notifications whose schedule has passed (served by the is_sent/scheduled_at index)."""
+        now = now or timezone.now()
+        return Notification.objects.filter(
+            Q(scheduled_at__isnull=True) | Q(scheduled_at__lte=now),
+            is_sent=False
+        ).order_by('scheduled_at', 'id')
+
+    @staticmethod
+    def dispatch_due(batch_size=100, chunk_size=500, now=None):
+        """Dispatch one batch of due notifications and return how many were sent."""
+        now = now or timezone.now()
+        dispatched = 0
+
+        with transaction.atomic():
+            due = NotificationDispatcher.due(now)
+            if connection.features.has_select_for_update_skip_locked:
+                due = due.select_for_update(skip_locked=True)
+
+            for notification in due[:batch_size]:
+                # Compare-and-set so backends without row locks never double-send
+                claimed = Notification.objects.filter(
+                    pk=notification.pk,
+                    is_sent=False
+                ).update(is_sent=True, sent_at=now)
+                if not claimed:
+                    continue
+
+                if notification.target_type == 'specific':
+                    NotificationDispatcher.fan_out(notification, chunk_size)
+                dispatched += 1
+
+        return dispatched
+
+    @staticmethod
+    def fan_out(notification, chunk_size=500):
+        """Create status rows for specifically targeted users in chunks."""
+        user_ids = notification.specific_users.order_by('id').values_list('id', flat=True)
+        chunk = []
+        for user_id in user_ids.iterator(chunk_size=chunk_size):
+            chunk.append(UserNotification(user_id=user_id, notification=notification))
+            if len(chunk) >= chunk_size:
+                UserNotification.objects.bulk_create(chunk, ignore_conflicts=True)
+                chunk = []
+        if chunk:
+            UserNotification.objects.bulk_create(chunk, ignore_conflicts=True)
@@ -1,3 +1,151 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from rest_framework import status
+
+from .models import Notification, UserNotification
+from .services import NotificationDispatcher
+
+User = get_user_model()
+
+
+class InboxTests(APITestCase):
+    """Test suite for read-time resolution of broadcast notifications"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='admin123',
+            role='admin'
+        )
+        self.learner_user = User.objects.create_user(
+            username='learner',
+            email='learner@test.com',
+            password='learner123',
+            role='learner'
+        )
+        self.learner_token = Token.objects.create(user=self.learner_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.learner_token.key}')
+        self.inbox_url = '/api/notifications/inbox/'
+
+    def _notify(self, title, target_type, **kwargs):
+        return Notification.objects.create(
+            title=title, message='Message', target_type=target_type,
+            created_by=self.admin_user, **kwargs
+        )
+
+    def _inbox_titles(self):
+        response = self.client.get(self.inbox_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [n['title'] for n in response.json()['results']]
+
+    def test_inbox_resolves_targets_without_fan_out(self):
+        """Test that broadcasts are matched by role and no status rows are created"""
+        self._notify('Everyone', 'all')
+        self._notify('Learners', 'learners')
+        self._notify('Admins', 'admins')
+        self._notify('Later', 'all', scheduled_at=timezone.now() + timedelta(days=1))
+        direct = self._notify('Direct', 'specific')
+        direct.specific_users.add(self.learner_user)
+        other = self._notify('Other', 'specific')
+        other.specific_users.add(self.admin_user)
+
+        titles = self._inbox_titles()
+
+        self.assertEqual(sorted(titles), ['Direct', 'Everyone', 'Learners'])
+        self.assertFalse(UserNotification.objects.exists())
+
+    def test_read_and_dismiss_materialize_status(self):
+        """Test that reading and dismissing create the per-user row"""
+        read_me = self._notify('Read me', 'all')
+        dismiss_me = self._notify('Dismiss me', 'all')
+
+        response = self.client.post(f'{self.inbox_url}{read_me.id}/read/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()['is_read'])
+
+        self.client.post(f'{self.inbox_url}{dismiss_me.id}/dismiss/')
+
+        self.assertEqual(self._inbox_titles(), ['Read me'])
+        self.assertEqual(UserNotification.objects.filter(user=self.learner_user).count(), 2)
+
+    def test_cannot_read_notification_for_other_role(self):
+        """Test that notifications outside the user's targets are not reachable"""
+        admins_only = self._notify('Admins', 'admins')
+        response = self.client.post(f'{self.inbox_url}{admins_only.id}/read/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_inbox_keyset_pagination(self):
+        """Test that the cursor walks the inbox without gaps or repeats"""
+        for i in range(25):
+            self._notify(f'N{i}', 'all')
+
+        first = self.client.get(self.inbox_url).json()
+        second = self.client.get(first['next']).json()
+
+        ids = [n['id'] for n in first['results'] + second['results']]
+        self.assertEqual(len(first['results']), 20)
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(len(set(ids)), 25)
+        self.assertIsNone(second['next'])
+
+
+class DispatcherTests(APITestCase):
+    """Test suite for the scheduled notification dispatcher"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='admin123',
+            role='admin'
+        )
+        self.learners = [
+            User.objects.create_user(username=f'learner{i}', password='learner123')
+            for i in range(7)
+        ]
+
+    def test_dispatch_sends_due_and_fans_out_specific(self):
+        """Test that due notifications are sent once and specific users get rows"""
+        past = timezone.now() - timedelta(minutes=5)
+        direct = Notification.objects.create(
+            title='Direct', message='M', target_type='specific', scheduled_at=past
+        )
+        direct.specific_users.set(self.learners)
+        broadcast = Notification.objects.create(
+            title='Broadcast', message='M', target_type='all', scheduled_at=past
+        )
+        future = Notification.objects.create(
+            title='Future', message='M', target_type='all',
+            scheduled_at=timezone.now() + timedelta(hours=1)
+        )
+
+        out = StringIO()
+        call_command('dispatch_notifications', '--chunk-size', '3', stdout=out)
+
+        self.assertIn('Dispatched 2', out.getvalue())
+        direct.refresh_from_db()
+        broadcast.refresh_from_db()
+        future.refresh_from_db()
+        self.assertTrue(direct.is_sent)
+        self.assertIsNotNone(direct.sent_at)
+        self.assertTrue(broadcast.is_sent)
+        self.assertFalse(future.is_sent)
+        self.assertEqual(UserNotification.objects.filter(notification=direct).count(), 7)
+        # Broadcasts are resolved at read time and never fanned out
+        self.assertFalse(UserNotification.objects.filter(notification=broadcast).exists())
+
+    def test_dispatch_does_not_resend(self):
+        """Test that a second run finds nothing left to send"""
+        Notification.objects.create(
+            title='Once', message='M', target_type='all',
+            scheduled_at=timezone.now() - timedelta(minutes=1)
+        )
+        self.assertEqual(NotificationDispatcher.dispatch_due(), 1)
+        self.assertEqual(NotificationDispatcher.dispatch_due(), 0)
@@ -1,3 +1,40 @@
-from django.shortcuts import render
+from rest_framework import viewsets, mixins
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import CursorPagination
 
-# Create your views here.
+from .serializers import InboxNotificationSerializer
+from .services import NotificationDeliveryService
+
+
+class InboxPagination(CursorPagination):
+    """Keyset pagination over (created_at, id) so deep pages stay cheap."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+
+class InboxViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """ViewSet for a user's merged notification inbox."""
+    permission_classes = [IsAuthenticated]
+    serializer_class = InboxNotificationSerializer
+    pagination_class = InboxPagination
+
+    def get_queryset(self):
+        return NotificationDeliveryService.inbox_for(self.request.user)
+
+    @action(detail=True, methods=['post'])
+    def read(self, request, pk=None):
+        """Mark a notification as read for the current user."""
+        notification = self.get_object()
+        NotificationDeliveryService.mark_read(request.user, notification)
+        return Response(self.get_serializer(self.get_object()).data)
+
+    @action(detail=True, methods=['post'])
+    def dismiss(self, request, pk=None):
+        """Hide a notification from the current user's inbox."""
+        notification = self.get_object()
+        NotificationDeliveryService.dismiss(request.user, notification)
+        return Response({'message': 'Notification dismissed.'})
@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class OpsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'ops'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .conditional import connect_signals
+        from .metrics import enabled, patch_view_dispatch
+        from .slow_queries import install, slow_query_options
+        connect_signals()
+        if enabled():
+            patch_view_dispatch()
+        if slow_query_options()['ENABLED']:
+            connection_created.connect(install, dispatch_uid='ops.slow_queries')
@@ -0,0 +1,160 @@
+"""
+Conditional GET for list endpoints that change rarely.
+
+Each tracked table has a counter in ops_table_versions. The counter is
+bumped inside the writing transaction. Model signals bump it for ORM
+writes. Bulk and raw-SQL writers call bump() themselves. A view wrapped in
+@conditional_get builds a strong ETag from the counters of the tables it
+reads, the user and the full path. A matching If-None-Match costs one
+primary-key lookup and returns 304 before the list query or serializer runs.
+"""
+import functools
+import hashlib
+import threading
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SALT': '',
+    'ENDPOINTS': {},
+}
+
+# Models whose writes bump their table's counter. VocabularyTopic only gets a
+# post_save receiver: a post_delete receiver would stop Django fast-deleting
+# the join rows when a vocabulary or topic is deleted. Those cascades are
+# covered by the parents' post_delete, and clear()/remove() by m2m_changed.
+TRACKED_MODELS = ['accounts.User', 'topics.Topic', 'vocabulary.Vocabulary', 'vocabulary.VocabularyTopic']
+CASCADES = {'topics': ['vocabulary_topics'], 'vocabularies': ['vocabulary_topics']}
+# Saves that touch only these fields never change a tracked response
+IGNORED_FIELDS = {'users': {'last_login'}}
+
+_deferred = threading.local()
+
+
+def conditional_get_options():
+    options = dict(DEFAULTS)
+    options.update(getattr(settings, 'CONDITIONAL_GET', {}))
+    return options
+
+
+def bump(*tables):
+    """Advance the version of each table (collected instead inside deferred_bumps())."""
+    from .models import TableVersion
+
+    pending = getattr(_deferred, 'tables', None)
+    if pending is not None:
+        pending.update(tables)
+        return
+    tables = sorted(set(tables))
+    updated = TableVersion.objects.filter(table__in=tables).update(version=F('version') + 1)
+    if updated < len(tables):
+        existing = set(TableVersion.objects.filter(table__in=tables).values_list('table', flat=True))
+        TableVersion.objects.bulk_create(
+            [TableVersion(table=table, version=1) for table in tables if table not in existing],
+            ignore_conflicts=True,
+        )
+
+
+@contextmanager
+def deferred_bumps():
+    """Collapse the bumps of a multi-row write (imports, seeding) into one at the end."""
+    if getattr(_deferred, 'tables', None) is not None:
+        yield
+        return
+    _deferred.tables = set()
+    try:
+        yield
+    finally:
+        tables, _deferred.tables = _deferred.tables, None
+        if tables:
+            bump(*tables)
+
+
+def versions(tables):
+    from .models import TableVersion
+
+    found = dict(TableVersion.objects.filter(table__in=tables).values_list('table', 'version'))
+    return [found.get(table, 0) for table in tables]
+
+
+def _saved(sender, update_fields=None, **kwargs):
+    table = sender._meta.db_table
+    if update_fields and set(update_fields) <= IGNORED_FIELDS.get(table, set()):
+        return
+    bump(table)
+
+
+def _deleted(sender, **kwargs):
+    table = sender._meta.db_table
+    bump(table, *CASCADES.get(table, []))
+
+
+def _links_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump(sender._meta.db_table)
+
+
+def connect_signals():
+    for label in TRACKED_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(_saved, sender=model, dispatch_uid=f'ops.conditional.save.{label}')
+        if label != 'vocabulary.VocabularyTopic':
+            post_delete.connect(_deleted, sender=model, dispatch_uid=f'ops.conditional.delete.{label}')
+    m2m_changed.connect(_links_changed, sender=apps.get_model('vocabulary.VocabularyTopic'),
+                        dispatch_uid='ops.conditional.links')
+
+
+def compute_etag(endpoint, tables, request):
+    user = request.user
+    parts = [
+        conditional_get_options()['SALT'], endpoint,
+        ','.join(f'{table}:{version}' for table, version in zip(tables, versions(tables))),
+        str(user.pk), getattr(user, 'role', ''),
+        request.get_full_path(), getattr(request, 'accepted_media_type', '') or '',
+    ]
+    return quote_etag(hashlib.sha1('|'.join(parts).encode()).hexdigest())
+
+
+def etag_matches(header, etag):
+    """If-None-Match uses the weak comparison, so W/"x" matches "x"."""
+    if not header:
+        return False
+    tags = parse_etags(header)
+    return '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags)
+
+
+def conditional_get(endpoint, tables):
+    """
+    Decorate a DRF view method whose response depends only on `tables`, the
+    user and the URL. Cache-Control comes from CONDITIONAL_GET['ENDPOINTS'][endpoint].
+    """
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            options = conditional_get_options()
+            if not options['ENABLED']:
+                return view_method(self, request, *args, **kwargs)
+            etag = compute_etag(endpoint, tables, request)
+            if etag_matches(request.headers.get('If-None-Match'), etag):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+            response['ETag'] = etag
+            cache_control = options['ENDPOINTS'].get(endpoint, {}).get('CACHE_CONTROL')
+            if cache_control:
+                response['Cache-Control'] = cache_control
+            patch_vary_headers(response, ['Authorization', 'Cookie'])
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,163 @@
+import contextvars
+import re
+import threading
+import time
+from collections import deque
+
+from rest_framework import serializers
+
+_current = contextvars.ContextVar('ops_request_metrics', default=None)
+
+_REGEX_GROUP = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+
+
+def route_template(route):
+    """'/api/learning/plans/<pk>/' for a resolver route such as 'api/learning/^plans/(?P<pk>[^/.]+)/$'."""
+    # Router URLs are regexes; reduce them to the same <name> form as path()
+    route = _REGEX_GROUP.sub(r'<\1>', route).replace('^', '').replace('$', '')
+    return f'/{route}'
+
+
+def route_pattern(request):
+    """'/api/learning/plans/<pk>/' for the resolved URL pattern of a request."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    return route_template(match.route)
+
+
+def route_label(request):
+    return f'{request.method} {route_pattern(request)}'
+
+
+class RequestMetrics:
+    """Query, DB time and serializer time collected for one request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.serializer_ms = 0.0
+        self.serializer_depth = 0
+
+    @staticmethod
+    def current():
+        return _current.get()
+
+    def activate(self):
+        return _current.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _current.reset(token)
+
+
+def count_query(execute, sql, params, many, context):
+    """Execute wrapper on every connection: charges the query to the request being measured."""
+    metrics = RequestMetrics.current()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_ms += (time.perf_counter() - started) * 1000
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """
+    connection_created receiver: attach count_query once per connection.
+    Async views query from sync_to_async threads, whose connections the
+    middleware never sees, so the wrapper rides on the connection and finds
+    the request through the context variable instead.
+    """
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class RouteStats:
+    """In-memory per-route timing samples, bounded per route."""
+
+    def __init__(self, samples_per_route=1000):
+        self.samples_per_route = samples_per_route
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, total_ms, db_ms, queries):
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = {
+                    'count': 0,
+                    'total_ms': deque(maxlen=self.samples_per_route),
+                    'db_ms': deque(maxlen=self.samples_per_route),
+                    'queries': deque(maxlen=self.samples_per_route),
+                }
+            entry['count'] += 1
+            entry['total_ms'].append(total_ms)
+            entry['db_ms'].append(db_ms)
+            entry['queries'].append(queries)
+
+    def snapshot(self):
+        """Percentiles per route, slowest p95 first."""
+        with self._lock:
+            routes = {
+                route: (entry['count'], sorted(entry['total_ms']), sorted(entry['db_ms']), sorted(entry['queries']))
+                for route, entry in self._routes.items()
+            }
+        rows = []
+        for route, (count, total, db, queries) in routes.items():
+            rows.append({
+                'route': route,
+                'count': count,
+                'p50_ms': round(percentile(total, 50), 2),
+                'p95_ms': round(percentile(total, 95), 2),
+                'p99_ms': round(percentile(total, 99), 2),
+                'db_p95_ms': round(percentile(db, 95), 2),
+                'queries_p50': percentile(queries, 50),
+                'queries_max': queries[-1],
+            })
+        return sorted(rows, key=lambda row: row['p95_ms'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+route_stats = RouteStats()
+
+_serializer_patch_lock = threading.Lock()
+_serializer_patched = False
+
+
+def patch_serializer_timing(clock):
+    """Time top-level serializer `.data` access into the current request's metrics."""
+    global _serializer_patched
+    with _serializer_patch_lock:
+        if _serializer_patched:
+            return
+        original = serializers.BaseSerializer.data
+
+        def timed_data(self):
+            metrics = _current.get()
+            if metrics is None:
+                return original.fget(self)
+            metrics.serializer_depth += 1
+            started = clock()
+            try:
+                return original.fget(self)
+            finally:
+                metrics.serializer_depth -= 1
+                if metrics.serializer_depth == 0:
+                    metrics.serializer_ms += (clock() - started) * 1000
+
+        # Serializer and ListSerializer reach this through super().data
+        serializers.BaseSerializer.data = property(timed_data)
+        _serializer_patched = True
@@ -0,0 +1,370 @@
+import csv
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, time as dt_time, timedelta
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from learning.models import (
+    LearningPlan, LearningPlanVocabulary, LearningProgress, PracticeSession, LearningNotification,
+    NotificationReadState
+)
+from ops.conditional import bump, deferred_bumps
+from topics.models import Topic
+from vocabulary.models import Vocabulary, VocabularyTopic
+
+User = get_user_model()
+
+DEFAULT_CSV = Path(settings.BASE_DIR).parent / 'A1_2026.csv'
+
+LEVELS = [code for code, _ in Vocabulary.LEVEL_CHOICES]
+WORD_TYPES = [code for code, _ in Vocabulary.TYPE_CHOICES]
+PLAN_STATUSES = ['new'] * 5 + ['learned'] * 3 + ['mastered'] * 2 + ['review_required'] * 2
+NOTIFICATION_TYPES = [code for code, _ in LearningNotification.NOTIFICATION_TYPE_CHOICES]
+PRACTICE_TYPES = [code for code, _ in PracticeSession.PRACTICE_TYPE_CHOICES]
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/updated_at values we generate."""
+    fields = [
+        field for model in models for field in model._meta.fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic, production-sized dataset for scale and load testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Learners to create.')
+        parser.add_argument('--plans-per-user', type=int, default=2, help='Learning plans per learner.')
+        parser.add_argument('--words-per-plan', type=int, default=500,
+                            help='Plan vocabulary rows per plan (users x plans x words = table size).')
+        parser.add_argument('--vocabulary', type=int, default=5000,
+                            help='System vocabulary rows derived from the CSV.')
+        parser.add_argument('--topics', type=int, default=20, help='Topics to spread vocabulary over.')
+        parser.add_argument('--days', type=int, default=30, help='Days of history per plan.')
+        parser.add_argument('--practice-per-plan', type=int, default=3, help='Completed practice sessions per plan.')
+        parser.add_argument('--notifications-per-user', type=int, default=10, help='Notification history per learner.')
+        parser.add_argument('--csv', default=str(DEFAULT_CSV), help='Source vocabulary CSV.')
+        parser.add_argument('--prefix', default='scale', help='Username/topic prefix for generated rows.')
+        parser.add_argument('--password', default='scale12345', help='Password shared by generated learners.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; same seed gives the same data.')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per bulk_create.')
+        parser.add_argument('--flush', action='store_true',
+                            help='Delete rows from a previous run with the same prefix first.')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.chunk_size = options['chunk_size']
+        self.prefix = options['prefix']
+        self.today = timezone.localdate()
+
+        if options['words_per_plan'] > options['vocabulary']:
+            raise CommandError('--words-per-plan cannot exceed --vocabulary.')
+
+        if options['flush']:
+            self._flush()
+        elif User.objects.filter(username__startswith=f'{self.prefix}_').exists():
+            raise CommandError(f'Users prefixed "{self.prefix}_" already exist; use --flush or another --prefix.')
+
+        rows = self._read_csv(options['csv'])
+        started = time.perf_counter()
+
+        with transaction.atomic(), explicit_timestamps(
+            Vocabulary, LearningPlan, LearningProgress, PracticeSession, LearningNotification
+        ):
+            topic_ids = self._step('topics', self._create_topics, options['topics'])
+            vocab_ids = self._step('vocabulary', self._create_vocabulary, rows, options['vocabulary'], topic_ids)
+            user_ids = self._step('users', self._create_users, options['users'], options['password'])
+            plans = self._step('plans', self._create_plans, user_ids, options['plans_per_user'],
+                               options['days'], topic_ids)
+            self._step('plan vocabulary', self._create_plan_vocabulary, plans, vocab_ids,
+                       options['words_per_plan'])
+            self._step('progress', self._create_progress, plans)
+            self._step('practice', self._create_practice, plans, vocab_ids, options['practice_per_plan'])
+            self._step('notifications', self._create_notifications, user_ids, plans,
+                       options['notifications_per_user'])
+            # bulk_create and raw inserts skip the signals that keep ETags fresh
+            bump('topics', 'users', 'vocabularies', 'vocabulary_topics')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(user_ids)} learner(s) in {time.perf_counter() - started:.1f}s; '
+            f'log in as {self.prefix}_00000 / {options["password"]}.'
+        ))
+
+    def _step(self, label, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        count = result if isinstance(result, int) else len(result)
+        self.stdout.write(f'  {label}: {count} row(s) in {time.perf_counter() - started:.1f}s')
+        return result
+
+    def _bulk(self, model, objects):
+        """bulk_create in chunks; returns the number of rows written."""
+        total = 0
+        for chunk in chunked(objects, self.chunk_size):
+            model.objects.bulk_create(chunk, batch_size=self.chunk_size)
+            total += len(chunk)
+        return total
+
+    def _insert_rows(self, model, columns, rows):
+        """executemany straight into the table, skipping model instantiation."""
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(model._meta.get_field(name).column) for name in columns),
+            ', '.join(['%s'] * len(columns))
+        )
+        total = 0
+        with connection.cursor() as cursor:
+            for chunk in chunked(rows, self.chunk_size):
+                cursor.executemany(sql, chunk)
+                total += len(chunk)
+        return total
+
+    def _moment(self, day):
+        """A deterministic timestamp during the given day."""
+        seconds = self.rng.randrange(7 * 3600, 23 * 3600)
+        return timezone.make_aware(datetime.combine(day, dt_time()) + timedelta(seconds=seconds))
+
+    def _flush(self):
+        with deferred_bumps():
+            users = User.objects.filter(username__startswith=f'{self.prefix}_')
+            deleted, _ = users.delete()
+            Vocabulary.objects.filter(source='system', note__startswith=f'[{self.prefix}]').delete()
+            Topic.objects.filter(name__startswith=f'{self.prefix.title()} ').delete()
+        self.stdout.write(f'Flushed previous "{self.prefix}" data ({deleted} row(s) including cascades).')
+
+    def _read_csv(self, path):
+        try:
+            with open(path, encoding='utf-8-sig', newline='') as f:
+                rows = [row for row in csv.DictReader(f) if row.get('word') and row.get('meaning')]
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+        if not rows:
+            raise CommandError(f'{path} has no usable rows.')
+        return rows
+
+    def _create_topics(self, count):
+        Topic.objects.bulk_create([
+            Topic(name=f'{self.prefix.title()} Topic {i:03d}', description='Generated by seed_scale')
+            for i in range(count)
+        ])
+        return list(Topic.objects.filter(
+            name__startswith=f'{self.prefix.title()} Topic '
+        ).order_by('name').values_list('id', flat=True))
+
+    def _create_vocabulary(self, rows, count, topic_ids):
+        created = timezone.now() - timedelta(days=365)
+
+        def build():
+            for i in range(count):
+                row = rows[i % len(rows)]
+                variant = i // len(rows)
+                word = row['word'].strip()
+                word_type = (row.get('type') or '').strip().lower()
+                yield Vocabulary(
+                    # Later passes over the CSV mutate the word so rows stay distinct
+                    word=word if variant == 0 else f'{word}{variant}',
+                    meaning=row['meaning'].strip() if variant == 0 else f'{row["meaning"].strip()} ({variant})',
+                    meaning_vi=(row.get('meaning_vi') or '').strip() or None,
+                    phonetics=(row.get('phonetics') or '').strip() or None,
+                    word_type=word_type if word_type in WORD_TYPES else self.rng.choice(WORD_TYPES),
+                    note=f'[{self.prefix}]',
+                    example_sentence=(row.get('example') or '').strip() or None,
+                    level=LEVELS[variant % len(LEVELS)] if variant else ((row.get('level') or '').strip() or 'A1'),
+                    source='system',
+                    is_system=True,
+                    created_by_role='admin',
+                    created_at=created,
+                    updated_at=created,
+                )
+
+        self._bulk(Vocabulary, build())
+        vocab_ids = list(Vocabulary.objects.filter(
+            note=f'[{self.prefix}]'
+        ).order_by('id').values_list('id', flat=True))
+
+        if topic_ids:
+            def links():
+                for vocab_id in vocab_ids:
+                    for topic_id in self.rng.sample(topic_ids, min(len(topic_ids), self.rng.randint(1, 2))):
+                        yield VocabularyTopic(vocabulary_id=vocab_id, topic_id=topic_id)
+            self._bulk(VocabularyTopic, links())
+        return vocab_ids
+
+    def _create_users(self, count, password):
+        # Hash once: PBKDF2 per user would dominate the run time
+        hashed = make_password(password)
+        self._bulk(User, (
+            User(username=f'{self.prefix}_{i:05d}', email=f'{self.prefix}_{i:05d}@example.com',
+                 password=hashed, role='learner')
+            for i in range(count)
+        ))
+        return list(User.objects.filter(
+            username__startswith=f'{self.prefix}_'
+        ).order_by('username').values_list('id', flat=True))
+
+    def _create_plans(self, user_ids, per_user, days, topic_ids):
+        def build():
+            for user_id in user_ids:
+                for n in range(per_user):
+                    start = self.today - timedelta(days=self.rng.randint(days // 2, days))
+                    created = self._moment(start)
+                    yield LearningPlan(
+                        user_id=user_id,
+                        name=f'Plan {n + 1}',
+                        start_date=start,
+                        end_date=start + timedelta(days=self.rng.choice([30, 60, 90])),
+                        daily_study_time=self.rng.choice([10, 15, 20, 30]),
+                        status='active' if n == 0 else self.rng.choice(['active', 'paused', 'completed']),
+                        words_per_session=self.rng.choice([5, 10, 15]),
+                        selected_levels=self.rng.sample(LEVELS[:3], 2),
+                        created_at=created,
+                        updated_at=created,
+                    )
+
+        self._bulk(LearningPlan, build())
+        plans = list(LearningPlan.objects.filter(
+            user__username__startswith=f'{self.prefix}_'
+        ).order_by('id').values_list('id', 'user_id', 'start_date', 'words_per_session'))
+
+        if topic_ids:
+            through = LearningPlan.selected_topics.through
+            self._bulk(through, (
+                through(learningplan_id=plan_id, topic_id=topic_id)
+                for plan_id, *_ in plans
+                for topic_id in self.rng.sample(topic_ids, min(len(topic_ids), 3))
+            ))
+        return plans
+
+    def _create_plan_vocabulary(self, plans, vocab_ids, per_plan):
+        # This is the million-row table; raw tuples are several times faster than models
+        now = timezone.now()
+        reviewed_at = [
+            connection.ops.adapt_datetimefield_value(now - timedelta(hours=hours))
+            for hours in range(1, 24 * 30 + 1)
+        ]
+
+        def build():
+            for plan_id, _, start, _ in plans:
+                for vocab_id in self.rng.sample(vocab_ids, per_plan):
+                    status = self.rng.choice(PLAN_STATUSES)
+                    if status == 'new':
+                        yield (plan_id, vocab_id, status, None, 0)
+                    else:
+                        yield (plan_id, vocab_id, status, self.rng.choice(reviewed_at), self.rng.randint(1, 8))
+
+        return self._insert_rows(
+            LearningPlanVocabulary,
+            ['learning_plan', 'vocabulary', 'status', 'last_reviewed_at', 'review_count'],
+            build()
+        )
+
+    def _create_progress(self, plans):
+        def build():
+            for plan_id, user_id, start, per_session in plans:
+                day = start
+                while day <= self.today:
+                    studied = 0 if self.rng.random() < 0.2 else self.rng.randint(1, per_session * 2)
+                    if studied >= per_session:
+                        status = 'completed'
+                    else:
+                        status = 'missed' if day < self.today else 'upcoming'
+                    stamp = self._moment(day)
+                    yield LearningProgress(
+                        user_id=user_id,
+                        learning_plan_id=plan_id,
+                        date=day,
+                        words_studied=studied,
+                        words_mastered=self.rng.randint(0, studied),
+                        words_review_required=self.rng.randint(0, max(0, studied // 3)),
+                        study_time_minutes=studied * self.rng.randint(1, 3),
+                        planned_words=per_session,
+                        status=status,
+                        created_at=stamp,
+                        updated_at=stamp,
+                    )
+                    day += timedelta(days=1)
+
+        return self._bulk(LearningProgress, build())
+
+    def _create_practice(self, plans, vocab_ids, per_plan):
+        def build():
+            for plan_id, user_id, start, per_session in plans:
+                for _ in range(per_plan):
+                    words = self.rng.sample(vocab_ids, per_session)
+                    results = []
+                    for vocab_id in words:
+                        correct = self.rng.random() < 0.7
+                        results.append({
+                            'vocabulary_id': vocab_id,
+                            'user_answer': '' if correct else 'guess',
+                            'correct': correct,
+                            'self_evaluation': self.rng.choice(PLAN_STATUSES[5:]),
+                            'time_spent': round(self.rng.uniform(1.5, 20.0), 1),
+                        })
+                    yield PracticeSession(
+                        user_id=user_id,
+                        learning_plan_id=plan_id,
+                        practice_type=self.rng.choice(PRACTICE_TYPES),
+                        total_questions=len(results),
+                        correct_answers=sum(1 for r in results if r['correct']),
+                        results=results,
+                        duration_seconds=int(sum(r['time_spent'] for r in results)),
+                        created_at=self._moment(start + timedelta(days=self.rng.randint(0, (self.today - start).days))),
+                    )
+
+        return self._bulk(PracticeSession, build())
+
+    def _create_notifications(self, user_ids, plans, per_user):
+        plan_by_user = {}
+        for plan_id, user_id, *_ in plans:
+            plan_by_user.setdefault(user_id, plan_id)
+
+        def build():
+            for user_id in user_ids:
+                for n in range(per_user):
+                    age = self.rng.randint(0, 30)
+                    yield LearningNotification(
+                        user_id=user_id,
+                        notification_type=self.rng.choice(NOTIFICATION_TYPES),
+                        title=f'Notification {n + 1}',
+                        message='Generated by seed_scale',
+                        learning_plan_id=plan_by_user.get(user_id),
+                        # Older history has been read; the last few days are still unread
+                        is_read=age > 3,
+                        created_at=self._moment(self.today - timedelta(days=age)),
+                    )
+
+        created = self._bulk(LearningNotification, build())
+        # bulk_create skips the signals that keep unread counters in step
+        NotificationReadState.recount(*user_ids)
+        return created
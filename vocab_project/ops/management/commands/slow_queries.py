@@ -0,0 +1,105 @@
+import json
+import os
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ops.slow_queries import slow_query_options
+
+
+def full_scans(plan):
+    """
+    Tables the plan walks end to end. SQLite reports index lookups as SEARCH;
+    SCAN (even "SCAN t USING INDEX i", which only supplies ordering) visits
+    every row and usually means a WHERE or JOIN column lacks an index.
+    """
+    scans = []
+    for line in plan or []:
+        words = line.split()
+        if len(words) >= 2 and words[0] == 'SCAN' and words[1] != 'CONSTANT':
+            scans.append(words[1])
+    return scans
+
+
+class Command(BaseCommand):
+    help = 'Aggregate the slow-query log by SQL fingerprint.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help='Log file (defaults to SLOW_QUERY_LOG["PATH"]); rotated files are included.')
+        parser.add_argument('--top', type=int, default=20, help='Fingerprints to show, by total time.')
+        parser.add_argument('--table', action='append', default=[],
+                            help='Only fingerprints touching this table (repeatable).')
+        parser.add_argument('--json', action='store_true', help='Print the aggregate as JSON.')
+
+    def handle(self, *args, **options):
+        settings_options = slow_query_options()
+        path = options['path'] or str(settings_options['PATH'])
+        files = [path] + [f'{path}.{n}' for n in range(1, settings_options['BACKUP_COUNT'] + 1)]
+        files = [f for f in files if os.path.exists(f)]
+        if not files:
+            raise CommandError(f'No slow-query log at {path}.')
+
+        groups = {}
+        for filename in files:
+            with open(filename, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if options['table'] and not set(options['table']) & set(entry.get('tables', [])):
+                        continue
+                    self._add(groups, entry)
+
+        rows = sorted(groups.values(), key=lambda g: g['total_ms'], reverse=True)[:options['top']]
+        for row in rows:
+            row['mean_ms'] = round(row['total_ms'] / row['count'], 2)
+            row['total_ms'] = round(row['total_ms'], 2)
+            row['views'] = dict(row['views'].most_common(5))
+            row['full_scans'] = full_scans(row['worst_plan'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        if not rows:
+            self.stdout.write('No matching slow queries.')
+            return
+        for rank, row in enumerate(rows, start=1):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'#{rank} {row["fingerprint"]}  {row["count"]} quer{"y" if row["count"] == 1 else "ies"}, '
+                f'total {row["total_ms"]} ms, mean {row["mean_ms"]} ms, max {row["max_ms"]} ms'
+            ))
+            self.stdout.write(f'   tables: {", ".join(row["tables"]) or "-"}')
+            for view, count in row['views'].items():
+                self.stdout.write(f'   view:   {view} ({count})')
+            self.stdout.write(f'   sql:    {row["normalized"]}')
+            if row['worst_stack']:
+                self.stdout.write(f'   from:   {row["worst_stack"][-1]}')
+            for line in row['worst_plan'] or []:
+                self.stdout.write(f'   plan:   {line}')
+            if row['full_scans']:
+                self.stdout.write(self.style.WARNING(f'   full scan of: {", ".join(row["full_scans"])}'))
+            self.stdout.write('')
+
+    @staticmethod
+    def _add(groups, entry):
+        group = groups.get(entry['fingerprint'])
+        if group is None:
+            group = groups[entry['fingerprint']] = {
+                'fingerprint': entry['fingerprint'],
+                'normalized': entry['normalized'],
+                'tables': entry.get('tables', []),
+                'count': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'views': Counter(),
+                'worst_plan': None,
+                'worst_stack': [],
+            }
+        group['count'] += 1
+        group['total_ms'] += entry['duration_ms']
+        group['views'][entry.get('view') or '<no view>'] += 1
+        if entry['duration_ms'] >= group['max_ms']:
+            group['max_ms'] = entry['duration_ms']
+            group['worst_plan'] = entry.get('plan')
+            group['worst_stack'] = entry.get('stack', [])
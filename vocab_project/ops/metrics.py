@@ -0,0 +1,312 @@
+"""
+Prometheus text-format metrics without prometheus_client.
+
+Each process keeps its samples in memory. When METRICS['DIR'] is set (one
+shared directory per deployment, as with gunicorn workers), each process also
+writes a snapshot to <DIR>/<pid>.json at most every FLUSH_INTERVAL seconds.
+/metrics then merges every snapshot in the directory, so counters and
+histograms add up across workers. Files from exited workers are kept so
+counters never go backwards; clear the directory when the service restarts.
+"""
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'TOKEN': '',
+    'DIR': None,
+    'FLUSH_INTERVAL': 1.0,
+}
+
+
+def metrics_options():
+    options = dict(DEFAULTS)
+    options.update(getattr(settings, 'METRICS', {}))
+    return options
+
+
+class Metric:
+    type = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.samples = {}
+        self._lock = registry.lock
+        registry.register(self)
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def describe(self):
+        return {'type': self.type, 'help': self.documentation, 'labelnames': list(self.labelnames)}
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(registry, name, documentation, labelnames)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # [count per bucket..., +Inf count, sum]
+            sample = self.samples.get(key)
+            if sample is None:
+                sample = self.samples[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    sample[i] += 1
+                    break
+            else:
+                sample[len(self.buckets)] += 1
+            sample[-1] += value
+
+    def describe(self):
+        return dict(super().describe(), buckets=list(self.buckets))
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self._last_flush = 0.0
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: dict(metric.describe(), samples=[
+                    [list(key), list(value) if isinstance(value, list) else value]
+                    for key, value in metric.samples.items()
+                ])
+                for name, metric in self.metrics.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            for metric in self.metrics.values():
+                metric.samples.clear()
+
+    def maybe_flush(self, force=False):
+        """Write this process's snapshot to the shared directory when due."""
+        options = metrics_options()
+        directory = options['DIR']
+        if not directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < options['FLUSH_INTERVAL']:
+            return
+        self._last_flush = now
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{os.getpid()}.json')
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+
+    def collect(self):
+        """Snapshots from every process (or just this one) merged into one."""
+        directory = metrics_options()['DIR']
+        if not directory:
+            return self.snapshot()
+        self.maybe_flush(force=True)
+        merged = {}
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, family in snapshot.items():
+                target = merged.setdefault(name, dict(family, samples={}))
+                for key, value in family['samples']:
+                    key = tuple(key)
+                    if isinstance(value, list):
+                        current = target['samples'].get(key, [0] * len(value))
+                        target['samples'][key] = [a + b for a, b in zip(current, value)]
+                    else:
+                        target['samples'][key] = target['samples'].get(key, 0) + value
+        for family in merged.values():
+            family['samples'] = [[list(k), v] for k, v in family['samples'].items()]
+        return merged
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(families):
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        names = family['labelnames']
+        lines.append(f'# HELP {name} {family["help"]}')
+        lines.append(f'# TYPE {name} {family["type"]}')
+        for key, value in sorted(family['samples'], key=lambda sample: sample[0]):
+            if family['type'] == 'histogram':
+                cumulative = 0
+                for bound, count in zip(family['buckets'] + [math.inf], value[:-1]):
+                    cumulative += count
+                    le = 'le="%s"' % _number(float(bound))
+                    lines.append(f'{name}_bucket{_labels(names, key, [le])} {cumulative}')
+                lines.append(f'{name}_sum{_labels(names, key)} {_number(value[-1])}')
+                lines.append(f'{name}_count{_labels(names, key)} {cumulative}')
+            else:
+                lines.append(f'{name}{_labels(names, key)} {_number(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def cache_hit_ratios(families):
+    """Derived gauge: hits / (hits + misses) per cache."""
+    totals = {}
+    for (cache, result), value in families.get('cache_requests_total', {}).get('samples', []):
+        hits, total = totals.get(cache, (0, 0))
+        totals[cache] = (hits + (value if result == 'hit' else 0), total + value)
+    return {
+        'type': 'gauge',
+        'help': 'Share of cache lookups that were hits.',
+        'labelnames': ['cache'],
+        'samples': [[[cache], hits / total] for cache, (hits, total) in totals.items() if total],
+    }
+
+
+registry = Registry()
+
+REQUESTS = Counter(registry, 'http_requests_total', 'DRF requests by route, method and status.',
+                   ['route', 'method', 'status'])
+LATENCY = Histogram(registry, 'http_request_duration_seconds', 'DRF view dispatch latency.',
+                    ['route', 'method'])
+DB_QUERIES = Histogram(registry, 'db_queries_per_request', 'Database queries per DRF request.',
+                       ['route', 'method'], buckets=QUERY_BUCKETS)
+DB_DURATION = Histogram(registry, 'db_query_duration_seconds', 'Time spent in the database per DRF request.',
+                        ['route', 'method'])
+CACHE_REQUESTS = Counter(registry, 'cache_requests_total', 'In-process cache lookups by result.',
+                         ['cache', 'result'])
+IMPORT_ROWS = Counter(registry, 'import_rows_total', 'Rows processed by CSV vocabulary imports.',
+                      ['kind', 'outcome'])
+IMPORT_DURATION = Histogram(registry, 'import_duration_seconds', 'CSV vocabulary import duration.',
+                            ['kind'], buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300))
+ANALYTICS_DURATION = Histogram(registry, 'analytics_duration_seconds', 'AnalyticsService call duration.',
+                               ['operation'])
+
+
+def enabled():
+    return metrics_options()['ENABLED']
+
+
+def record_cache(cache, hit):
+    if enabled():
+        CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def record_import(kind, created, updated, errors, seconds):
+    if not enabled():
+        return
+    IMPORT_ROWS.inc(created, kind=kind, outcome='created')
+    IMPORT_ROWS.inc(updated, kind=kind, outcome='updated')
+    IMPORT_ROWS.inc(errors, kind=kind, outcome='error')
+    IMPORT_DURATION.observe(seconds, kind=kind)
+    registry.maybe_flush()
+
+
+def timed(operation):
+    """Decorator observing a function's duration on ANALYTICS_DURATION."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                ANALYTICS_DURATION.observe(time.perf_counter() - started, operation=operation)
+        return wrapper
+    return decorator
+
+
+_dispatch_patched = False
+
+
+def patch_view_dispatch():
+    """Record request, latency and DB metrics around every DRF APIView.dispatch."""
+    global _dispatch_patched
+    if _dispatch_patched:
+        return
+    from rest_framework.views import APIView
+    from .instrumentation import route_pattern
+
+    original = APIView.dispatch
+
+    def dispatch(self, request, *args, **kwargs):
+        if not enabled():
+            return original(self, request, *args, **kwargs)
+        stats = {'queries': 0, 'seconds': 0.0}
+
+        def count_queries(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                stats['queries'] += 1
+                stats['seconds'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        status = 500
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(count_queries))
+                response = original(self, request, *args, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            route = route_pattern(request)
+            REQUESTS.inc(route=route, method=request.method, status=status)
+            LATENCY.observe(time.perf_counter() - started, route=route, method=request.method)
+            DB_QUERIES.observe(stats['queries'], route=route, method=request.method)
+            DB_DURATION.observe(stats['seconds'], route=route, method=request.method)
+            registry.maybe_flush()
+
+    APIView.dispatch = dispatch
+    _dispatch_patched = True
@@ -0,0 +1,185 @@
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from accounts.authentication import get_user_for_token
+from .instrumentation import (
+    RequestMetrics, install_query_counter, patch_serializer_timing, route_label, route_stats,
+)
+from .profiling import arun_profiled, profile_store, profiling_options, run_profiled
+
+logger = logging.getLogger('ops.requests')
+
+
+def instrumentation_options():
+    return getattr(settings, 'REQUEST_INSTRUMENTATION', {})
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Opt-in per-request instrumentation.
+    Records query count, DB time, serializer time, view time and total time,
+    emits them as a Server-Timing header and a structured log line, and feeds
+    the per-route percentiles served by /api/ops/route-stats/.
+    Removed from the stack entirely unless REQUEST_INSTRUMENTATION['ENABLED'].
+    Runs in either handler mode, so ASGI requests reach async views unadapted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        options = instrumentation_options()
+        if not options.get('ENABLED', False):
+            raise MiddlewareNotUsed('Request instrumentation is disabled.')
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.log = options.get('LOG', True)
+        route_stats.samples_per_route = options.get('SAMPLES_PER_ROUTE', 1000)
+        patch_serializer_timing(time.perf_counter)
+        connection_created.connect(install_query_counter, dispatch_uid='ops.instrumentation')
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(None, connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = metrics.activate()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            RequestMetrics.deactivate(token)
+        return self._finish(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = metrics.activate()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            RequestMetrics.deactivate(token)
+        return self._finish(request, response, metrics, started)
+
+    def _finish(self, request, response, metrics, started):
+        finished = time.perf_counter()
+        total_ms = (finished - started) * 1000
+        view_started = getattr(request, '_ops_view_started', started)
+        view_ms = (finished - view_started) * 1000
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.db_ms:.1f};desc="{metrics.queries} queries"',
+            f'serializer;dur={metrics.serializer_ms:.1f}',
+            f'view;dur={view_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+
+        route = route_label(request)
+        route_stats.record(route, total_ms, metrics.db_ms, metrics.queries)
+        if self.log:
+            logger.info(json.dumps({
+                'route': route,
+                'path': request.path,
+                'status': response.status_code,
+                'queries': metrics.queries,
+                'db_ms': round(metrics.db_ms, 2),
+                'serializer_ms': round(metrics.serializer_ms, 2),
+                'view_ms': round(view_ms, 2),
+                'total_ms': round(total_ms, 2),
+            }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._ops_view_started = time.perf_counter()
+
+
+class RequestProfilingMiddleware:
+    """
+    Profiles a single request when an admin asks for it.
+    Triggered by the REQUEST_PROFILING header (X-Profile: 1) or query flag
+    (?_profile=1). The view runs under cProfile with a stack sampler alongside,
+    and the result is saved to the on-disk ring buffer listed at
+    /api/ops/profiles/. For anyone who is not an admin the flag is ignored and
+    the response is untouched. Unflagged requests pass straight through in
+    either handler mode.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        options = profiling_options()
+        if not options['ENABLED']:
+            raise MiddlewareNotUsed('Request profiling is disabled.')
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.header = 'HTTP_' + options['HEADER'].upper().replace('-', '_')
+        self.query_param = options['QUERY_PARAM']
+        self.interval = options['SAMPLE_INTERVAL']
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        admin = self._requested(request) and self._admin(request)
+        if not admin:
+            return self.get_response(request)
+
+        response, profiler, sampler, elapsed = run_profiled(
+            lambda: self.get_response(request), self.interval
+        )
+        return self._save(request, response, profiler, sampler, elapsed, admin)
+
+    async def __acall__(self, request):
+        # The user lookup may query the session or token tables, so it runs on the sync side
+        admin = self._requested(request) and await sync_to_async(self._admin)(request)
+        if not admin:
+            return await self.get_response(request)
+
+        response, profiler, sampler, elapsed = await arun_profiled(
+            lambda: self.get_response(request), self.interval
+        )
+        return self._save(request, response, profiler, sampler, elapsed, admin)
+
+    def _save(self, request, response, profiler, sampler, elapsed, user):
+        profile_id = profile_store().save(profiler, sampler, {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'duration_ms': round(elapsed, 2),
+            'requested_by': user.username,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        })
+        response['X-Profile-Id'] = profile_id
+        return response
+
+    def _requested(self, request):
+        return request.META.get(self.header, '') == '1' or request.GET.get(self.query_param) == '1'
+
+    @staticmethod
+    def _user(request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user
+        # API clients authenticate with a token that DRF only checks inside the view
+        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+        if auth_header.startswith('Token '):
+            return get_user_for_token(auth_header.split(' ')[1])
+        token_key = request.COOKIES.get('auth_token')
+        return get_user_for_token(token_key) if token_key else None
+
+    def _admin(self, request):
+        """The requesting admin, or None."""
+        user = self._user(request)
+        if user is not None and user.is_authenticated and user.is_admin():
+            return user
+        return None
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:28
+
+from django.db import migrations, models
+
+
+def create_versions(apps, schema_editor):
+    TableVersion = apps.get_model('ops', 'TableVersion')
+    TableVersion.objects.bulk_create([
+        TableVersion(table=table) for table in ['topics', 'users', 'vocabularies', 'vocabulary_topics']
+    ])
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('table', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'ops_table_versions',
+            },
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
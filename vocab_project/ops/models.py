@@ -0,0 +1,13 @@
+from django.db import models
+
+
+class TableVersion(models.Model):
+    """Write counter per table; see ops.conditional."""
+    table = models.CharField(max_length=64, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'ops_table_versions'
+
+    def __str__(self):
+        return f'{self.table} v{self.version}'
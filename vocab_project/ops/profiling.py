@@ -0,0 +1,153 @@
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+
+PROFILE_ID = re.compile(r'^[0-9A-Za-z-]+$')
+
+DEFAULTS = {
+    'ENABLED': True,
+    'HEADER': 'X-Profile',
+    'QUERY_PARAM': '_profile',
+    'DIR': None,
+    'MAX_PROFILES': 50,
+    'SAMPLE_INTERVAL': 0.001,
+}
+
+
+def profiling_options():
+    options = dict(DEFAULTS)
+    options.update(getattr(settings, 'REQUEST_PROFILING', {}))
+    if options['DIR'] is None:
+        options['DIR'] = Path(settings.BASE_DIR) / 'profiles'
+    return options
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack on a timer and counts collapsed stacks.
+    Runs beside cProfile so each profile also has a flame-graph friendly
+    "outer;inner count" view, which pstats cannot reconstruct.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='ops-stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(names))] += 1
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Bounded on-disk ring buffer of request profiles (oldest evicted first)."""
+
+    def __init__(self, directory, max_profiles):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def path(self, profile_id, kind):
+        if not PROFILE_ID.match(profile_id):
+            raise FileNotFoundError(profile_id)
+        suffix = {'pstats': '.prof', 'collapsed': '.collapsed.txt', 'meta': '.json'}[kind]
+        return self.directory / f'{profile_id}{suffix}'
+
+    def save(self, profiler, sampler, meta):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Time-ordered ids so listing and eviction are a plain sort
+        profile_id = f'{datetime.now().strftime("%Y%m%dT%H%M%S%f")}-{uuid.uuid4().hex[:6]}'
+        profiler.dump_stats(str(self.path(profile_id, 'pstats')))
+        self.path(profile_id, 'collapsed').write_text(sampler.collapsed())
+        meta = dict(meta, id=profile_id, samples=sum(sampler.stacks.values()))
+        self.path(profile_id, 'meta').write_text(json.dumps(meta))
+        self._evict()
+        return profile_id
+
+    def list(self):
+        entries = []
+        for meta_path in sorted(self.directory.glob('*.json'), reverse=True):
+            try:
+                entries.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                continue  # evicted or half-written by another worker
+        return entries
+
+    def _evict(self):
+        ids = sorted(p.name[:-len('.json')] for p in self.directory.glob('*.json'))
+        for profile_id in ids[:max(0, len(ids) - self.max_profiles)]:
+            for kind in ('meta', 'pstats', 'collapsed'):
+                try:
+                    self.path(profile_id, kind).unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def profile_store():
+    options = profiling_options()
+    return ProfileStore(options['DIR'], options['MAX_PROFILES'])
+
+
+def run_profiled(func, interval):
+    """Call func() under cProfile and the stack sampler; returns (result, profiler, sampler, ms)."""
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident(), interval)
+    sampler.start()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        result = func()
+    finally:
+        profiler.disable()
+        elapsed = (time.perf_counter() - started) * 1000
+        sampler.stop()
+    return result, profiler, sampler, elapsed
+
+
+async def arun_profiled(func, interval):
+    """
+    Async run_profiled: awaits func() with the profiler on the event loop thread.
+    Other tasks that run on the loop meanwhile are profiled too, and queries the
+    view hands to sync_to_async show up as time spent waiting.
+    """
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident(), interval)
+    sampler.start()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        result = await func()
+    finally:
+        profiler.disable()
+        elapsed = (time.perf_counter() - started) * 1000
+        sampler.stop()
+    return result, profiler, sampler, elapsed
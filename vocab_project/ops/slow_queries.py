@@ -0,0 +1,213 @@
+"""
+Slow-query log.
+
+A database execute wrapper, attached to every new connection, times each
+query. Queries over SLOW_QUERY_LOG['THRESHOLD_MS'] are written as one JSON
+line to a rotating file together with their EXPLAIN (QUERY PLAN on SQLite)
+output, a normalized fingerprint, the view that issued them and a short
+stack summary of project frames. `manage.py slow_queries` aggregates the
+file by fingerprint.
+"""
+import contextvars
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import re
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+DEFAULTS = {
+    'ENABLED': False,
+    'THRESHOLD_MS': 100,
+    'PATH': None,
+    'MAX_BYTES': 10 * 1024 * 1024,
+    'BACKUP_COUNT': 5,
+    'EXPLAIN': True,
+    'STACK_DEPTH': 6,
+}
+
+_current_view = contextvars.ContextVar('ops_slow_query_view', default=None)
+_explaining = threading.local()
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+_TABLE = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+def slow_query_options():
+    options = dict(DEFAULTS)
+    options.update(getattr(settings, 'SLOW_QUERY_LOG', {}))
+    if options['PATH'] is None:
+        options['PATH'] = Path(settings.BASE_DIR) / 'logs' / 'slow_queries.jsonl'
+    return options
+
+
+def normalize(sql):
+    """SQL with literals and placeholder lists collapsed, for grouping."""
+    sql = sql.replace('%s', '?')
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def fingerprint(sql):
+    return hashlib.sha1(normalize(sql).encode()).hexdigest()[:12]
+
+
+def tables(sql):
+    return sorted(set(_TABLE.findall(sql)))
+
+
+def stack_summary(depth):
+    """Innermost project frames (outside site-packages and this module)."""
+    base = str(settings.BASE_DIR)
+    frames = [
+        f'{os.path.relpath(frame.filename, base)}:{frame.lineno} in {frame.name}'
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(base) and 'site-packages' not in frame.filename
+        and not frame.filename.endswith(('slow_queries.py', 'metrics.py', 'middleware.py'))
+    ]
+    return frames[-depth:]
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def get_logger(options):
+    """A dedicated logger writing bare JSON lines to a rotating file."""
+    global _logger
+    with _logger_lock:
+        path = str(options['PATH'])
+        if _logger is not None and _logger.path == path:
+            return _logger
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        logger = logging.getLogger('ops.slow_queries')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=options['MAX_BYTES'], backupCount=options['BACKUP_COUNT'], encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.path = path
+        _logger = logger
+        return logger
+
+
+def explain(connection, sql, params):
+    """EXPLAIN output as a list of lines, or None when it cannot be produced."""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    prefix = 'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+    _explaining.active = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            rows = cursor.fetchall()
+    except Exception as exc:  # plan capture must never break the real query
+        return [f'EXPLAIN failed: {exc}']
+    finally:
+        _explaining.active = False
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [' '.join(str(col) for col in row) for row in rows]
+
+
+class SlowQueryLogger:
+    """Execute wrapper that records queries slower than the threshold."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_explaining, 'active', False):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            options = slow_query_options()
+            if options['ENABLED'] and elapsed_ms >= options['THRESHOLD_MS']:
+                self.record(sql, params, many, elapsed_ms, options)
+
+    def record(self, sql, params, many, elapsed_ms, options):
+        entry = {
+            'at': timezone.now().isoformat(),
+            'duration_ms': round(elapsed_ms, 2),
+            'fingerprint': fingerprint(sql),
+            'normalized': normalize(sql),
+            'sql': sql,
+            'many': many,
+            'tables': tables(sql),
+            'view': _current_view.get(),
+            'stack': stack_summary(options['STACK_DEPTH']),
+            'plan': None,
+        }
+        if options['EXPLAIN'] and not many:
+            entry['plan'] = explain(self.connection, sql, params)
+        get_logger(options).info(json.dumps(entry, default=str))
+
+
+def install(sender, connection, **kwargs):
+    """connection_created receiver: attach the wrapper once per connection."""
+    if not any(isinstance(wrapper, SlowQueryLogger) for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.append(SlowQueryLogger(connection))
+
+
+class SlowQueryViewMiddleware:
+    """
+    Remembers which view is running so slow queries can name it. Works in
+    either handler mode: the context variable follows async views into the
+    sync_to_async threads that run their queries.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not slow_query_options()['ENABLED']:
+            raise MiddlewareNotUsed('Slow-query log is disabled.')
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _current_view.set(None)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_view.reset(token)
+
+    async def __acall__(self, request):
+        token = _current_view.set(None)
+        try:
+            return await self.get_response(request)
+        finally:
+            _current_view.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'cls', None) or view_func
+        actions = getattr(view_func, 'actions', None) or {}
+        action = actions.get(request.method.lower())
+        name = f'{view.__module__}.{view.__qualname__}'
+        _current_view.set(f'{name}.{action}' if action else name)
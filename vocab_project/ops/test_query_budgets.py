@@ -0,0 +1,387 @@
+"""
+Query-count regression suite for the JSON API.
+
+Every route in the learning, vocabulary, topics and accounts URLconfs is hit
+against a small and a large fixture. Each request is counted cold, with every
+cache emptied first, and GETs are counted again warm. A route passes when both
+counts are the same at both sizes (no N+1) and do not exceed the budgets checked
+in to query_budgets.json. Failures print the SQL captured on the large fixture.
+Every route and method the resolver serves under those prefixes must be listed
+in ROUTES or SKIPPED.
+
+After an intentional change, regenerate the budgets with:
+    UPDATE_QUERY_BUDGETS=1 python manage.py test ops.test_query_budgets
+"""
+import json
+import os
+import re
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, resolve
+from rest_framework.test import APITestCase, APIClient
+from rest_framework.authtoken.models import Token
+
+from accounts.authentication import token_cache
+from learning.models import (
+    LearningPlan, LearningPlanVocabulary, LearningNotification, PracticeSession
+)
+from topics.models import Topic
+from vocabulary.models import Vocabulary, VocabularyTopic
+from .instrumentation import route_template
+
+User = get_user_model()
+
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'query_budgets.json')
+
+SMALL = 2
+LARGE = 8
+
+API_PREFIXES = ('/api/auth/', '/api/vocabulary/', '/api/topics/', '/api/learning/')
+
+# (name, client, method, path, data, format). Each request is counted cold;
+# GETs run again and the warm repeat is counted too, without one-off work
+# such as the token lookup or analytics row creation.
+ROUTES = [
+    # accounts
+    ('accounts:profile', 'learner', 'get', '/api/auth/profile/', None, None),
+    ('accounts:users-list', 'admin', 'get', '/api/auth/users/', None, None),
+    ('accounts:users-detail', 'admin', 'get', '/api/auth/users/{other_id}/', None, None),
+    ('accounts:users-active', 'admin', 'get', '/api/auth/users/active_users/', None, None),
+    # topics
+    ('topics:list', 'learner', 'get', '/api/topics/', None, None),
+    ('topics:list-admin', 'admin', 'get', '/api/topics/', None, None),
+    ('topics:detail', 'learner', 'get', '/api/topics/{topic_id}/', None, None),
+    # vocabulary
+    ('vocabulary:list', 'learner', 'get', '/api/vocabulary/', None, None),
+    ('vocabulary:list-admin', 'admin', 'get', '/api/vocabulary/', None, None),
+    ('vocabulary:detail', 'learner', 'get', '/api/vocabulary/{personal_vocab_id}/', None, None),
+    ('vocabulary:system', 'admin', 'get', '/api/vocabulary/system/', None, None),
+    ('vocabulary:system-detail', 'admin', 'get', '/api/vocabulary/system/{vocab_id}/', None, None),
+    ('vocabulary:personal', 'learner', 'get', '/api/vocabulary/personal/', None, None),
+    ('vocabulary:by-topic', 'admin', 'get', '/api/vocabulary/by_topic/?topic_id={topic_id}', None, None),
+    ('vocabulary:changes', 'learner', 'get', '/api/vocabulary/changes/', None, None),
+    ('vocabulary:changes-admin', 'admin', 'get', '/api/vocabulary/changes/', None, None),
+    # learning plans
+    ('learning:plans-list', 'learner', 'get', '/api/learning/plans/', None, None),
+    ('learning:plans-detail', 'learner', 'get', '/api/learning/plans/{plan_id}/', None, None),
+    ('learning:plans-vocabulary', 'learner', 'get', '/api/learning/plans/{plan_id}/vocabulary/', None, None),
+    ('learning:plans-flashcards', 'learner', 'get', '/api/learning/plans/{plan_id}/flashcards/', None, None),
+    ('learning:plans-deck', 'learner', 'get', '/api/learning/plans/{plan_id}/deck/', None, None),
+    ('learning:plans-progress', 'learner', 'get', '/api/learning/plans/{plan_id}/progress/', None, None),
+    # practice, analytics, notifications, dashboard
+    ('learning:practice-list', 'learner', 'get', '/api/learning/practice/', None, None),
+    ('learning:practice-detail', 'learner', 'get', '/api/learning/practice/{practice_id}/', None, None),
+    ('learning:analytics', 'learner', 'get', '/api/learning/analytics/', None, None),
+    ('learning:analytics-plan', 'learner', 'get', '/api/learning/analytics/plans/{plan_id}/', None, None),
+    ('learning:analytics-streak', 'learner', 'get', '/api/learning/analytics/streak/', None, None),
+    ('learning:analytics-risk', 'learner', 'get', '/api/learning/analytics/risk/', None, None),
+    ('learning:notifications-list', 'learner', 'get', '/api/learning/notifications/', None, None),
+    ('learning:notifications-detail', 'learner', 'get', '/api/learning/notifications/{notification_id}/', None, None),
+    ('learning:notifications-unread', 'learner', 'get', '/api/learning/notifications/unread_count/', None, None),
+    ('learning:dashboard', 'learner', 'get', '/api/learning/dashboard/', None, None),
+    ('learning:async-flashcards', 'learner', 'get', '/api/learning/async/plans/{plan_id}/flashcards/', None, None),
+    ('learning:async-progress', 'learner', 'get', '/api/learning/async/plans/{plan_id}/progress/', None, None),
+    ('learning:async-summary', 'learner', 'get', '/api/learning/async/analytics/summary/', None, None),
+    ('learning:async-unread', 'learner', 'get', '/api/learning/async/notifications/unread_count/', None, None),
+    # writes whose cost must not depend on how much data the user has
+    ('accounts:login', 'anon', 'post', '/api/auth/login/',
+     {'username': 'learner', 'password': 'learner123'}, 'json'),
+    ('accounts:users-assign-role', 'admin', 'post', '/api/auth/users/{other_id}/assign_role/',
+     {'role': 'learner'}, 'json'),
+    ('accounts:users-deactivate', 'admin', 'post', '/api/auth/users/{other_id}/deactivate/', None, 'json'),
+    ('accounts:users-activate', 'admin', 'post', '/api/auth/users/{other_id}/activate/', None, 'json'),
+    ('accounts:users-create', 'admin', 'post', '/api/auth/users/',
+     {'username': 'created', 'email': 'created@test.com', 'password': 'created123', 'role': 'learner'}, 'json'),
+    ('accounts:users-update', 'admin', 'put', '/api/auth/users/{other_id}/',
+     {'username': 'other', 'email': 'other@test.com', 'role': 'learner', 'is_active': True}, 'json'),
+    ('accounts:users-partial-update', 'admin', 'patch', '/api/auth/users/{other_id}/',
+     {'first_name': 'Other'}, 'json'),
+    ('accounts:profile-update', 'learner', 'put', '/api/auth/profile/',
+     {'username': 'learner', 'email': 'learner@test.com', 'first_name': 'Learner'}, 'json'),
+    ('accounts:profile-partial-update', 'learner', 'patch', '/api/auth/profile/', {'last_name': 'One'}, 'json'),
+    ('topics:create', 'admin', 'post', '/api/topics/', {'name': 'New topic', 'description': 'Fresh'}, 'json'),
+    ('topics:update', 'admin', 'put', '/api/topics/{topic_id}/', {'name': 'Topic 0', 'description': 'First'}, 'json'),
+    ('topics:partial-update', 'admin', 'patch', '/api/topics/{topic_id}/', {'description': 'Renamed'}, 'json'),
+    ('vocabulary:create', 'learner', 'post', '/api/vocabulary/',
+     {'word': 'fresh', 'meaning': 'new', 'level': 'A1', 'topic_ids': ['{topic_id}']}, 'multipart'),
+    ('vocabulary:update', 'learner', 'put', '/api/vocabulary/{personal_vocab_id}/',
+     {'word': 'personal0', 'meaning': 'updated', 'level': 'A1', 'topic_ids': ['{topic_id}']}, 'multipart'),
+    ('vocabulary:partial-update', 'learner', 'patch', '/api/vocabulary/{personal_vocab_id}/',
+     {'meaning': 'patched'}, 'multipart'),
+    ('vocabulary:update-status', 'learner', 'patch', '/api/vocabulary/{personal_vocab_id}/update_status/',
+     {'learning_status': 'learning'}, 'multipart'),
+    ('vocabulary:system-update', 'admin', 'put', '/api/vocabulary/system/{vocab_id}/',
+     {'word': 'system0', 'meaning': 'updated', 'level': 'A1', 'topic_ids': ['{topic_id}']}, 'multipart'),
+    ('vocabulary:system-partial-update', 'admin', 'patch', '/api/vocabulary/system/{vocab_id}/',
+     {'meaning': 'patched'}, 'multipart'),
+    ('vocabulary:bulk-set-level', 'admin', 'post', '/api/vocabulary/bulk/',
+     {'operation': 'set_level', 'filter': {'is_system': True}, 'level': 'B2'}, 'json'),
+    ('vocabulary:bulk-replace-topics', 'admin', 'post', '/api/vocabulary/bulk/',
+     {'operation': 'replace_topics', 'filter': {'is_system': True}, 'topic_ids': ['{topic_id}']}, 'json'),
+    ('learning:plans-update', 'learner', 'patch', '/api/learning/plans/{plan_id}/',
+     {'name': 'Renamed'}, 'json'),
+    ('learning:plans-replace', 'learner', 'put', '/api/learning/plans/{plan_id}/',
+     {'name': 'Plan 0', 'start_date': '{start_date}', 'end_date': '{end_date}', 'daily_study_time': 15,
+      'words_per_session': 10, 'status': 'active'}, 'json'),
+    ('learning:plans-vocabulary-status', 'learner', 'patch',
+     '/api/learning/plans/{plan_id}/vocabulary/{vocab_id}/status/', {'status': 'learned'}, 'json'),
+    ('learning:plans-start-session', 'learner', 'post', '/api/learning/plans/{plan_id}/start_session/', None, 'json'),
+    ('learning:plans-session', 'learner', 'get', '/api/learning/plans/{plan_id}/session/', None, None),
+    ('learning:plans-session-update', 'learner', 'patch', '/api/learning/plans/{plan_id}/session/',
+     {'state': {'current_index': 1}}, 'json'),
+    ('learning:plans-end-session', 'learner', 'post', '/api/learning/plans/{plan_id}/end_session/', None, 'json'),
+    ('learning:practice-start', 'learner', 'post', '/api/learning/practice/start/',
+     {'learning_plan_id': '{plan_id}', 'practice_type': 'flashcard', 'word_count': 2}, 'json'),
+    ('learning:practice-state', 'learner', 'get', '/api/learning/practice/state/', None, None),
+    ('learning:practice-state-answer', 'learner', 'patch', '/api/learning/practice/state/',
+     {'answer': {'position': 0, 'vocabulary_id': '{active_vocab_id}', 'user_answer': 'x', 'correct': True,
+                 'self_evaluation': 'learned'}}, 'json'),
+    ('learning:practice-complete', 'learner', 'post', '/api/learning/practice/{active_practice_id}/complete/',
+     {'results': [{'vocabulary_id': '{vocab_id}', 'correct': True, 'self_evaluation': 'learned'}],
+      'duration_seconds': 30}, 'json'),
+    ('learning:notifications-update', 'learner', 'put', '/api/learning/notifications/{notification_id}/',
+     {'is_read': False}, 'json'),
+    ('learning:notifications-partial-update', 'learner', 'patch',
+     '/api/learning/notifications/{notification_id}/', {'is_read': True}, 'json'),
+    ('learning:notifications-read', 'learner', 'patch', '/api/learning/notifications/{notification_id}/read/',
+     None, 'json'),
+    ('learning:notifications-mark-all-read', 'learner', 'post', '/api/learning/notifications/mark_all_read/',
+     None, 'json'),
+]
+
+# Routes deliberately left out ("METHOD /route/" as route_template writes it), with the
+# reason they cannot have a flat budget. Bulk delete on /api/vocabulary/bulk/ is
+# not budgeted either: it cascades through the collector, one batch per 500 rows.
+SKIPPED = {
+    'GET /api/auth/': "DRF router root, a static list of links",
+    'GET /api/learning/': "DRF router root, a static list of links",
+    'POST /api/auth/register/': 'creates the caller; covered by accounts.tests',
+    'POST /api/auth/logout/': 'deletes the caller\'s token; covered by accounts.tests',
+    'DELETE /api/auth/users/<pk>/': 'cascades through everything the user owns',
+    'DELETE /api/topics/<pk>/': 'cascades through the topic\'s vocabulary links',
+    'DELETE /api/vocabulary/<pk>/': 'cascades through plans that hold the word',
+    'DELETE /api/vocabulary/system/<pk>/': 'cascades through plans that hold the word',
+    'DELETE /api/vocabulary/system/<pk>/delete_vocabulary/': 'cascades through plans that hold the word',
+    'POST /api/vocabulary/import_csv/': 'cost is proportional to the uploaded file',
+    'POST /api/vocabulary/system/import_csv/': 'cost is proportional to the uploaded file',
+    'GET /api/vocabulary/export/': 'streams one topic query per chunk of rows; covered by vocabulary.tests',
+    'GET /api/vocabulary/system/export/': 'streams one topic query per chunk of rows; covered by vocabulary.tests',
+    'POST /api/learning/plans/': 'selects the plan\'s vocabulary, proportional to the data by design',
+    'DELETE /api/learning/plans/<pk>/': 'cascades through the plan\'s cards, progress and sessions',
+    'POST /api/learning/notifications/': 'not a client operation: notifications are created by learning.services',
+    'DELETE /api/learning/notifications/<pk>/': 'delete; covered by learning.tests',
+}
+
+
+def api_routes():
+    """
+    {"METHOD /route/"} for every view the resolver serves under API_PREFIXES.
+    Format-suffix aliases are left out, and so are patterns shadowed by an
+    earlier one with the same route, which never receive a request.
+    """
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, prefix + str(pattern.pattern))
+            else:
+                yield prefix + str(pattern.pattern), pattern.callback
+
+    seen = set()
+    routes = set()
+    for route, callback in walk(get_resolver().url_patterns, ''):
+        template = route_template(route)
+        if 'format>' in route or not template.startswith(API_PREFIXES) or template in seen:
+            continue
+        seen.add(template)
+        actions = getattr(callback, 'actions', None)
+        view_class = getattr(callback, 'cls', None)
+        if actions:
+            methods = actions
+        elif view_class is not None:
+            methods = [m for m in view_class.http_method_names if hasattr(view_class, m)]
+        else:
+            # learning.async_views: GET only, other methods get DRF's 405
+            methods = ['get']
+        routes.update(f'{method.upper()} {template}' for method in methods if method not in ('head', 'options'))
+    return routes
+
+
+def route_key(method, path):
+    """"METHOD /route/" for a ROUTES path; any id resolves to the same route."""
+    path = re.sub(r'\{\w+\}', '1', path.partition('?')[0])
+    return f'{method.upper()} {route_template(resolve(path).route)}'
+def load_budgets():
+    with open(BUDGETS_PATH) as f:
+        return json.load(f)
+
+
+# Changes are otherwise held back for a few seconds and the feed would be empty
+@override_settings(VOCABULARY_CHANGES={'SETTLE_SECONDS': 0})
+class QueryBudgetTests(APITestCase):
+    """Test suite for per-route query budgets"""
+
+    def _build(self, size):
+        """Create a dataset where every collection has ``size`` members."""
+        admin = User.objects.create_user(
+            username='admin', email='admin@test.com', password='admin123', role='admin'
+        )
+        learner = User.objects.create_user(
+            username='learner', email='learner@test.com', password='learner123', role='learner'
+        )
+        other = User.objects.create_user(
+            username='other', email='other@test.com', password='other123', role='learner'
+        )
+        self.tokens = {
+            'admin': Token.objects.create(user=admin),
+            'learner': Token.objects.create(user=learner),
+        }
+
+        topics = [Topic.objects.create(name=f'Topic {i}', created_by=admin) for i in range(size)]
+        system_vocab = Vocabulary.objects.bulk_create([
+            Vocabulary(word=f'system{i}', meaning=f'meaning {i}', level='A1', is_system=True,
+                       created_by=admin, created_by_role='admin')
+            for i in range(size)
+        ])
+        personal_vocab = Vocabulary.objects.bulk_create([
+            Vocabulary(word=f'personal{i}', meaning=f'meaning {i}', level='A1', is_system=False,
+                       owner=learner, created_by=learner, created_by_role='learner')
+            for i in range(size)
+        ])
+        VocabularyTopic.objects.bulk_create([
+            VocabularyTopic(vocabulary=vocab, topic=topic)
+            for vocab in system_vocab + personal_vocab for topic in topics
+        ])
+
+        plans = []
+        for i in range(size):
+            plan = LearningPlan.objects.create(
+                user=learner, name=f'Plan {i}',
+                start_date=date.today() - timedelta(days=7),
+                end_date=date.today() + timedelta(days=7),
+                daily_study_time=15, selected_levels=['A1']
+            )
+            plan.selected_topics.set(topics)
+            LearningPlanVocabulary.objects.bulk_create([
+                LearningPlanVocabulary(learning_plan=plan, vocabulary=vocab,
+                                       status='learned' if j % 2 else 'new')
+                for j, vocab in enumerate(system_vocab)
+            ])
+            plans.append(plan)
+
+        notifications = [
+            LearningNotification.objects.create(
+                user=learner, notification_type='study_reminder', title=f'N{i}', message='Study'
+            )
+            for i in range(size)
+        ]
+        practice = [
+            PracticeSession.objects.create(
+                user=learner, learning_plan=plans[0], practice_type='flashcard',
+                total_questions=2, correct_answers=1
+            )
+            for _ in range(size)
+        ]
+        return {
+            'other_id': other.id,
+            'topic_id': topics[0].id,
+            'vocab_id': system_vocab[0].id,
+            'personal_vocab_id': personal_vocab[0].id,
+            'plan_id': plans[0].id,
+            'practice_id': practice[0].id,
+            'notification_id': notifications[0].id,
+            'start_date': plans[0].start_date.isoformat(),
+            'end_date': plans[0].end_date.isoformat(),
+        }
+
+    def _client(self, role):
+        client = APIClient()
+        if role != 'anon':
+            client.credentials(HTTP_AUTHORIZATION=f'Token {self.tokens[role].key}')
+        return client
+
+    def _fill(self, value, ids):
+        if isinstance(value, str):
+            filled = value.format(**ids)
+            return int(filled) if value.startswith('{') and filled.isdigit() else filled
+        if isinstance(value, dict):
+            return {k: self._fill(v, ids) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._fill(v, ids) for v in value]
+        return value
+
+    def _measure(self, size):
+        """Return {route: {'cold': (status_code, [sql, ...]), 'warm': ...}} for one dataset size."""
+        results = {}
+        with transaction.atomic():
+            ids = self._build(size)
+            for name, role, method, path, data, fmt in ROUTES:
+                client = self._client(role)
+                path = self._fill(path, ids)
+                kwargs = {'format': fmt} if fmt else {}
+                if data is not None:
+                    kwargs['data'] = self._fill(data, ids)
+                results[name] = {}
+                # Cold: no cached tokens, decks, counts or page shells from earlier routes
+                for backend in caches.all():
+                    backend.clear()
+                runs = ['cold', 'warm'] if method == 'get' else ['cold']
+                for run in runs:
+                    with CaptureQueriesContext(connection) as ctx:
+                        response = getattr(client, method)(path, **kwargs)
+                    results[name][run] = (response.status_code, [q['sql'] for q in ctx.captured_queries])
+                if name == 'learning:practice-start':
+                    ids['active_practice_id'] = response.json()['session_id']
+                    ids['active_vocab_id'] = response.json()['questions'][0]['vocabulary_id']
+            transaction.set_rollback(True)
+        token_cache.clear()
+        return results
+
+    def test_query_counts_within_budget(self):
+        """Test that every route has a constant query count within its budget, cold and warm"""
+        small = self._measure(SMALL)
+        large = self._measure(LARGE)
+
+        if os.environ.get('UPDATE_QUERY_BUDGETS'):
+            with open(BUDGETS_PATH, 'w') as f:
+                json.dump({name: {run: len(sql) for run, (_, sql) in large[name].items()}
+                           for name, *_ in ROUTES}, f, indent=2)
+                f.write('\n')
+
+        budgets = load_budgets()
+        failures = []
+        for name, *_ in ROUTES:
+            for run, (status_code, queries) in large[name].items():
+                small_count = len(small[name][run][1])
+                budget = budgets.get(name, {}).get(run)
+                problems = []
+                if status_code >= 400:
+                    problems.append(f'returned HTTP {status_code}')
+                if len(queries) != small_count:
+                    problems.append(f'{small_count} queries at size {SMALL} but {len(queries)} at size {LARGE}')
+                if budget is None:
+                    problems.append('has no budget in query_budgets.json')
+                elif len(queries) > budget:
+                    problems.append(f'{len(queries)} queries exceeds budget of {budget}')
+                if problems:
+                    sql = '\n'.join(f'    {i}. {q}' for i, q in enumerate(queries, 1))
+                    failures.append(f'{name} ({run}): {"; ".join(problems)}\n{sql}')
+
+        self.assertFalse(failures, '\n\n' + '\n\n'.join(failures))
+
+    def test_budgets_cover_routes(self):
+        """Test that the budget file has no entries for routes that were removed"""
+        names = {name for name, *_ in ROUTES}
+        self.assertEqual(sorted(set(load_budgets()) - names), [])
+
+    def test_routes_cover_api(self):
+        """Test that every API route and method is budgeted or skipped with a reason"""
+        served = api_routes()
+        budgeted = {route_key(method, path) for _, _, method, path, _, _ in ROUTES}
+        self.assertEqual(sorted(served - budgeted - set(SKIPPED)), [], 'neither in ROUTES nor in SKIPPED')
+        self.assertEqual(sorted(budgeted & set(SKIPPED)), [], 'both budgeted and skipped')
+        self.assertEqual(sorted(set(SKIPPED) - served), [], 'skipped but no longer served')
@@ -0,0 +1,424 @@
+import json
+import logging
+import os
+import pstats
+import shutil
+import tempfile
+from io import StringIO
+
+from asgiref.sync import iscoroutinefunction
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APIClient
+from rest_framework.authtoken.models import Token
+from rest_framework import status
+
+from learning.models import LearningNotification, LearningPlan, LearningPlanVocabulary, PracticeSession
+from topics.models import Topic
+from vocabulary.models import Vocabulary
+from .instrumentation import count_query, install_query_counter, route_stats
+from .metrics import registry
+from .models import TableVersion
+from .slow_queries import SlowQueryLogger, fingerprint, install
+
+User = get_user_model()
+
+
+class RequestInstrumentationTests(APITestCase):
+    """Test suite for the opt-in request instrumentation middleware"""
+
+    def setUp(self):
+        route_stats.reset()
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='admin123',
+            role='admin'
+        )
+        self.learner_user = User.objects.create_user(
+            username='learner',
+            email='learner@test.com',
+            password='learner123',
+            role='learner'
+        )
+        self.admin_token = Token.objects.create(user=self.admin_user)
+        self.learner_token = Token.objects.create(user=self.learner_user)
+        Topic.objects.create(name='Travel', created_by=self.admin_user)
+
+    def _client(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        return client
+
+    def test_disabled_by_default(self):
+        """Test that no Server-Timing header is added when instrumentation is off"""
+        response = self._client(self.learner_token).get('/api/topics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(REQUEST_INSTRUMENTATION={'ENABLED': True, 'LOG': False})
+    def test_server_timing_and_route_stats(self):
+        """Test that timings are exposed as headers and aggregated per route"""
+        client = self._client(self.learner_token)
+        response = client.get('/api/topics/')
+        client.get('/api/topics/')
+
+        header = response['Server-Timing']
+        self.assertIn('db;dur=', header)
+        self.assertIn('serializer;dur=', header)
+        self.assertIn('total;dur=', header)
+
+        stats = self._client(self.admin_token).get('/api/ops/route-stats/').json()
+        topics = [r for r in stats['routes'] if r['route'] == 'GET /api/topics/']
+        self.assertEqual(topics[0]['count'], 2)
+        self.assertGreater(topics[0]['queries_p50'], 0)
+
+    @override_settings(REQUEST_INSTRUMENTATION={'ENABLED': True, 'LOG': False})
+    def test_route_stats_admin_only(self):
+        """Test that learners cannot read route stats"""
+        response = self._client(self.learner_token).get('/api/ops/route-stats/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class SeedScaleTests(APITestCase):
+    """Test suite for the seed_scale management command"""
+
+    def _seed(self, *extra):
+        call_command(
+            'seed_scale', '--users', '3', '--plans-per-user', '2', '--words-per-plan', '10',
+            '--vocabulary', '40', '--topics', '4', '--seed', '7', *extra, stdout=StringIO()
+        )
+        fields = ('learning_plan__user__username', 'learning_plan__name', 'vocabulary__word', 'status')
+        return list(LearningPlanVocabulary.objects.order_by(*fields).values_list(*fields))
+
+    def test_seed_sizes_and_determinism(self):
+        """Test that the generator builds the requested sizes and repeats for the same seed"""
+        first = self._seed()
+
+        self.assertEqual(User.objects.filter(username__startswith='scale_').count(), 3)
+        self.assertEqual(LearningPlan.objects.count(), 6)
+        self.assertEqual(len(first), 60)
+        self.assertEqual(PracticeSession.objects.count(), 18)
+        self.assertTrue(self.client.login(username='scale_00000', password='scale12345'))
+
+        self.assertEqual(self._seed('--flush'), first)
+        self.assertEqual(LearningPlan.objects.count(), 6)
+
+
+class RequestProfilingTests(APITestCase):
+    """Test suite for admin-triggered request profiling"""
+
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir, True)
+        self.settings_override = override_settings(REQUEST_PROFILING={
+            'ENABLED': True, 'HEADER': 'X-Profile', 'QUERY_PARAM': '_profile',
+            'DIR': self.profile_dir, 'MAX_PROFILES': 2, 'SAMPLE_INTERVAL': 0.0005,
+        })
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.admin_user = User.objects.create_user(
+            username='admin', email='admin@test.com', password='admin123', role='admin'
+        )
+        self.learner_user = User.objects.create_user(
+            username='learner', email='learner@test.com', password='learner123', role='learner'
+        )
+        self.admin = APIClient()
+        self.admin.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.admin_user).key}')
+        self.learner = APIClient()
+        self.learner.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.learner_user).key}')
+        Topic.objects.create(name='Travel', created_by=self.admin_user)
+
+    def test_admin_profile_is_stored_and_downloadable(self):
+        """Test that an admin request with the header is profiled and can be downloaded"""
+        response = self.admin.get('/api/topics/', HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile_id = response['X-Profile-Id']
+
+        profiles = self.admin.get('/api/ops/profiles/').json()
+        self.assertEqual(profiles[0]['id'], profile_id)
+        self.assertEqual(profiles[0]['path'], '/api/topics/')
+
+        download = self.admin.get(f'/api/ops/profiles/{profile_id}/download/?kind=pstats')
+        self.assertEqual(download.status_code, status.HTTP_200_OK)
+        path = f'{self.profile_dir}/{profile_id}.prof'
+        self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+        collapsed = self.admin.get(f'/api/ops/profiles/{profile_id}/download/?kind=collapsed')
+        self.assertEqual(collapsed.status_code, status.HTTP_200_OK)
+
+    def test_inert_for_learners(self):
+        """Test that learners cannot trigger, list or download profiles"""
+        response = self.learner.get('/api/topics/?_profile=1', HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+        self.assertEqual(self.learner.get('/api/ops/profiles/').status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_ring_buffer_evicts_oldest(self):
+        """Test that only MAX_PROFILES profiles are kept"""
+        ids = [self.admin.get('/api/topics/?_profile=1')['X-Profile-Id'] for _ in range(3)]
+        kept = [p['id'] for p in self.admin.get('/api/ops/profiles/').json()]
+        self.assertEqual(len(kept), 2)
+        self.assertIn(ids[-1], kept)
+
+
+class AsyncMiddlewareTests(APITestCase):
+    """Test suite for the ops middlewares under the ASGI handler"""
+
+    def setUp(self):
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, True)
+        self.slow_log = os.path.join(work_dir, 'slow.jsonl')
+        settings_override = override_settings(
+            DEBUG=True,
+            REQUEST_INSTRUMENTATION={'ENABLED': True, 'LOG': False},
+            SLOW_QUERY_LOG={'ENABLED': True, 'THRESHOLD_MS': 0, 'PATH': self.slow_log},
+            REQUEST_PROFILING={'ENABLED': True, 'HEADER': 'X-Profile', 'QUERY_PARAM': '_profile',
+                               'DIR': os.path.join(work_dir, 'profiles'), 'MAX_PROFILES': 2,
+                               'SAMPLE_INTERVAL': 0.0005},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # The test connection predates both receivers, so attach them as connection_created would
+        install(None, connection)
+        install_query_counter(None, connection)
+        self.addCleanup(self._uninstall)
+
+        self.admin_user = User.objects.create_user(
+            username='admin', email='admin@test.com', password='admin123', role='admin'
+        )
+        self.token = Token.objects.create(user=self.admin_user)
+        LearningNotification.objects.create(
+            user=self.admin_user, notification_type='encouragement', title='Hi', message='Hello'
+        )
+        self.client = AsyncClient()
+        self.auth = {'Authorization': f'Token {self.token.key}'}
+
+    def _uninstall(self):
+        connection.execute_wrappers[:] = [
+            w for w in connection.execute_wrappers if not isinstance(w, SlowQueryLogger) and w is not count_query
+        ]
+
+    def test_async_view_is_not_adapted(self):
+        """Test that the real MIDDLEWARE stack, ops middlewares on, stays async down to the view"""
+        with self.assertLogs('django.request', 'DEBUG') as logs:
+            handler = ASGIHandler()
+            logging.getLogger('django.request').debug('middleware loaded')
+        self.assertEqual([line for line in logs.output if 'adapted for middleware' in line], [])
+        self.assertTrue(iscoroutinefunction(handler._middleware_chain))
+
+    async def test_async_view_is_instrumented(self):
+        """Test that queries an async view runs through sync_to_async are counted and attributed"""
+        response = await self.client.get('/api/learning/async/notifications/unread_count/', headers=self.auth)
+        self.assertEqual(response.json(), {'count': 1})
+        self.assertNotIn('desc="0 queries"', response['Server-Timing'])
+
+        with open(self.slow_log) as f:
+            views = {json.loads(line)['view'] for line in f}
+        self.assertIn('learning.async_views.unread_count', views)
+
+    async def test_async_request_is_profiled(self):
+        """Test that an admin can profile a request to an async view"""
+        response = await self.client.get('/api/learning/async/notifications/unread_count/?_profile=1', headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('X-Profile-Id', response)
+
+
+@override_settings(METRICS={'ENABLED': True, 'TOKEN': 'scrape-secret', 'DIR': None})
+class MetricsEndpointTests(APITestCase):
+    """Test suite for the Prometheus /metrics endpoint"""
+
+    def setUp(self):
+        registry.reset()
+        self.learner_user = User.objects.create_user(
+            username='learner', email='learner@test.com', password='learner123', role='learner'
+        )
+        self.learner = APIClient()
+        self.learner.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.learner_user).key}')
+
+    def _scrape(self, token='scrape-secret'):
+        return self.client.get('/metrics', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_requires_configured_token(self):
+        """Test that /metrics rejects bad tokens and is hidden when no token is set"""
+        self.assertEqual(self._scrape('wrong').status_code, status.HTTP_403_FORBIDDEN)
+        with override_settings(METRICS={'ENABLED': True, 'TOKEN': ''}):
+            self.assertEqual(self._scrape('').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_request_db_cache_and_analytics_metrics(self):
+        """Test that DRF dispatch, the token cache and AnalyticsService are recorded"""
+        self.learner.get('/api/topics/')
+        self.learner.get('/api/topics/')
+        self.learner.get('/api/learning/analytics/')
+
+        response = self._scrape()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE http_requests_total counter', body)
+        self.assertIn('http_requests_total{route="/api/topics/",method="GET",status="200"} 2', body)
+        self.assertIn('http_request_duration_seconds_bucket{route="/api/topics/",method="GET",le="+Inf"} 2', body)
+        self.assertIn('db_queries_per_request_count{route="/api/topics/",method="GET"} 2', body)
+        self.assertIn('cache_requests_total{cache="token",result="hit"}', body)
+        self.assertIn('cache_hit_ratio{cache="token"}', body)
+        self.assertIn('analytics_duration_seconds_count{operation="get_summary"} 1', body)
+
+    def test_worker_snapshots_are_merged(self):
+        """Test that counters from other worker files are summed into the scrape"""
+        metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, metrics_dir, True)
+        with override_settings(METRICS={'ENABLED': True, 'TOKEN': 'scrape-secret', 'DIR': metrics_dir}):
+            self.learner.get('/api/topics/')
+            other_worker = registry.snapshot()
+            with open(os.path.join(metrics_dir, '999999.json'), 'w') as f:
+                json.dump(other_worker, f)
+            body = self._scrape().content.decode()
+
+        self.assertIn('http_requests_total{route="/api/topics/",method="GET",status="200"} 2', body)
+
+
+
+class SlowQueryLogTests(APITestCase):
+    """Test suite for the slow-query log and its aggregation command"""
+
+    def setUp(self):
+        log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, log_dir, True)
+        self.path = os.path.join(log_dir, 'slow.jsonl')
+        settings_override = override_settings(SLOW_QUERY_LOG={
+            'ENABLED': True, 'THRESHOLD_MS': 0, 'PATH': self.path, 'BACKUP_COUNT': 2,
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        install(None, connection)
+        self.addCleanup(self._uninstall)
+
+        self.user = User.objects.create_user(
+            username='learner', email='learner@test.com', password='learner123', role='learner'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def _uninstall(self):
+        connection.execute_wrappers[:] = [
+            w for w in connection.execute_wrappers if not isinstance(w, SlowQueryLogger)
+        ]
+
+    def _entries(self):
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_slow_queries_are_logged_with_plan_and_view(self):
+        """Test that queries over the threshold are written with fingerprint, plan and view"""
+        Topic.objects.create(name='Animals', description='', created_by=self.user)
+        self.client.get('/api/topics/')
+
+        entries = [e for e in self._entries() if 'topics' in e['tables'] and e['view']]
+        self.assertTrue(entries)
+        entry = entries[0]
+        self.assertEqual(entry['view'], 'topics.views.TopicViewSet.list')
+        self.assertEqual(len(entry['fingerprint']), 12)
+        self.assertNotIn("'", entry['normalized'])
+        self.assertTrue(entry['plan'])
+
+    def test_fingerprint_ignores_literals(self):
+        """Test that queries differing only in literals share a fingerprint"""
+        self.assertEqual(
+            fingerprint("SELECT * FROM vocabularies WHERE id IN (1, 2, 3) AND word = 'a'"),
+            fingerprint("SELECT * FROM vocabularies WHERE id IN (7) AND word = 'it''s'"),
+        )
+
+    def test_command_aggregates_by_fingerprint(self):
+        """Test that slow_queries groups entries and flags full table scans"""
+        for _ in range(3):
+            list(Topic.objects.filter(description__contains='x'))
+
+        out = StringIO()
+        call_command('slow_queries', '--json', '--table', 'topics', stdout=out)
+        rows = json.loads(out.getvalue())
+        scan = next(row for row in rows if 'LIKE' in row['normalized'])
+        self.assertEqual(scan['count'], 3)
+        self.assertEqual(scan['tables'], ['topics'])
+        self.assertIn('topics', scan['full_scans'])
+        self.assertGreaterEqual(scan['max_ms'], scan['mean_ms'])
+
+        out = StringIO()
+        call_command('slow_queries', '--table', 'learning_progress', stdout=out)
+        self.assertIn('No matching slow queries.', out.getvalue())
+
+
+class ConditionalGetTests(APITestCase):
+    """Test suite for ETag / If-None-Match on topics and system vocabulary"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin', email='admin@test.com', password='admin123', role='admin'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.admin_user).key}')
+        self.topic = Topic.objects.create(name='Food', created_by=self.admin_user)
+        vocab = Vocabulary.objects.create(word='apple', meaning='a fruit', is_system=True)
+        vocab.topics.add(self.topic)
+
+    def test_matching_etag_returns_304_without_list_query(self):
+        """Test that If-None-Match skips the list query and serializer"""
+        for path in ['/api/topics/', '/api/vocabulary/system/']:
+            first = self.client.get(path)
+            self.assertEqual(first.status_code, status.HTTP_200_OK)
+            self.assertEqual(first['Cache-Control'], 'private, no-cache')
+            etag = first['ETag']
+            self.assertTrue(etag.startswith('"'))
+
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(path, HTTP_IF_NONE_MATCH=f'W/{etag}')
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response['ETag'], etag)
+            self.assertEqual(response.content, b'')
+            tables = ' '.join(q['sql'] for q in ctx.captured_queries)
+            self.assertNotIn('FROM "topics"', tables)
+            self.assertNotIn('FROM "vocabularies"', tables)
+
+    def test_writes_change_the_etag(self):
+        """Test that ORM writes, link changes and bulk imports invalidate the ETag"""
+        def etag(path):
+            return self.client.get(path)['ETag']
+
+        topics_etag = etag('/api/topics/')
+        self.client.patch(f'/api/topics/{self.topic.id}/', {'description': 'Eating'}, format='json')
+        self.assertNotEqual(etag('/api/topics/'), topics_etag)
+
+        topics_etag = etag('/api/topics/')
+        Vocabulary.objects.get(word='apple').topics.clear()
+        self.assertNotEqual(etag('/api/topics/'), topics_etag)
+
+        system_etag = etag('/api/vocabulary/system/')
+        before = TableVersion.objects.get(table='vocabularies').version
+        csv_file = SimpleUploadedFile('words.csv', b'word,meaning\npear,a fruit\nplum,a fruit\n', 'text/csv')
+        response = self.client.post('/api/vocabulary/import_csv/', {'file': csv_file}, format='multipart')
+        self.assertEqual(response.json()['created_count'], 2)
+        # Both rows are covered by a single bump at the end of the import
+        self.assertEqual(TableVersion.objects.get(table='vocabularies').version, before + 1)
+        self.assertNotEqual(etag('/api/vocabulary/system/'), system_etag)
+
+        self.assertEqual(self.client.get('/api/topics/', HTTP_IF_NONE_MATCH=topics_etag).status_code,
+                         status.HTTP_200_OK)
+
+    def test_login_does_not_invalidate(self):
+        """Test that last_login updates leave the ETag alone"""
+        topics_etag = self.client.get('/api/topics/')['ETag']
+        self.client.post('/api/auth/login/', {'username': 'admin', 'password': 'admin123'}, format='json')
+        self.assertEqual(self.client.get('/api/topics/')['ETag'], topics_etag)
+
+    def test_cache_control_is_settings_driven(self):
+        """Test that Cache-Control comes from CONDITIONAL_GET and the feature can be disabled"""
+        with override_settings(CONDITIONAL_GET={'ENDPOINTS': {'topics': {'CACHE_CONTROL': 'private, max-age=60'}}}):
+            self.assertEqual(self.client.get('/api/topics/')['Cache-Control'], 'private, max-age=60')
+        with override_settings(CONDITIONAL_GET={'ENABLED': False}):
+            self.assertFalse(self.client.get('/api/topics/').has_header('ETag'))
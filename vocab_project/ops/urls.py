@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import RouteStatsView, ProfileListView, ProfileDownloadView
+
+urlpatterns = [
+    path('route-stats/', RouteStatsView.as_view(), name='route-stats'),
+    path('profiles/', ProfileListView.as_view(), name='profile-list'),
+    path('profiles/<str:profile_id>/download/', ProfileDownloadView.as_view(), name='profile-download'),
+]
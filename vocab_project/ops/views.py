@@ -0,0 +1,70 @@
+import hmac
+
+from django.http import FileResponse, Http404, HttpResponse
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from accounts.permissions import IsAdmin
+from .instrumentation import route_stats
+from .metrics import cache_hit_ratios, metrics_options, registry, render
+from .middleware import instrumentation_options
+from .profiling import profile_store
+
+
+class RouteStatsView(APIView):
+    """Per-route latency percentiles collected by the instrumentation middleware."""
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response({
+            'enabled': instrumentation_options().get('ENABLED', False),
+            'routes': route_stats.snapshot(),
+        })
+
+    def delete(self, request):
+        route_stats.reset()
+        return Response({'message': 'Route stats cleared.'})
+
+
+class ProfileListView(APIView):
+    """Request profiles captured by RequestProfilingMiddleware, newest first."""
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response(profile_store().list())
+
+
+class ProfileDownloadView(APIView):
+    """Download one profile as pstats (?kind=pstats) or collapsed stacks (?kind=collapsed)."""
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request, profile_id):
+        kind = request.query_params.get('kind', 'pstats')
+        if kind not in ('pstats', 'collapsed'):
+            return Response({'error': 'kind must be "pstats" or "collapsed".'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            path = profile_store().path(profile_id, kind)
+            handle = open(path, 'rb')
+        except FileNotFoundError:
+            raise Http404('Profile not found.')
+        return FileResponse(handle, as_attachment=True, filename=path.name)
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, guarded by METRICS['TOKEN'] as a bearer token."""
+    options = metrics_options()
+    token = options['TOKEN']
+    if not options['ENABLED'] or not token:
+        raise Http404('Metrics are disabled.')
+
+    auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+    supplied = auth_header[len('Bearer '):] if auth_header.startswith('Bearer ') else ''
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        return HttpResponse('Forbidden\n', status=403, content_type='text/plain')
+
+    families = registry.collect()
+    families['cache_hit_ratio'] = cache_hit_ratios(families)
+    return HttpResponse(render(families), content_type='text/plain; version=0.0.4; charset=utf-8')
+
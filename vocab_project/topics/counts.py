@@ -0,0 +1,63 @@
+"""
+Per-topic vocabulary counts split by level, for the topic list.
+
+All topics are counted with one grouped query over vocabulary_topics joined
+to vocabularies. The result is cached under the vocabulary_topics and
+vocabularies table versions (ops.conditional). Every link write bumps the
+first and every vocabulary write (a level change included) bumps the second,
+so the next request reads a fresh key and nothing is deleted from the cache.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count
+
+from ops.conditional import versions
+from ops.metrics import record_cache
+from .models import Topic
+
+DEFAULTS = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    'TIMEOUT': 24 * 3600,
+}
+
+# Output order; words without a level are counted under 'none'
+LEVELS = ('A1', 'A2', 'B1', 'B2', 'C1', 'C2', 'none')
+TABLES = ['vocabulary_topics', 'vocabularies']
+
+
+def topic_counts_options():
+    options = dict(DEFAULTS)
+    options.update(getattr(settings, 'TOPIC_COUNTS_CACHE', {}))
+    return options
+
+
+def level_counts():
+    """{topic id: {level: words}} for every topic with at least one word."""
+    counts = {}
+    rows = Topic.vocabularies.through.objects.order_by().values('topic_id', 'vocabulary__level').annotate(
+        total=Count('*')
+    ).values_list('topic_id', 'vocabulary__level', 'total')
+    for topic_id, level, total in rows:
+        counts.setdefault(topic_id, {})[level or 'none'] = total
+    return counts
+
+
+def get_level_counts():
+    """level_counts(), served from the cache while links and vocabulary are unchanged."""
+    options = topic_counts_options()
+    if not options['ENABLED']:
+        return level_counts()
+    cache = caches[options['CACHE']]
+    key = 'topic-level-counts:' + ':'.join(str(version) for version in versions(TABLES))
+    counts = cache.get(key)
+    record_cache('topic_level_counts', hit=counts is not None)
+    if counts is None:
+        counts = level_counts()
+        cache.set(key, counts, options['TIMEOUT'])
+    return counts
+
+
+def by_level(counts):
+    """Every level in LEVELS order, zero where the topic has no words at that level."""
+    return {level: counts.get(level, 0) for level in LEVELS}
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
 
 
@@ -20,3 +22,19 @@ class Topic(models.Model):
 
     def __str__(self):
         return self.name
+
+
+def topics_with_counts(queryset=None):
+    """Topics with creator and vocabulary count preloaded for TopicSerializer."""
+    if queryset is None:
+        queryset = Topic.objects.all()
+    # A correlated subquery rather than Count('vocabularies'): when this queryset
+    # is used to prefetch Vocabulary.topics, the prefetch filter shares the
+    # vocabulary_topics join and an aggregate would only count the parent row.
+    through = Topic.vocabularies.through
+    counts = through.objects.filter(topic=OuterRef('pk')).order_by().values('topic').annotate(
+        total=Count('*')
+    ).values('total')
+    return queryset.select_related('created_by').annotate(
+        vocab_count=Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+    )
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .counts import by_level
 from .models import Topic
 
 
@@ -12,4 +13,21 @@ class TopicSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'created_by', 'created_by_username']
 
     def get_vocabulary_count(self, obj):
+        # Use the annotated count when the queryset provides one
+        if hasattr(obj, 'vocab_count'):
+            return obj.vocab_count
         return obj.vocabularies.count()
+
+
+class TopicListSerializer(TopicSerializer):
+    """The topic list: counts come from context['level_counts'] (topics.counts), not per-row annotations."""
+    vocabulary_count_by_level = serializers.SerializerMethodField()
+
+    class Meta(TopicSerializer.Meta):
+        fields = TopicSerializer.Meta.fields + ['vocabulary_count_by_level']
+
+    def get_vocabulary_count(self, obj):
+        return sum(self.context['level_counts'].get(obj.pk, {}).values())
+
+    def get_vocabulary_count_by_level(self, obj):
+        return by_level(self.context['level_counts'].get(obj.pk, {}))
@@ -1,3 +1,79 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from rest_framework import status
 
-# Create your tests here.
+from .models import Topic
+from vocabulary.models import Vocabulary, VocabularyTopic
+
+User = get_user_model()
+
+
+class TopicVocabularyCountTests(APITestCase):
+    """Test suite for preloaded topic vocabulary counts"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='admin123',
+            role='admin'
+        )
+        self.token = Token.objects.create(user=self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        # Level counts are cached by table version, which restarts with every test's rollback
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.food = Topic.objects.create(name='Food', created_by=self.admin_user)
+        self.travel = Topic.objects.create(name='Travel', created_by=self.admin_user)
+        for i in range(3):
+            vocab = Vocabulary.objects.create(word=f'word{i}', meaning='m', is_system=True,
+                                              level='A1' if i else None)
+            VocabularyTopic.objects.create(vocabulary=vocab, topic=self.food)
+            if i == 0:
+                VocabularyTopic.objects.create(vocabulary=vocab, topic=self.travel)
+
+    def test_topic_list_counts(self):
+        """Test that the topic list reports vocabulary counts and creator"""
+        response = self.client.get('/api/topics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        results = data['results'] if 'results' in data else data
+        counts = {t['name']: t['vocabulary_count'] for t in results}
+        self.assertEqual(counts, {'Food': 3, 'Travel': 1})
+
+    def test_nested_topic_counts_are_not_scoped_to_parent(self):
+        """Test that topics nested under vocabulary count all of their words"""
+        response = self.client.get('/api/vocabulary/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for vocab in response.json()['results']:
+            counts = {t['name']: t['vocabulary_count'] for t in vocab['topics']}
+            self.assertEqual(counts.get('Food'), 3)
+            if vocab['word'] == 'word0':
+                self.assertEqual(counts['Travel'], 1)
+
+    def test_topic_list_counts_by_level(self):
+        """Test that the list splits counts by level and refreshes them after link and level writes"""
+        def by_level():
+            return {t['name']: t['vocabulary_count_by_level'] for t in self.client.get('/api/topics/').json()}
+
+        counts = by_level()
+        self.assertEqual(counts['Food'], {'A1': 2, 'A2': 0, 'B1': 0, 'B2': 0, 'C1': 0, 'C2': 0, 'none': 1})
+        self.assertEqual(counts['Travel']['none'], 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            by_level()
+        self.assertFalse([q for q in queries.captured_queries if 'GROUP BY' in q['sql']])
+
+        VocabularyTopic.objects.create(vocabulary=Vocabulary.objects.get(word='word2'), topic=self.travel)
+        vocab = Vocabulary.objects.get(word='word1')
+        vocab.level = 'B1'
+        vocab.save()
+        counts = by_level()
+        self.assertEqual((counts['Food']['A1'], counts['Food']['B1']), (1, 1))
+        self.assertEqual(counts['Travel'], {'A1': 1, 'A2': 0, 'B1': 0, 'B2': 0, 'C1': 0, 'C2': 0, 'none': 1})
+        self.assertEqual({t['name']: t['vocabulary_count'] for t in self.client.get('/api/topics/').json()},
+                         {'Food': 3, 'Travel': 2})
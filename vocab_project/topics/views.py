@@ -3,8 +3,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.db.models import Q
 
-from .models import Topic
-from .serializers import TopicSerializer
+from ops.conditional import conditional_get
+from .counts import get_level_counts
+from .models import Topic, topics_with_counts
+from .serializers import TopicListSerializer, TopicSerializer
 
 
 class TopicViewSet(viewsets.ModelViewSet):
@@ -12,6 +14,9 @@ class TopicViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
+        return topics_with_counts(self._visible_topics())
+
+    def _visible_topics(self):
         user = self.request.user
         if user.is_admin():
             return Topic.objects.all()
@@ -19,6 +24,13 @@ class TopicViewSet(viewsets.ModelViewSet):
             Q(created_by=user) | Q(created_by__role='admin')
         )
 
+    @conditional_get('topics', ['topics', 'users', 'vocabulary_topics', 'vocabularies'])
+    def list(self, request, *args, **kwargs):
+        """Topics with vocabulary counts, in total and by level, from one cached grouped query."""
+        context = {**self.get_serializer_context(), 'level_counts': get_level_counts()}
+        topics = self._visible_topics().select_related('created_by')
+        return Response(TopicListSerializer(topics, many=True, context=context).data)
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
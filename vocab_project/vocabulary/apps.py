@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class VocabularyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vocabulary'
+
+    def ready(self):
+        from .changes import connect_signals
+        connect_signals()
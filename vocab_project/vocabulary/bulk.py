@@ -0,0 +1,78 @@
+"""
+Set-based vocabulary operations for POST /api/vocabulary/bulk/.
+
+Each operation runs in one transaction, with a fixed number of statements
+however many rows match. The matched rows are passed to every statement as
+an `id IN (SELECT ...)` subquery and are never loaded into Python, except
+for delete. Delete goes through Django's collector so that plan entries and
+other cascades are removed too, but its DELETEs are batched and its
+tombstones and table-version bumps are written once at the end.
+
+Topic operations touch updated_at before changing links. A filter such as
+?topic= may stop matching once its links are removed, so replace_topics also
+inserts new links before deleting old ones. SQLite evaluates an uncorrelated
+IN subquery once, before the statement changes any rows.
+"""
+from django.db import connection, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from ops.conditional import bump, deferred_bumps
+from topics.models import Topic
+from .changes import deferred_tombstones
+from .models import Vocabulary, VocabularyTopic
+
+BULK_OPERATIONS = ('delete', 'set_level', 'set_word_type', 'add_topics', 'remove_topics', 'replace_topics')
+
+# Sent before a set-based UPDATE, which skips the model signals, with the
+# queryset of rows about to change and the fields being set (learning.signals
+# moves the offline decks of plans that hold them)
+pre_bulk_update = Signal()
+
+
+def _add_links(scope, topic_ids):
+    """INSERT ... SELECT the missing (vocabulary, topic) links; returns the number inserted."""
+    if not topic_ids:
+        return 0
+    sql, params = scope.order_by().values('id').query.sql_with_params()
+    qn = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(topic_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {qn(VocabularyTopic._meta.db_table)} ({qn("vocabulary_id")}, {qn("topic_id")}) '
+            f'SELECT v.{qn("id")}, t.{qn("id")} FROM ({sql}) v CROSS JOIN {qn(Topic._meta.db_table)} t '
+            f'WHERE t.{qn("id")} IN ({placeholders}) ON CONFLICT DO NOTHING',
+            [*params, *topic_ids],
+        )
+        return cursor.rowcount
+
+
+def run_bulk_operation(queryset, operation, level=None, word_type=None, topic_ids=()):
+    """Apply `operation` to every vocabulary in queryset; returns a summary for the response."""
+    scope = Vocabulary.objects.filter(id__in=queryset.order_by().values('id')).order_by()
+    result = {'operation': operation}
+    with transaction.atomic(), deferred_bumps(), deferred_tombstones():
+        if operation == 'delete':
+            _, deleted = scope.delete()
+            result['count'] = deleted.get(Vocabulary._meta.label, 0)
+        elif operation in ('set_level', 'set_word_type'):
+            values = {'level': level} if operation == 'set_level' else {'word_type': word_type}
+            pre_bulk_update.send(sender=Vocabulary, queryset=scope, fields=list(values))
+            # update() skips auto_now, so updated_at is set here for the changes feed
+            result['count'] = scope.update(**values, updated_at=timezone.now())
+            if result['count']:
+                bump(Vocabulary._meta.db_table)
+        else:
+            result['count'] = scope.update(updated_at=timezone.now())
+            links = VocabularyTopic.objects.filter(vocabulary__in=scope)
+            added = removed = 0
+            if operation in ('add_topics', 'replace_topics'):
+                added = _add_links(scope, topic_ids)
+            if operation == 'remove_topics':
+                removed, _ = links.filter(topic_id__in=topic_ids).delete()
+            elif operation == 'replace_topics':
+                removed, _ = links.exclude(topic_id__in=topic_ids).delete()
+            result.update(links_added=added, links_removed=removed)
+            if added or removed:
+                bump(VocabularyTopic._meta.db_table)
+    return result
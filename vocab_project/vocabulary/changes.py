@@ -0,0 +1,232 @@
+"""
+Incremental vocabulary sync: GET /api/vocabulary/changes/?since=<cursor>.
+
+Edits are ordered by Vocabulary.updated_at. Deletes are ordered by
+VocabularyTombstone.deleted_at. Both streams are read by keyset on
+(timestamp, id) and merged on (timestamp, kind, id), with upserts before
+deletes at the same instant. The cursor is that key for the last change
+returned, so a client that stores it resumes exactly after it.
+
+Model signals keep updated_at honest. Topic links are not columns on the
+vocabulary row, so adding, removing or clearing them touches the vocabulary.
+Renaming or deleting a topic touches every vocabulary linked to it. A
+vocabulary delete, including cascades and admin deletes, writes a tombstone.
+Multi-row writers wrap themselves in deferred_touches() or
+deferred_tombstones(), so an import costs one UPDATE and a bulk delete one
+INSERT at the end.
+
+Changes newer than SETTLE_SECONDS are held back. A timestamp is taken when a
+row is saved, not when its transaction commits, so a write still waiting on
+the database lock can commit with a timestamp older than rows a client has
+already seen. Holding back longer than the SQLite busy timeout means such a
+write has committed before the feed passes its timestamp.
+"""
+import base64
+import heapq
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import islice
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.utils import timezone
+
+DEFAULTS = {
+    'SETTLE_SECONDS': 10,
+    'PAGE_SIZE': 500,
+    'MAX_PAGE_SIZE': 1000,
+}
+
+UPSERT, DELETE = 0, 1
+
+_deferred = threading.local()
+
+
+def changes_options():
+    options = dict(DEFAULTS)
+    options.update(getattr(settings, 'VOCABULARY_CHANGES', {}))
+    return options
+
+
+def touch(*vocabulary_ids):
+    """Advance updated_at of each vocabulary (collected instead inside deferred_touches())."""
+    from .models import Vocabulary
+
+    pending = getattr(_deferred, 'ids', None)
+    if pending is not None:
+        pending.update(vocabulary_ids)
+        return
+    if vocabulary_ids:
+        Vocabulary.objects.filter(id__in=set(vocabulary_ids)).update(updated_at=timezone.now())
+
+
+@contextmanager
+def deferred_touches():
+    """Collapse the touches of a multi-row write (imports) into one UPDATE at the end."""
+    if getattr(_deferred, 'ids', None) is not None:
+        yield
+        return
+    _deferred.ids = set()
+    try:
+        yield
+    finally:
+        ids, _deferred.ids = _deferred.ids, None
+        if ids:
+            touch(*ids)
+
+
+@contextmanager
+def deferred_tombstones():
+    """Collect the tombstones of a multi-row delete and write them in one INSERT at the end."""
+    if getattr(_deferred, 'tombstones', None) is not None:
+        yield
+        return
+    _deferred.tombstones = []
+    try:
+        yield
+    finally:
+        tombstones, _deferred.tombstones = _deferred.tombstones, None
+        if tombstones:
+            _write_tombstones(tombstones)
+
+
+def _write_tombstones(tombstones):
+    from .models import VocabularyTombstone
+
+    VocabularyTombstone.objects.bulk_create(
+        tombstones, update_conflicts=True, unique_fields=['vocabulary_id'],
+        update_fields=['owner_id', 'created_by_id', 'is_system', 'deleted_at'],
+    )
+
+
+def _touch_topic(topic_id):
+    from .models import VocabularyTopic
+
+    touch(*VocabularyTopic.objects.filter(topic_id=topic_id).values_list('vocabulary_id', flat=True))
+
+
+def _link_saved(sender, instance, **kwargs):
+    touch(instance.vocabulary_id)
+
+
+def _links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            touch(instance.pk)
+    elif action in ('post_add', 'post_remove'):
+        touch(*pk_set)
+    elif action == 'pre_clear':
+        _touch_topic(instance.pk)
+
+
+def _topic_saved(sender, instance, created, **kwargs):
+    if not created:
+        _touch_topic(instance.pk)
+
+
+def _topic_deleting(sender, instance, **kwargs):
+    # pre_delete: the links are fast-deleted with the topic, before post_delete
+    _touch_topic(instance.pk)
+
+
+def _vocabulary_deleted(sender, instance, **kwargs):
+    from .models import VocabularyTombstone
+
+    tombstone = VocabularyTombstone(
+        vocabulary_id=instance.pk, owner_id=instance.owner_id, created_by_id=instance.created_by_id,
+        is_system=instance.is_system, deleted_at=timezone.now(),
+    )
+    pending = getattr(_deferred, 'tombstones', None)
+    if pending is not None:
+        pending.append(tombstone)
+    else:
+        _write_tombstones([tombstone])
+
+
+def connect_signals():
+    link = apps.get_model('vocabulary.VocabularyTopic')
+    topic = apps.get_model('topics.Topic')
+    post_save.connect(_link_saved, sender=link, dispatch_uid='vocabulary.changes.link')
+    m2m_changed.connect(_links_changed, sender=link, dispatch_uid='vocabulary.changes.links')
+    post_save.connect(_topic_saved, sender=topic, dispatch_uid='vocabulary.changes.topic_save')
+    pre_delete.connect(_topic_deleting, sender=topic, dispatch_uid='vocabulary.changes.topic_delete')
+    post_delete.connect(_vocabulary_deleted, sender=apps.get_model('vocabulary.Vocabulary'),
+                        dispatch_uid='vocabulary.changes.delete')
+
+
+def encode_cursor(key):
+    changed_at, kind, pk = key
+    return base64.urlsafe_b64encode(f'{changed_at.isoformat()}|{kind}|{pk}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """(changed_at, kind, id) from encode_cursor(); ValueError if it is not one."""
+    try:
+        changed_at, kind, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        key = (datetime.fromisoformat(changed_at), int(kind), int(pk))
+    except (TypeError, UnicodeError, ValueError) as exc:
+        raise ValueError('Invalid cursor.') from exc
+    if key[1] not in (UPSERT, DELETE) or timezone.is_naive(key[0]):
+        raise ValueError('Invalid cursor.')
+    return key
+
+
+def change_page(user, cursor=None, limit=None):
+    """
+    {"changes": [...], "cursor": ..., "has_more": ...} for the changes after
+    `cursor` that `user` may see. Admins see every vocabulary; learners see
+    the ones they created or own, as in the vocabulary list.
+    """
+    from .models import Vocabulary, VocabularyTombstone
+    from .serializers import datetime_representation, vocabulary_list_data, vocabulary_list_rows
+
+    options = changes_options()
+    limit = options['PAGE_SIZE'] if limit is None else min(limit, options['MAX_PAGE_SIZE'])
+    horizon = timezone.now() - timedelta(seconds=options['SETTLE_SECONDS'])
+    upserts = Vocabulary.objects.filter(updated_at__lte=horizon)
+    deletes = VocabularyTombstone.objects.filter(deleted_at__lte=horizon)
+    if not user.is_admin():
+        upserts = upserts.filter(Q(created_by=user) | Q(owner=user))
+        deletes = deletes.filter(Q(created_by_id=user.pk) | Q(owner_id=user.pk))
+    if cursor is not None:
+        changed_at, kind, pk = cursor
+        after = Q(updated_at__gt=changed_at)
+        if kind == UPSERT:
+            after |= Q(updated_at=changed_at, id__gt=pk)
+        upserts = upserts.filter(after)
+        after = Q(deleted_at__gt=changed_at)
+        after |= Q(deleted_at=changed_at) if kind == UPSERT else Q(deleted_at=changed_at, vocabulary_id__gt=pk)
+        deletes = deletes.filter(after)
+
+    # The first limit + 1 merged keys come from the first limit + 1 of each stream
+    upsert_keys = upserts.order_by('updated_at', 'id').values_list('updated_at', 'id')[:limit + 1]
+    delete_keys = deletes.order_by('deleted_at', 'vocabulary_id').values_list('deleted_at', 'vocabulary_id')[:limit + 1]
+    keys = list(islice(heapq.merge(
+        ((changed_at, UPSERT, pk) for changed_at, pk in upsert_keys),
+        ((changed_at, DELETE, pk) for changed_at, pk in delete_keys),
+    ), limit + 1))
+    has_more = len(keys) > limit
+    keys = keys[:limit]
+
+    upserted = [pk for _, kind, pk in keys if kind == UPSERT]
+    vocabulary = {
+        item['id']: item
+        for item in vocabulary_list_data(vocabulary_list_rows(Vocabulary.objects.filter(id__in=upserted)))
+    } if upserted else {}
+    to_datetime = datetime_representation()
+    changes = []
+    for changed_at, kind, pk in keys:
+        if kind == DELETE:
+            changes.append({'op': 'delete', 'id': pk, 'changed_at': to_datetime(changed_at)})
+        elif pk in vocabulary:
+            # A row deleted since its key was read is reported by its tombstone on a later page
+            changes.append({'op': 'upsert', 'id': pk, 'changed_at': to_datetime(changed_at),
+                            'vocabulary': vocabulary[pk]})
+    if keys:
+        next_cursor = encode_cursor(keys[-1])
+    else:
+        next_cursor = encode_cursor(cursor) if cursor is not None else None
+    return {'changes': changes, 'cursor': next_cursor, 'has_more': has_more}
@@ -0,0 +1,72 @@
+"""
+Streaming vocabulary export as CSV or JSON Lines.
+
+Rows are read with values_list().iterator(chunk_size=...), so at most one
+chunk of rows is in memory at a time. Topic names are fetched with one query
+per chunk, and each chunk is encoded and yielded before the next one is read.
+Memory therefore stays flat however many rows match. The CSV uses the
+columns import_csv reads, with topics as a comma-separated list of names.
+"""
+import csv
+import io
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+
+from config.renderers import FastJSONRenderer
+from .models import VocabularyTopic
+
+EXPORT_COLUMNS = (
+    'word', 'meaning', 'meaning_vi', 'phonetics', 'word_type', 'level', 'note', 'example_sentence',
+)
+EXPORT_FIELDS = EXPORT_COLUMNS + ('topics',)
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+EXPORT_CHUNK_SIZE = 2000
+
+
+def export_chunks(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield lists of (*EXPORT_COLUMNS, [topic names]) tuples, chunk_size rows at a time."""
+    rows = queryset.prefetch_related(None).values_list('id', *EXPORT_COLUMNS).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        topics = {}
+        for vocabulary_id, name in VocabularyTopic.objects.filter(
+            vocabulary_id__in=[row[0] for row in chunk]
+        ).order_by('topic__name').values_list('vocabulary_id', 'topic__name'):
+            topics.setdefault(vocabulary_id, []).append(name)
+        yield [(*row[1:], topics.get(row[0], [])) for row in chunk]
+
+
+def _csv_bytes(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+def csv_stream(chunks):
+    yield _csv_bytes([EXPORT_FIELDS])
+    for chunk in chunks:
+        yield _csv_bytes(
+            [*('' if value is None else value for value in row[:-1]), ','.join(row[-1])] for row in chunk
+        )
+
+
+def jsonl_stream(chunks):
+    render = FastJSONRenderer().render
+    for chunk in chunks:
+        yield b''.join(render(dict(zip(EXPORT_FIELDS, row))) + b'\n' for row in chunk)
+
+
+def export_response(queryset, file_format, filename, chunk_size=EXPORT_CHUNK_SIZE):
+    """A StreamingHttpResponse downloading queryset as `filename`.<file_format>."""
+    stream = csv_stream if file_format == 'csv' else jsonl_stream
+    response = StreamingHttpResponse(
+        stream(export_chunks(queryset, chunk_size)), content_type=EXPORT_FORMATS[file_format]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+    return response
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:16
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Existing rows were last changed no later than now; created_at keeps the feed's order meaningful
+    Vocabulary = apps.get_model('vocabulary', 'Vocabulary')
+    Vocabulary.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0004_set_created_by'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VocabularyTombstone',
+            fields=[
+                ('vocabulary_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('owner_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_by_id', models.BigIntegerField(blank=True, null=True)),
+                ('is_system', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'vocabulary_tombstones',
+            },
+        ),
+        migrations.AddField(
+            model_name='vocabulary',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vocabulary',
+            index=models.Index(fields=['updated_at', 'id'], name='vocabularies_updated_at'),
+        ),
+        migrations.AddIndex(
+            model_name='vocabularytombstone',
+            index=models.Index(fields=['deleted_at', 'vocabulary_id'], name='vocabulary_tombstones_deleted'),
+        ),
+    ]
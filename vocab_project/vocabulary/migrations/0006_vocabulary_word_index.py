@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('topics', '0003_set_created_by'),
+        ('vocabulary', '0005_vocabulary_changes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vocabulary',
+            index=models.Index(fields=['word', 'id'], name='vocabularies_word'),
+        ),
+    ]
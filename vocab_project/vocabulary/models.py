@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from topics.models import Topic
 
 
@@ -85,11 +86,18 @@ class Vocabulary(models.Model):
         related_name='vocabularies'
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also advanced when the topic links change (vocabulary.changes); drives /api/vocabulary/changes/
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'vocabularies'
         ordering = ['-created_at']
         verbose_name_plural = 'vocabularies'
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='vocabularies_updated_at'),
+            # Keyset order of /api/vocabulary/by_topic/ and the lists
+            models.Index(fields=['word', 'id'], name='vocabularies_word'),
+        ]
 
     def __str__(self):
         return self.word
@@ -102,3 +110,24 @@ class VocabularyTopic(models.Model):
     class Meta:
         db_table = 'vocabulary_topics'
         unique_together = ['vocabulary', 'topic']
+
+
+class VocabularyTombstone(models.Model):
+    """
+    Record of a deleted vocabulary item, kept so the changes feed can report the deletion.
+    Owner and creator are stored as plain ids so the feed can still scope it per user.
+    """
+    vocabulary_id = models.BigIntegerField(primary_key=True)
+    owner_id = models.BigIntegerField(null=True, blank=True)
+    created_by_id = models.BigIntegerField(null=True, blank=True)
+    is_system = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'vocabulary_tombstones'
+        indexes = [
+            models.Index(fields=['deleted_at', 'vocabulary_id'], name='vocabulary_tombstones_deleted'),
+        ]
+
+    def __str__(self):
+        return f"Deleted vocabulary {self.vocabulary_id}"
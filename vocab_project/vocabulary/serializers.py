@@ -1,7 +1,20 @@
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
+from .bulk import BULK_OPERATIONS
 from .models import Vocabulary, VocabularyTopic
 from topics.serializers import TopicSerializer
-from topics.models import Topic
+from topics.models import Topic, topics_with_counts
+
+
+def set_vocabulary_topics(vocabulary, topics):
+    """Link vocabulary to exactly `topics`, inserting and deleting only the links that differ."""
+    wanted = {topic.pk for topic in topics}
+    current = set(VocabularyTopic.objects.filter(vocabulary=vocabulary).values_list('topic_id', flat=True))
+    if current - wanted:
+        vocabulary.topics.remove(*(current - wanted))
+    if wanted - current:
+        vocabulary.topics.add(*(wanted - current))
 
 
 class VocabularySerializer(serializers.ModelSerializer):
@@ -44,9 +57,8 @@ class VocabularySerializer(serializers.ModelSerializer):
             validated_data['owner'] = user
 
         vocabulary = Vocabulary.objects.create(**validated_data)
-
-        for topic in topic_ids:
-            VocabularyTopic.objects.create(vocabulary=vocabulary, topic=topic)
+        if topic_ids:
+            vocabulary.topics.add(*topic_ids)
 
         return vocabulary
 
@@ -58,9 +70,7 @@ class VocabularySerializer(serializers.ModelSerializer):
         instance.save()
 
         if topic_ids is not None:
-            instance.topics.clear()
-            for topic in topic_ids:
-                VocabularyTopic.objects.create(vocabulary=instance, topic=topic)
+            set_vocabulary_topics(instance, topic_ids)
 
         return instance
 
@@ -80,6 +90,100 @@ class VocabularyListSerializer(serializers.ModelSerializer):
         ]
 
 
+# Read-only fast path producing exactly VocabularyListSerializer's output from
+# values_list() rows: no model instances and no per-row field dispatch.
+# Output field -> values_list() column; topics come from topics_by_vocabulary().
+VOCABULARY_LIST_COLUMNS = {
+    'id': 'id',
+    'word': 'word',
+    'meaning': 'meaning',
+    'meaning_vi': 'meaning_vi',
+    'phonetics': 'phonetics',
+    'word_type': 'word_type',
+    'note': 'note',
+    'example_sentence': 'example_sentence',
+    'level': 'level',
+    'is_system': 'is_system',
+    'learning_status': 'learning_status',
+    'topics': None,
+    'owner_id': 'owner__id',
+    'owner_username': 'owner__username',
+    'created_by_username': 'created_by__username',
+    'created_at': 'created_at',
+}
+VOCABULARY_LIST_FIELDS = tuple(VOCABULARY_LIST_COLUMNS)
+# What ?fields= may name: topics costs two more queries and a count per topic
+VOCABULARY_LIST_SPARSE_FIELDS = tuple(name for name in VOCABULARY_LIST_FIELDS if name != 'topics')
+
+
+def datetime_representation():
+    """DateTimeField().to_representation with the current time zone looked up once, not per value."""
+    if settings.USE_TZ:
+        return serializers.DateTimeField(default_timezone=timezone.get_current_timezone()).to_representation
+    return serializers.DateTimeField().to_representation
+
+
+def vocabulary_list_rows(queryset, fields=None):
+    """The list queryset reduced to (id, *columns of fields) tuples (paginate this)."""
+    fields = VOCABULARY_LIST_FIELDS if fields is None else fields
+    columns = [VOCABULARY_LIST_COLUMNS[name] for name in fields if VOCABULARY_LIST_COLUMNS[name]]
+    return queryset.prefetch_related(None).values_list('id', *columns)
+
+
+def topics_by_vocabulary(vocabulary_ids, to_datetime):
+    """{vocabulary id: [TopicSerializer dicts ordered by name]}."""
+    links = VocabularyTopic.objects.filter(vocabulary_id__in=vocabulary_ids).values_list('vocabulary_id', 'topic_id')
+    linked = {}
+    for vocabulary_id, topic_id in links:
+        linked.setdefault(vocabulary_id, []).append(topic_id)
+    if not linked:
+        return {}
+    # Each distinct topic is fetched and counted once, however many rows share it
+    topics = topics_with_counts(Topic.objects.filter(id__in={t for ids in linked.values() for t in ids}))
+    topics = {
+        pk: (name, {
+            'id': pk,
+            'name': name,
+            'description': description,
+            'created_at': to_datetime(created_at),
+            'created_by': created_by,
+            'created_by_username': username,
+            'vocabulary_count': count,
+        })
+        for pk, name, description, created_at, created_by, username, count in topics.values_list(
+            'id', 'name', 'description', 'created_at', 'created_by_id', 'created_by__username', 'vocab_count'
+        )
+    }
+    return {
+        vocabulary_id: [topic for _, topic in sorted((topics[t] for t in ids), key=lambda item: item[0])]
+        for vocabulary_id, ids in linked.items()
+    }
+
+
+def vocabulary_list_data(rows, fields=None):
+    """VocabularyListSerializer(many=True).data, narrowed to fields, for rows from vocabulary_list_rows()."""
+    fields = VOCABULARY_LIST_FIELDS if fields is None else fields
+    rows = list(rows)
+    to_datetime = datetime_representation()
+    # (field, row index); topics takes the id as a placeholder so it keeps its position
+    plan, index = [], 1
+    for name in fields:
+        if VOCABULARY_LIST_COLUMNS[name]:
+            plan.append((name, index))
+            index += 1
+        else:
+            plan.append((name, 0))
+    data = [{name: row[i] for name, i in plan} for row in rows]
+    if 'topics' in fields:
+        topics = topics_by_vocabulary([row[0] for row in rows], to_datetime)
+        for item, row in zip(data, rows):
+            item['topics'] = topics.get(row[0], [])
+    if 'created_at' in fields:
+        for item in data:
+            item['created_at'] = to_datetime(item['created_at'])
+    return data
+
+
 class SystemVocabularySerializer(serializers.ModelSerializer):
     """Serializer for admin to manage system/public vocabulary"""
     topics = TopicSerializer(many=True, read_only=True)
@@ -107,9 +211,8 @@ class SystemVocabularySerializer(serializers.ModelSerializer):
         validated_data['owner'] = None
 
         vocabulary = Vocabulary.objects.create(**validated_data)
-
-        for topic in topic_ids:
-            VocabularyTopic.objects.create(vocabulary=vocabulary, topic=topic)
+        if topic_ids:
+            vocabulary.topics.add(*topic_ids)
 
         return vocabulary
 
@@ -121,13 +224,55 @@ class SystemVocabularySerializer(serializers.ModelSerializer):
         instance.save()
 
         if topic_ids is not None:
-            instance.topics.clear()
-            for topic in topic_ids:
-                VocabularyTopic.objects.create(vocabulary=instance, topic=topic)
+            set_vocabulary_topics(instance, topic_ids)
 
         return instance
 
 
+class BulkFilterSerializer(serializers.Serializer):
+    """The vocabulary list filters (?search=, ?topic=, ...) plus is_system, as a JSON object."""
+    search = serializers.CharField(required=False)
+    topic = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Vocabulary.LEARNING_STATUS_CHOICES, required=False)
+    word_type = serializers.ChoiceField(choices=Vocabulary.TYPE_CHOICES, required=False)
+    level = serializers.ChoiceField(choices=Vocabulary.LEVEL_CHOICES, required=False)
+    is_system = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError('Give at least one filter; use ids to pick rows explicitly.')
+        return attrs
+
+
+class BulkOperationSerializer(serializers.Serializer):
+    """POST /api/vocabulary/bulk/: one operation on the vocabulary chosen by ids or filter."""
+    operation = serializers.ChoiceField(choices=BULK_OPERATIONS)
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False,
+                                max_length=10000)
+    filter = BulkFilterSerializer(required=False)
+    level = serializers.ChoiceField(choices=Vocabulary.LEVEL_CHOICES, required=False)
+    word_type = serializers.ChoiceField(choices=Vocabulary.TYPE_CHOICES, required=False)
+    topic_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError('Give either ids or filter.')
+        operation = attrs['operation']
+        if operation == 'set_level' and 'level' not in attrs:
+            raise serializers.ValidationError({'level': 'This field is required for set_level.'})
+        if operation == 'set_word_type' and 'word_type' not in attrs:
+            raise serializers.ValidationError({'word_type': 'This field is required for set_word_type.'})
+        if operation.endswith('_topics'):
+            topic_ids = set(attrs.get('topic_ids', []))
+            if 'topic_ids' not in attrs or (operation != 'replace_topics' and not topic_ids):
+                raise serializers.ValidationError({'topic_ids': f'This field is required for {operation}.'})
+            missing = topic_ids - set(Topic.objects.filter(id__in=topic_ids).values_list('id', flat=True))
+            if missing:
+                raise serializers.ValidationError({'topic_ids': f'Unknown topic ids: {sorted(missing)}.'})
+            attrs['topic_ids'] = sorted(topic_ids)
+        return attrs
+
+
 class CSVImportSerializer(serializers.Serializer):
     file = serializers.FileField()
     topic_ids = serializers.ListField(
@@ -1,3 +1,455 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import time
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import Prefetch
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+
+from topics.models import Topic, topics_with_counts
+from .export import export_chunks
+from .models import Vocabulary, VocabularyTombstone, VocabularyTopic
+from .serializers import VocabularyListSerializer, vocabulary_list_data, vocabulary_list_rows
+
+User = get_user_model()
+
+
+def best_of(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+class VocabularyListFastPathTests(APITestCase):
+    """Test suite for the values()-based vocabulary list fast path"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin', email='admin@test.com', password='admin123', role='admin'
+        )
+        self.learner = User.objects.create_user(
+            username='learner', email='learner@test.com', password='learner123', role='learner'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.admin_user).key}')
+        topics = [
+            Topic.objects.create(name='Food', description='Eating', created_by=self.admin_user),
+            Topic.objects.create(name='Animals', created_by=None),
+            Topic.objects.create(name='Travel', created_by=self.learner),
+        ]
+        vocab = Vocabulary.objects.bulk_create([
+            Vocabulary(
+                word=f'word{i:04d}', meaning=f'meaning {i}', meaning_vi=f'nghĩa {i}' if i % 2 else None,
+                phonetics='/wɜːd/' if i % 3 else None, word_type='noun' if i % 4 else None,
+                note=None, example_sentence=f'Example {i}.', level='A1' if i % 5 else None,
+                is_system=i % 2 == 0, learning_status='learning' if i % 7 else 'new',
+                owner=None if i % 2 == 0 else self.learner,
+                created_by=self.admin_user if i % 2 == 0 else self.learner,
+            )
+            for i in range(1000)
+        ])
+        VocabularyTopic.objects.bulk_create([
+            VocabularyTopic(vocabulary=v, topic=topic)
+            for i, v in enumerate(vocab) for n, topic in enumerate(topics) if (i + n) % (n + 2) == 0
+        ])
+
+    def _queryset(self):
+        return Vocabulary.objects.select_related('owner', 'created_by').prefetch_related(
+            Prefetch('topics', queryset=topics_with_counts())
+        ).order_by('word').distinct()
+
+    def test_output_is_byte_identical(self):
+        """Test that the fast path renders exactly what VocabularyListSerializer renders"""
+        expected = JSONRenderer().render(VocabularyListSerializer(self._queryset(), many=True).data)
+        self.assertEqual(JSONRenderer().render(vocabulary_list_data(vocabulary_list_rows(self._queryset()))),
+                         expected)
+
+        response = self.client.get('/api/vocabulary/?page_size=50&page=3')
+        page = VocabularyListSerializer(self._queryset()[100:150], many=True).data
+        self.assertEqual(JSONRenderer().render(response.json()['results']), JSONRenderer().render(page))
+
+    def test_fast_path_is_three_times_faster(self):
+        """Test that a 1,000-row page builds at least 3x faster than through the serializer"""
+        serializer = best_of(lambda: VocabularyListSerializer(self._queryset(), many=True).data)
+        fast = best_of(lambda: vocabulary_list_data(vocabulary_list_rows(self._queryset())))
+        self.assertGreaterEqual(serializer / fast, 3, f'serializer {serializer:.4f}s vs fast path {fast:.4f}s')
+
+
+class SparseFieldsetTests(APITestCase):
+    """Test suite for ?fields= and ?exclude= on the vocabulary list endpoints"""
+
+    def setUp(self):
+        self.learner = User.objects.create_user(
+            username='learner', email='learner@test.com', password='learner123', role='learner'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.learner).key}')
+        self.topic = Topic.objects.create(name='Food')
+        for i in range(3):
+            vocab = Vocabulary.objects.create(
+                word=f'word{i}', meaning=f'meaning {i}', note=f'meaning {i}', example_sentence=f'Example {i}.',
+                owner=self.learner, created_by=self.learner, created_by_role='learner'
+            )
+            VocabularyTopic.objects.create(vocabulary=vocab, topic=self.topic)
+
+    def test_fields_narrow_output_and_columns(self):
+        """Test that ?fields= returns only those keys and selects only their columns"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/vocabulary/?fields=learning_status,word')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()['results']
+        self.assertEqual(results[0], {'word': 'word0', 'learning_status': 'new'})
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('"meaning"', sql)
+        self.assertNotIn('vocabulary_topics', sql)
+
+        full = self.client.get('/api/vocabulary/personal/').json()['results']
+        narrowed = self.client.get('/api/vocabulary/personal/?fields=id,word,created_at').json()['results']
+        self.assertEqual(narrowed, [{'id': v['id'], 'word': v['word'], 'created_at': v['created_at']} for v in full])
+
+    def test_exclude_drops_fields(self):
+        """Test that ?exclude= keeps the other fields, topics included, in order"""
+        full = self.client.get(f'/api/vocabulary/by_topic/?topic_id={self.topic.id}').json()['results']
+        response = self.client.get(f'/api/vocabulary/by_topic/?topic_id={self.topic.id}&exclude=note,meaning')
+        expected = [{k: v for k, v in item.items() if k not in ('note', 'meaning')} for item in full]
+        self.assertEqual(response.json()['results'], expected)
+        self.assertEqual(list(response.json()['results'][0]), list(expected[0]))
+
+    def test_allowlist_rejects_unknown_and_expensive_fields(self):
+        """Test that unknown fields and computed topics cannot be requested by name"""
+        for query in ('fields=word,password', 'fields=topics', 'exclude=owner', 'fields=word&exclude=note'):
+            response = self.client.get(f'/api/vocabulary/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+
+class VocabularyExportTests(APITestCase):
+    """Test suite for the streaming CSV / JSONL vocabulary export"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin', email='admin@test.com', password='admin123', role='admin'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.admin_user).key}')
+        food = Topic.objects.create(name='Food')
+        animals = Topic.objects.create(name='Animals')
+        for i in range(5):
+            vocab = Vocabulary.objects.create(
+                word=f'word{i}', meaning=f'meaning, "quoted" {i}', meaning_vi='nghĩa' if i else None,
+                level='A1' if i % 2 else 'B1', is_system=i < 4, created_by=self.admin_user
+            )
+            VocabularyTopic.objects.create(vocabulary=vocab, topic=food)
+            if i == 1:
+                VocabularyTopic.objects.create(vocabulary=vocab, topic=animals)
+
+    def _content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_csv_export_round_trips_through_import(self):
+        """Test that the CSV uses the import_csv columns and re-imports cleanly"""
+        response = self.client.get('/api/vocabulary/export/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="vocabulary.csv"')
+        content = self._content(response)
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        self.assertEqual([row['word'] for row in rows], [f'word{i}' for i in range(5)])
+        self.assertEqual(rows[1]['meaning'], 'meaning, "quoted" 1')
+        self.assertEqual(rows[1]['topics'], 'Animals,Food')
+        self.assertEqual(rows[0]['meaning_vi'], '')
+
+        Vocabulary.objects.all().delete()
+        upload = SimpleUploadedFile('vocabulary.csv', content, content_type='text/csv')
+        result = self.client.post('/api/vocabulary/import_csv/', {'file': upload}, format='multipart')
+        self.assertEqual(result.json()['created_count'], 5)
+        self.assertEqual(Vocabulary.objects.get(word='word1').topics.count(), 2)
+        self.assertEqual(Vocabulary.objects.get(word='word1').meaning, 'meaning, "quoted" 1')
+
+    def test_jsonl_system_export_honors_filters(self):
+        """Test that the system JSONL export applies the list filters"""
+        response = self.client.get('/api/vocabulary/system/export/?file_format=jsonl&level=A1')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        lines = [json.loads(line) for line in self._content(response).decode().splitlines()]
+        self.assertEqual([line['word'] for line in lines], ['word1', 'word3'])
+        self.assertEqual(lines[0]['topics'], ['Animals', 'Food'])
+        self.assertIsNone(lines[0]['note'])
+
+    def test_export_reads_in_chunks(self):
+        """Test that rows and topic names are fetched one chunk at a time"""
+        with CaptureQueriesContext(connection) as queries:
+            chunks = list(export_chunks(Vocabulary.objects.order_by('word'), chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        topic_queries = [q for q in queries.captured_queries if 'vocabulary_topics' in q['sql']]
+        self.assertEqual(len(topic_queries), 3)
+
+    def test_unknown_format_is_rejected(self):
+        """Test that an unsupported file_format returns 400"""
+        response = self.client.get('/api/vocabulary/export/?file_format=xlsx')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(VOCABULARY_CHANGES={'SETTLE_SECONDS': 0, 'PAGE_SIZE': 500, 'MAX_PAGE_SIZE': 1000})
+class VocabularyChangesTests(APITestCase):
+    """Test suite for the incremental /api/vocabulary/changes/ feed"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin', email='admin@test.com', password='admin123', role='admin'
+        )
+        self.learner = User.objects.create_user(
+            username='learner', email='learner@test.com', password='learner123', role='learner'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.admin_user).key}')
+        self.topic = Topic.objects.create(name='Food')
+        self.vocab = [
+            Vocabulary.objects.create(word=f'word{i}', meaning=f'meaning {i}', is_system=True,
+                                      created_by=self.admin_user)
+            for i in range(5)
+        ]
+
+    def _changes(self, cursor=None, **params):
+        if cursor:
+            params['since'] = cursor
+        response = self.client.get('/api/vocabulary/changes/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def _drain(self, cursor=None, limit=2):
+        """Every change after cursor, following has_more; returns (changes, final cursor)."""
+        changes = []
+        while True:
+            page = self._changes(cursor, limit=limit)
+            changes += page['changes']
+            cursor = page['cursor']
+            if not page['has_more']:
+                return changes, cursor
+
+    def test_pages_resume_from_cursor(self):
+        """Test that paging returns each change once, then only later edits and deletes"""
+        changes, cursor = self._drain()
+        self.assertEqual([c['id'] for c in changes], [v.id for v in self.vocab])
+        self.assertEqual(changes[0]['vocabulary']['word'], 'word0')
+        self.assertEqual(self._changes(cursor)['changes'], [])
+
+        self.vocab[3].meaning = 'edited'
+        self.vocab[3].save()
+        deleted_id = self.vocab[1].id
+        self.vocab[1].delete()
+        changes, cursor = self._drain(cursor)
+        self.assertEqual([(c['op'], c['id']) for c in changes], [('upsert', self.vocab[3].id), ('delete', deleted_id)])
+        self.assertEqual(changes[0]['vocabulary']['meaning'], 'edited')
+        self.assertEqual(self._changes(cursor)['cursor'], cursor)
+
+    def test_topic_links_and_admin_deletes_record_changes(self):
+        """Test that link changes, topic deletes and queryset deletes all reach the feed"""
+        _, cursor = self._drain()
+        self.vocab[0].topics.add(self.topic)
+        self.topic.vocabularies.add(self.vocab[2])
+        VocabularyTopic.objects.create(vocabulary=self.vocab[4], topic=Topic.objects.create(name='Animals'))
+        changes, cursor = self._drain(cursor)
+        self.assertEqual({c['id'] for c in changes}, {self.vocab[0].id, self.vocab[2].id, self.vocab[4].id})
+        self.assertEqual(changes[0]['vocabulary']['topics'][0]['name'], 'Food')
+
+        self.topic.delete()
+        changes, cursor = self._drain(cursor)
+        self.assertEqual({c['id'] for c in changes}, {self.vocab[0].id, self.vocab[2].id})
+        self.assertEqual(changes[0]['vocabulary']['topics'], [])
+
+        Vocabulary.objects.filter(word__in=['word0', 'word2']).delete()
+        changes, _ = self._drain(cursor)
+        self.assertEqual({(c['op'], c['id']) for c in changes},
+                         {('delete', self.vocab[0].id), ('delete', self.vocab[2].id)})
+        self.assertEqual(VocabularyTombstone.objects.count(), 2)
+
+    def test_csv_import_records_changes(self):
+        """Test that an import reports relinked and created rows, touching them in one UPDATE"""
+        _, cursor = self._drain()
+        content = b'word,meaning,topics\nword1,imported meaning,Food\nfresh,new word,Food\n'
+        upload = SimpleUploadedFile('vocabulary.csv', content, content_type='text/csv')
+        with CaptureQueriesContext(connection) as queries:
+            result = self.client.post('/api/vocabulary/import_csv/', {'file': upload}, format='multipart')
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        touches = [q for q in queries.captured_queries
+                   if q['sql'].startswith('UPDATE "vocabularies" SET "updated_at"')]
+        self.assertEqual(len(touches), 1)
+        changes, _ = self._drain(cursor)
+        self.assertEqual([c['vocabulary']['word'] for c in changes], ['word1', 'fresh'])
+        self.assertEqual(changes[0]['vocabulary']['topics'][0]['name'], 'Food')
+
+    def test_learners_see_only_their_own_changes(self):
+        """Test that learners get their own vocabulary and tombstones, not system rows"""
+        mine = Vocabulary.objects.create(word='mine', meaning='m', owner=self.learner, created_by=self.learner)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.learner).key}')
+        changes, cursor = self._drain()
+        self.assertEqual([c['id'] for c in changes], [mine.id])
+        self.vocab[0].delete()
+        mine_id = mine.id
+        mine.delete()
+        changes, _ = self._drain(cursor)
+        self.assertEqual([(c['op'], c['id']) for c in changes], [('delete', mine_id)])
+
+    def test_recent_changes_are_held_back(self):
+        """Test that changes inside the settle window are not served yet"""
+        with self.settings(VOCABULARY_CHANGES={'SETTLE_SECONDS': 60}):
+            page = self._changes()
+        self.assertEqual(page, {'changes': [], 'cursor': None, 'has_more': False})
+
+    def test_invalid_cursor_is_rejected(self):
+        """Test that a malformed since or limit returns 400"""
+        for params in ({'since': 'not-a-cursor'}, {'since': 'Zm9vfGJhcnxiYXo='}, {'limit': '0'}, {'limit': 'x'}):
+            response = self.client.get('/api/vocabulary/changes/', params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+
+class VocabularyBulkOperationTests(APITestCase):
+    """Test suite for /api/vocabulary/bulk/ and diff-based topic updates"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin', email='admin@test.com', password='admin123', role='admin'
+        )
+        self.learner = User.objects.create_user(
+            username='learner', email='learner@test.com', password='learner123', role='learner'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.admin_user).key}')
+        self.food = Topic.objects.create(name='Food')
+        self.animals = Topic.objects.create(name='Animals')
+        self.vocab = [
+            Vocabulary.objects.create(word=f'word{i}', meaning=f'meaning {i}', level='A1', is_system=i < 4,
+                                      created_by=self.admin_user)
+            for i in range(6)
+        ]
+        for vocab in self.vocab[:3]:
+            VocabularyTopic.objects.create(vocabulary=vocab, topic=self.food)
+
+    def _bulk(self, payload):
+        return self.client.post('/api/vocabulary/bulk/', payload, format='json')
+
+    def test_set_level_and_word_type(self):
+        """Test that set_level and set_word_type update the chosen rows in one UPDATE"""
+        ids = [self.vocab[0].id, self.vocab[4].id]
+        with CaptureQueriesContext(connection) as queries:
+            response = self._bulk({'operation': 'set_level', 'ids': ids, 'level': 'C1'})
+        self.assertEqual(response.json(), {'operation': 'set_level', 'count': 2})
+        updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE "vocabularies"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(set(Vocabulary.objects.filter(level='C1').values_list('id', flat=True)), set(ids))
+
+        response = self._bulk({'operation': 'set_word_type', 'filter': {'is_system': False}, 'word_type': 'verb'})
+        self.assertEqual(response.json()['count'], 2)
+        self.assertEqual(Vocabulary.objects.filter(word_type='verb').count(), 2)
+
+    def test_topic_operations(self):
+        """Test that add, remove and replace change only the links they must"""
+        response = self._bulk({'operation': 'add_topics', 'filter': {'is_system': True},
+                               'topic_ids': [self.food.id, self.animals.id]})
+        self.assertEqual(response.json(), {'operation': 'add_topics', 'count': 4, 'links_added': 5,
+                                           'links_removed': 0})
+        kept = VocabularyTopic.objects.get(vocabulary=self.vocab[0], topic=self.food).id
+
+        # The filter matches on the topic being replaced; it must still pick the same rows
+        response = self._bulk({'operation': 'replace_topics', 'filter': {'topic': self.animals.id},
+                               'topic_ids': [self.food.id]})
+        self.assertEqual(response.json()['links_removed'], 4)
+        self.assertEqual(VocabularyTopic.objects.filter(topic=self.animals).count(), 0)
+        self.assertEqual(VocabularyTopic.objects.filter(topic=self.food).count(), 4)
+        self.assertTrue(VocabularyTopic.objects.filter(id=kept).exists())
+
+        response = self._bulk({'operation': 'remove_topics', 'ids': [self.vocab[0].id, self.vocab[5].id],
+                               'topic_ids': [self.food.id]})
+        self.assertEqual(response.json()['links_removed'], 1)
+        self.assertFalse(self.vocab[0].topics.exists())
+
+    def test_delete_writes_tombstones_in_one_insert(self):
+        """Test that a bulk delete removes the rows and their links and batches the tombstones"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self._bulk({'operation': 'delete', 'filter': {'topic': self.food.id}})
+        self.assertEqual(response.json(), {'operation': 'delete', 'count': 3})
+        self.assertEqual(Vocabulary.objects.count(), 3)
+        self.assertFalse(VocabularyTopic.objects.exists())
+        self.assertEqual(VocabularyTombstone.objects.count(), 3)
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "vocabulary_tombstones"')]
+        self.assertEqual(len(inserts), 1)
+
+    def test_invalid_requests_are_rejected(self):
+        """Test that bad payloads return 400 and learners get 403"""
+        for payload in (
+            {'operation': 'delete'},
+            {'operation': 'delete', 'ids': [1], 'filter': {'level': 'A1'}},
+            {'operation': 'delete', 'filter': {}},
+            {'operation': 'set_level', 'ids': [1]},
+            {'operation': 'add_topics', 'ids': [1], 'topic_ids': []},
+            {'operation': 'add_topics', 'ids': [1], 'topic_ids': [999]},
+            {'operation': 'rename', 'ids': [1]},
+        ):
+            self.assertEqual(self._bulk(payload).status_code, status.HTTP_400_BAD_REQUEST, payload)
+        self.assertEqual(Vocabulary.objects.count(), 6)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.learner).key}')
+        response = self._bulk({'operation': 'delete', 'ids': [self.vocab[0].id]})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_single_update_only_writes_changed_links(self):
+        """Test that updating topic_ids keeps unchanged links and only inserts or deletes the rest"""
+        vocab = self.vocab[0]
+        kept = VocabularyTopic.objects.get(vocabulary=vocab, topic=self.food).id
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(f'/api/vocabulary/system/{vocab.id}/',
+                                         {'topic_ids': [self.food.id, self.animals.id]}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(VocabularyTopic.objects.filter(id=kept).exists())
+        self.assertEqual(set(vocab.topics.values_list('name', flat=True)), {'Food', 'Animals'})
+        link_deletes = [q for q in queries.captured_queries if q['sql'].startswith('DELETE FROM "vocabulary_topics"')]
+        self.assertEqual(link_deletes, [])
+
+        self.client.patch(f'/api/vocabulary/system/{vocab.id}/', {'topic_ids': [self.animals.id]},
+                          format='multipart')
+        self.assertEqual(list(vocab.topics.values_list('name', flat=True)), ['Animals'])
+
+
+class VocabularyByTopicPaginationTests(APITestCase):
+    """Test suite for keyset pagination of /api/vocabulary/by_topic/"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin', email='admin@test.com', password='admin123', role='admin'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.admin_user).key}')
+        self.topic = Topic.objects.create(name='Food')
+        # Duplicate words check the id tie-break
+        for word in ['pear', 'apple', 'fig', 'apple', 'kiwi', 'date', 'apple']:
+            vocab = Vocabulary.objects.create(word=word, meaning='m', is_system=True, created_by=self.admin_user)
+            VocabularyTopic.objects.create(vocabulary=vocab, topic=self.topic)
+        Vocabulary.objects.create(word='banana', meaning='m', is_system=True, created_by=self.admin_user)
+
+    def _walk(self, query):
+        url, items, pages = f'/api/vocabulary/by_topic/?topic_id={self.topic.id}&{query}', [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            items += response.json()['results']
+            url, pages = response.json()['next'], pages + 1
+        return items, pages
+
+    def test_pages_follow_word_then_id(self):
+        """Test that following next visits every word once, in (word, id) order"""
+        items, pages = self._walk('page_size=2')
+        self.assertEqual(pages, 4)
+        expected = list(Vocabulary.objects.filter(topics=self.topic).order_by('word', 'id').values_list('id', flat=True))
+        self.assertEqual([item['id'] for item in items], expected)
+
+        sparse, _ = self._walk('page_size=3&fields=id,level')
+        self.assertEqual([item['id'] for item in sparse], expected)
+
+    def test_invalid_cursor_is_rejected(self):
+        """Test that a malformed cursor returns 400"""
+        response = self.client.get(f'/api/vocabulary/by_topic/?topic_id={self.topic.id}&cursor=bm9wZQ==')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,5 +1,8 @@
+import base64
 import csv
 import io
+import json
+import time
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -7,15 +10,24 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q
+from rest_framework.utils.urls import replace_query_param
+from django.db.models import Prefetch, Q
 
 from .models import Vocabulary, VocabularyTopic
 from .serializers import (
-    VocabularySerializer, VocabularyListSerializer, CSVImportSerializer,
-    SystemVocabularySerializer
+    VocabularySerializer, VocabularyListSerializer, CSVImportSerializer, BulkOperationSerializer,
+    SystemVocabularySerializer, vocabulary_list_data, vocabulary_list_rows,
+    VOCABULARY_LIST_COLUMNS, VOCABULARY_LIST_FIELDS, VOCABULARY_LIST_SPARSE_FIELDS
 )
-from topics.models import Topic
+from .export import EXPORT_FORMATS, export_response
+from .changes import change_page, decode_cursor, deferred_touches
+from .bulk import run_bulk_operation
+from topics.models import Topic, topics_with_counts
 from accounts.permissions import IsOwnerOrAdmin, IsAdmin
+from config.fieldsets import sparse_fields
+from config.renderers import FastJSONParser
+from ops.conditional import conditional_get, deferred_bumps
+from ops.metrics import record_import
 
 
 class VocabularyPagination(PageNumberPagination):
@@ -24,6 +36,49 @@ class VocabularyPagination(PageNumberPagination):
     max_page_size = 100
 
 
+def filter_vocabulary(queryset, params):
+    """The vocabulary list filters: search, topic, status, word_type and level."""
+    search = str(params.get('search', '')).strip()
+    topic_id = params.get('topic', '')
+    learning_status = params.get('status', '')
+    word_type = params.get('word_type', '')
+    level = params.get('level', '')
+
+    if search:
+        queryset = queryset.filter(
+            Q(word__icontains=search) | Q(meaning__icontains=search)
+        )
+
+    if topic_id:
+        queryset = queryset.filter(topics__id=topic_id)
+
+    if learning_status:
+        queryset = queryset.filter(learning_status=learning_status)
+
+    if word_type:
+        queryset = queryset.filter(word_type=word_type)
+
+    if level:
+        queryset = queryset.filter(level=level)
+
+    return queryset
+
+
+def encode_word_cursor(word, pk):
+    return base64.urlsafe_b64encode(json.dumps([word, pk]).encode()).decode()
+
+
+def decode_word_cursor(cursor):
+    """(word, id) from encode_word_cursor(); ValueError if it is not one."""
+    try:
+        word, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, UnicodeError, ValueError) as exc:
+        raise ValueError('Invalid cursor.') from exc
+    if not isinstance(word, str) or not isinstance(pk, int):
+        raise ValueError('Invalid cursor.')
+    return word, pk
+
+
 class VocabularyViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
@@ -36,7 +91,9 @@ class VocabularyViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Vocabulary.objects.select_related('owner').prefetch_related('topics').order_by('word')
+        queryset = Vocabulary.objects.select_related('owner', 'created_by').prefetch_related(
+            Prefetch('topics', queryset=topics_with_counts())
+        ).order_by('word')
 
         if user.is_admin():
             base_queryset = queryset
@@ -47,34 +104,28 @@ class VocabularyViewSet(viewsets.ModelViewSet):
             )
 
         # Apply filters from query params
-        search = self.request.query_params.get('search', '').strip()
-        topic_id = self.request.query_params.get('topic', '')
-        learning_status = self.request.query_params.get('status', '')
-        word_type = self.request.query_params.get('word_type', '')
-        level = self.request.query_params.get('level', '')
-
-        if search:
-            base_queryset = base_queryset.filter(
-                Q(word__icontains=search) | Q(meaning__icontains=search)
-            )
+        return filter_vocabulary(base_queryset, self.request.query_params).distinct()
 
-        if topic_id:
-            base_queryset = base_queryset.filter(topics__id=topic_id)
-
-        if learning_status:
-            base_queryset = base_queryset.filter(learning_status=learning_status)
+    def list(self, request, *args, **kwargs):
+        return self._list_response(self.filter_queryset(self.get_queryset()))
 
-        if word_type:
-            base_queryset = base_queryset.filter(word_type=word_type)
+    def _sparse_fields(self):
+        return sparse_fields(self.request.query_params, VOCABULARY_LIST_FIELDS, VOCABULARY_LIST_SPARSE_FIELDS)
 
-        if level:
-            base_queryset = base_queryset.filter(level=level)
-
-        return base_queryset.distinct()
+    def _list_response(self, queryset):
+        """Paginated list built by the values() fast path instead of VocabularyListSerializer."""
+        fields = self._sparse_fields()
+        rows = vocabulary_list_rows(queryset, fields)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(vocabulary_list_data(page, fields))
+        return Response(vocabulary_list_data(rows, fields))
 
     def get_permissions(self):
         if self.action in ['update', 'partial_update', 'destroy']:
             return [IsAuthenticated(), IsOwnerOrAdmin()]
+        if self.action == 'bulk':
+            return [IsAuthenticated(), IsAdmin()]
         return [IsAuthenticated()]
 
     def perform_create(self, serializer):
@@ -119,15 +170,10 @@ class VocabularyViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
     @action(detail=False, methods=['get'])
+    @conditional_get('system_vocabulary', ['topics', 'users', 'vocabularies', 'vocabulary_topics'])
     def system(self, request):
         """Get all system vocabulary."""
-        queryset = self.get_queryset().filter(is_system=True)
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = VocabularyListSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = VocabularyListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return self._list_response(self.get_queryset().filter(is_system=True))
 
     @action(detail=False, methods=['get'])
     def personal(self, request):
@@ -142,29 +188,101 @@ class VocabularyViewSet(viewsets.ModelViewSet):
             is_system=False,
             created_by_role='learner'
         )
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = VocabularyListSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = VocabularyListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return self._list_response(queryset)
 
     @action(detail=False, methods=['get'])
     def by_topic(self, request):
-        """Filter vocabulary by topic."""
+        """Vocabulary in a topic by word, one keyset page at a time (?cursor=, ?page_size=)."""
         topic_id = request.query_params.get('topic_id')
         if not topic_id:
             return Response(
                 {'error': 'topic_id parameter is required.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        queryset = self.get_queryset().filter(topics__id=topic_id)
-        serializer = VocabularyListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        queryset = self.get_queryset().filter(topics__id=topic_id).order_by('word', 'id')
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            try:
+                word, pk = decode_word_cursor(cursor)
+            except ValueError:
+                return Response({'error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(Q(word__gt=word) | Q(word=word, id__gt=pk))
+        fields = self._sparse_fields()
+        page_size = self.paginator.get_page_size(request)
+        rows = list(vocabulary_list_rows(queryset, fields)[:page_size + 1])
+        next_url = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            columns = [name for name in fields or VOCABULARY_LIST_FIELDS if VOCABULARY_LIST_COLUMNS[name]]
+            if 'word' in columns:
+                word = rows[-1][columns.index('word') + 1]
+            else:
+                word = Vocabulary.objects.values_list('word', flat=True).get(pk=rows[-1][0])
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'cursor', encode_word_cursor(word, rows[-1][0])
+            )
+        return Response({'next': next_url, 'results': vocabulary_list_data(rows, fields)})
+
+    def _export_response(self, queryset, filename):
+        file_format = self.request.query_params.get('file_format', 'csv').lower()
+        if file_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"file_format must be one of: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return export_response(queryset, file_format, filename)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream the vocabulary list, with its filters, as CSV or JSONL (?file_format=)."""
+        return self._export_response(self.filter_queryset(self.get_queryset()), 'vocabulary')
+
+    @action(detail=False, methods=['get'], url_path='system/export')
+    def system_export(self, request):
+        """Stream system vocabulary, with the list filters, as CSV or JSONL (?file_format=)."""
+        return self._export_response(self.get_queryset().filter(is_system=True), 'system-vocabulary')
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """Vocabulary edits and deletes after ?since=<cursor>, oldest first (vocabulary.changes)."""
+        try:
+            cursor = request.query_params.get('since')
+            cursor = decode_cursor(cursor) if cursor else None
+            limit = request.query_params.get('limit')
+            limit = int(limit) if limit else None
+        except ValueError:
+            return Response(
+                {'error': 'since must be a cursor from this endpoint and limit a positive integer.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if limit is not None and limit < 1:
+            return Response({'error': 'limit must be a positive integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(change_page(request.user, cursor, limit))
+
+    @action(detail=False, methods=['post'], parser_classes=[FastJSONParser])
+    def bulk(self, request):
+        """Delete, re-level, retype or retag many words in one transaction (admin only, vocabulary.bulk)."""
+        serializer = BulkOperationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if 'ids' in data:
+            queryset = Vocabulary.objects.filter(id__in=data['ids'])
+        else:
+            queryset = filter_vocabulary(Vocabulary.objects.all(), data['filter'])
+            if 'is_system' in data['filter']:
+                queryset = queryset.filter(is_system=data['filter']['is_system'])
+        result = run_bulk_operation(
+            queryset, data['operation'],
+            level=data.get('level'), word_type=data.get('word_type'), topic_ids=data.get('topic_ids', ()),
+        )
+        return Response(result)
 
     @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser])
+    @deferred_bumps()
+    @deferred_touches()
     def import_csv(self, request):
         """Import vocabulary from CSV file."""
+        started = time.perf_counter()
         serializer = CSVImportSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
@@ -296,6 +414,7 @@ class VocabularyViewSet(viewsets.ModelViewSet):
                 except Exception as e:
                     errors.append(f"Row {row_num}: {str(e)}")
 
+            record_import('personal', created_count, updated_count, len(errors), time.perf_counter() - started)
             message = f'Successfully imported {created_count} new vocabulary items.'
             if updated_count > 0:
                 message += f' Updated topics for {updated_count} existing items.'
@@ -326,7 +445,8 @@ class VocabularyViewSet(viewsets.ModelViewSet):
             )
 
         vocabulary.learning_status = new_status
-        vocabulary.save()
+        # Not a flashcard field, so the decks of plans holding the word stay cached
+        vocabulary.save(update_fields=['learning_status', 'updated_at'])
         return Response(VocabularySerializer(vocabulary).data)
 
 class SystemVocabularyViewSet(viewsets.ModelViewSet):
@@ -334,14 +454,18 @@ class SystemVocabularyViewSet(viewsets.ModelViewSet):
     ViewSet for admin to manage system/public vocabulary.
     Only admins can access this endpoint.
     """
-    queryset = Vocabulary.objects.filter(is_system=True).select_related('owner').prefetch_related('topics').order_by('word')
+    queryset = Vocabulary.objects.filter(is_system=True).select_related('owner', 'created_by').prefetch_related(
+            Prefetch('topics', queryset=topics_with_counts())
+        ).order_by('word')
     serializer_class = SystemVocabularySerializer
     permission_classes = [IsAuthenticated, IsAdmin]
     parser_classes = [MultiPartParser, FormParser]
     pagination_class = VocabularyPagination
 
     def get_queryset(self):
-        queryset = Vocabulary.objects.filter(is_system=True).select_related('owner').prefetch_related('topics').order_by('word')
+        queryset = Vocabulary.objects.filter(is_system=True).select_related('owner', 'created_by').prefetch_related(
+            Prefetch('topics', queryset=topics_with_counts())
+        ).order_by('word')
         
         # Apply filters from query params
         search = self.request.query_params.get('search', '').strip()
@@ -369,8 +493,11 @@ class SystemVocabularyViewSet(viewsets.ModelViewSet):
         serializer.save()
 
     @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser])
+    @deferred_bumps()
+    @deferred_touches()
     def import_csv(self, request):
         """Import system vocabulary from CSV file (admin only)."""
+        started = time.perf_counter()
         serializer = CSVImportSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
@@ -445,6 +572,7 @@ class SystemVocabularyViewSet(viewsets.ModelViewSet):
                 except Exception as e:
                     errors.append(f"Row {row_num}: {str(e)}")
 
+            record_import('system', created_count, updated_count, len(errors), time.perf_counter() - started)
             message = f'Successfully imported {created_count} new system vocabulary items.'
             if updated_count > 0:
                 message += f' Updated {updated_count} existing items.'